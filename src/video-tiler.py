@@ -1,21 +1,22 @@
-import yt_dlp
+# yt_dlp, prettytable, psutil, screeninfo and numpy are imported where they
+# are used: the window shows first and warm_up_imports() loads them after
 import subprocess
 import threading
-import tkinter as tk
-from tkinter import ttk, messagebox
-from tkinter import font as tkfont
-import webbrowser
-from screeninfo import get_monitors
-from prettytable import PrettyTable
 import os
 import shutil
 import sys
 import traceback
-import psutil  # For process handling
 import time
-import appdirs
-import pygetwindow as gw
-import win32process
+import re
+import json
+import argparse
+from collections import OrderedDict, deque
+import queue
+import signal
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+import tempfile
+import atexit
 
 
 # Left to do:
@@ -41,13 +42,338 @@ json_configuration_url='https://raw.githubusercontent.com/translation-robot/vide
 # File to store the number of divisions
 DIVISIONS_FILE_NAME = 'divisions.txt'
 
+# File to store the selected tiling engine
+TILING_ENGINE_FILE_NAME = 'tiling_engine.txt'
+
+# File to store the other settings (playback mode, ...)
+SETTINGS_FILE_NAME = 'settings.json'
+
+# Stream list overriding DefaultJsonConfiguration, in the application directory
+CONFIGURATION_FILE_NAME = 'configuration.json'
+
+# File to persist the yt_dlp extract_info cache
+INFO_CACHE_FILE_NAME = 'info_cache.json'
+INFO_CACHE_TTL = 600  # Seconds a cached extract_info result stays valid
+INFO_CACHE_MAX_ENTRIES = 32
+INFO_CACHE_SAVE_DELAY = 2  # Seconds changes are collected before the cache file is rewritten
+# Drop cached info this many seconds before its stream URLs expire
+STREAM_URL_EXPIRY_MARGIN = 120
+# Keys of the extract_info result that are large and never used by the tiler
+INFO_CACHE_DROPPED_KEYS = ['thumbnails', 'automatic_captions', 'subtitles', 'heatmap',
+                           'description', 'requested_formats', 'chapters']
+
 DEFAULT_URL = "https://www.youtube.com/watch?v=ZzWBpGwKoaI"
 
+# Tiling engines:
+# 'downscale' scales the source once to the tile size (screen / divisions) and
+#             replicates that small frame into a screen sized canvas at source fps
+# 'legacy'    is the original graph, fps=source_fps*d*d followed by tile=dxd
+#             (the fps cap only lowers source_fps, tile still needs d*d
+#             frames for each one it outputs)
+# 'numpy'     decodes downscaled raw frames from ffmpeg and builds the mosaic
+#             with NumPy before handing it to ffplay (see NumpyTileRenderer)
+TILING_ENGINE_DOWNSCALE = 'downscale'
+TILING_ENGINE_LEGACY = 'legacy'
+TILING_ENGINE_NUMPY = 'numpy'
+TILING_ENGINES = [TILING_ENGINE_DOWNSCALE, TILING_ENGINE_LEGACY, TILING_ENGINE_NUMPY]
+DEFAULT_TILING_ENGINE = TILING_ENGINE_DOWNSCALE
+
+# Frame rate used when the selected format does not tell
+DEFAULT_SOURCE_FPS = 30
+
+# Screen size used when no monitor can be found (headless runs, benchmarks)
+DEFAULT_SCREEN_WIDTH = 1920
+DEFAULT_SCREEN_HEIGHT = 1080
+
+# Output frame rate cap: the tiled output never runs faster than the monitor
+# refresh rate ('display', DEFAULT_REFRESH_RATE when it can not be read) or the
+# fps_cap setting, POWER_SAVING_FPS in power saving mode. Every engine drops
+# the source frames above the cap before scaling, so the graph never builds a
+# frame that can not be shown. The legacy engine is the exception: its tile
+# filter takes d x d input frames per output frame, so it still repeats each
+# capped frame d x d times.
+DEFAULT_REFRESH_RATE = 60
+POWER_SAVING_FPS = 15
+FPS_CAP_DISPLAY = 'display'
+FPS_CAPS = [FPS_CAP_DISPLAY, '60', '30', '24', str(POWER_SAVING_FPS)]
+
+# Playback modes:
+# 'relay'  yt-dlp downloads the stream and writes it to the player's stdin
+# 'direct' the media URL(s) chosen by _choose_format are handed straight to
+#          ffmpeg/ffplay, which can seek and reconnect on their own
+PLAYBACK_MODE_RELAY = 'relay'
+PLAYBACK_MODE_DIRECT = 'direct'
+PLAYBACK_MODES = [PLAYBACK_MODE_RELAY, PLAYBACK_MODE_DIRECT]
+DEFAULT_PLAYBACK_MODE = PLAYBACK_MODE_RELAY
+# Protocols ffmpeg can open itself, anything else (DASH fragments, ...) needs yt-dlp
+DIRECT_PLAYBACK_PROTOCOLS = ['http', 'https', 'm3u8', 'm3u8_native']
+# A direct playback failing faster than this is assumed to be a stale stream URL
+DIRECT_PLAYBACK_FAST_FAILURE_SECONDS = 10
+
+# Process supervisor: a pipeline with no data after SUPERVISOR_STARTUP_TIMEOUT
+# seconds has failed, and so has one whose bytes per second through the relay
+# or decoded frames per second stay under the stall thresholds for
+# STALL_SECONDS. The thresholds can be overridden in the settings file.
+SUPERVISOR_STARTUP_TIMEOUT = 30
+SUPERVISOR_WATCHDOG_INTERVAL = 0.25
+STALL_SECONDS = 8
+STALL_MIN_BYTES_PER_SECOND = 1024
+STALL_MIN_FPS = 1
+
+# Child processes lead a process group of their own, see start_process(), so
+# stopping one also stops what it started, like the ffmpeg of yt-dlp. They get
+# PROCESS_STOP_GRACE_SECONDS to exit once terminated, are then killed and get
+# PROCESS_KILL_SECONDS more before counting as leaked.
+PROCESS_STOP_GRACE_SECONDS = 2
+PROCESS_KILL_SECONDS = 1
+PROCESS_POLL_INTERVAL = 0.02
+# Process groups are polled with a signal 0; the scan of every process that
+# finds their members, leaving out zombies, runs at most this often
+PROCESS_SCAN_INTERVAL = 0.25
+
+# Delay before restarting a failed pipeline: none for the first failure, then
+# doubling from RESTART_BACKOFF_INITIAL up to RESTART_BACKOFF_MAXIMUM while
+# pipelines keep failing within RESTART_BACKOFF_RESET seconds
+RESTART_BACKOFF_INITIAL = 0.25
+RESTART_BACKOFF_MAXIMUM = 30
+RESTART_BACKOFF_RESET = 60
+
+# Auto divisions: every AUTO_DIVISIONS_INTERVAL seconds GridAutoTuner samples
+# the system CPU use and the frames the player showed and dropped. Playback is
+# overloaded when the CPU is above AUTO_DIVISIONS_CPU_HIGH percent, more than
+# AUTO_DIVISIONS_MAX_DROPS frames per second are dropped, or under
+# AUTO_DIVISIONS_MIN_FPS_RATIO of the source fps is shown while the CPU is
+# busy (a slow network with an idle CPU is not the grid's fault). It has
+# headroom under AUTO_DIVISIONS_CPU_LOW percent without drops. The grid
+# shrinks after AUTO_DIVISIONS_DOWN_SECONDS of overload and grows after
+# AUTO_DIVISIONS_UP_SECONDS of headroom. The gap between the CPU thresholds,
+# the hold times, the AUTO_DIVISIONS_SETTLE_SECONDS ignored after each restart
+# and not retrying an overloaded size for AUTO_DIVISIONS_RETRY_SECONDS keep
+# the grid from oscillating.
+AUTO_DIVISIONS_INTERVAL = 1
+AUTO_DIVISIONS_CPU_HIGH = 85
+AUTO_DIVISIONS_CPU_LOW = 60
+AUTO_DIVISIONS_MAX_DROPS = 1
+AUTO_DIVISIONS_MIN_FPS_RATIO = 0.9
+AUTO_DIVISIONS_DOWN_SECONDS = 5
+AUTO_DIVISIONS_UP_SECONDS = 10
+AUTO_DIVISIONS_SETTLE_SECONDS = 5
+AUTO_DIVISIONS_RETRY_SECONDS = 300
+AUTO_DIVISIONS_MAXIMUM = 32
+
+# Rotation: RotationScheduler plays the configured URLs round robin for
+# ROTATION_SECONDS each, or at the times of day of the configuration's
+# rotation_schedule timetable. The next source is resolved and starts
+# buffering ROTATION_PREFETCH_SECONDS before its switch.
+ROTATION_SECONDS = 300
+ROTATION_PREFETCH_SECONDS = 15
+
+# Audio modes:
+# 'muxed'    audio plays in the video player, with video+audio formats
+# 'separate' the tiled pipeline fetches video only and an ffplay without video
+#            plays an audio only format, restarted on its own
+# 'off'      no audio is fetched or decoded
+AUDIO_MODE_MUXED = 'muxed'
+AUDIO_MODE_SEPARATE = 'separate'
+AUDIO_MODE_OFF = 'off'
+AUDIO_MODES = [AUDIO_MODE_MUXED, AUDIO_MODE_SEPARATE, AUDIO_MODE_OFF]
+DEFAULT_AUDIO_MODE = AUDIO_MODE_SEPARATE
+AUDIO_MAX_ABR = 128  # kbps cap for the audio only format, overridden by the audio_max_abr setting
+
+# Format selection cost model: a video format costs the megapixels per second
+# it decodes, weighted by the decode cost of its codec, plus
+# FORMAT_BANDWIDTH_WEIGHT per Mbps of bitrate. Its tile scale is the source
+# pixels behind each displayed pixel once the tiling graph fits it into a
+# tile. Formats with a tile scale of at least FORMAT_ADEQUATE_SCALE look sharp
+# enough and the cheapest of them is chosen, the sharpest one when none is.
+CODEC_DECODE_COSTS = {'avc1': 1.0, 'h264': 1.0, 'mp4v': 1.0, 'vp8': 1.3, 'hev1': 1.5, 'hvc1': 1.5,
+                      'hevc': 1.5, 'h265': 1.5, 'vp9': 1.6, 'vp09': 1.6, 'av01': 2.0, 'av1': 2.0}
+CODEC_DECODE_COST_UNKNOWN = 1.5
+FORMAT_BANDWIDTH_WEIGHT = 2.0
+FORMAT_ADEQUATE_SCALE = 0.85
+# Recorded format lists with the expected choices, see --check-format-corpus
+FORMAT_CORPUS_FILE_NAME = 'format-corpus.json'
+
+# Relay buffer between the source process and the player: RELAY_BUFFER_SECONDS
+# of the selected formats' bitrate, bounded to RELAY_BUFFER_MINIMUM and
+# RELAY_BUFFER_MAXIMUM bytes. The player is fed once RELAY_PREFILL_SECONDS of
+# stream are buffered, at start and after an underrun. A hot standby source
+# keeps the newest bytes of the same size while it waits to take over.
+RELAY_BUFFER_SECONDS = 4
+RELAY_PREFILL_SECONDS = 1
+RELAY_BUFFER_MINIMUM = 1024 * 1024
+RELAY_BUFFER_MAXIMUM = 64 * 1024 * 1024
+RELAY_BUFFER_DEFAULT = 8 * 1024 * 1024  # When the bitrate is unknown
+RELAY_STATS_INTERVAL = 30  # Seconds between relay buffer reports in verbose mode
+
+# Telemetry: the play loop samples the pipeline every TELEMETRY_INTERVAL
+# seconds, shows the sample in the status bar and hands it to the shared
+# Telemetry, which appends it to the telemetry_file setting as JSON lines and
+# serves it as Prometheus text on 127.0.0.1:telemetry_port. Both are off by
+# default. TELEMETRY_METRICS are the (name, type, help) of the exported metrics.
+TELEMETRY_INTERVAL = 5
+TELEMETRY_HOST = '127.0.0.1'
+TELEMETRY_PREFIX = 'video_tiler_'
+TELEMETRY_METRICS = [
+    ('download_bytes_per_second', 'gauge', "Bytes per second read from the source"),
+    ('decode_fps', 'gauge', "Frames per second decoded and shown by the player"),
+    ('output_fps', 'gauge', "Target frame rate of the tiled output"),
+    ('frames_dropped_total', 'counter', "Frames dropped by the player to keep up"),
+    ('decoder_frames_dropped_total', 'counter', "Frames dropped by the decoder to reach the output fps"),
+    ('decoder_frames_duplicated_total', 'counter', "Frames duplicated by the decoder to reach the output fps"),
+    ('relay_underruns_total', 'counter', "Times the relay buffer ran empty"),
+    ('time_to_first_frame_seconds', 'gauge', "Time from the pipeline start to its first frame"),
+    ('pipeline_uptime_seconds', 'gauge', "Time since the pipeline started"),
+    ('divisions', 'gauge', "Grid divisions"),
+    ('restarts_total', 'counter', "Pipeline failures by kind, restarted or failed over"),
+    ('failovers_total', 'counter', "Switches to the standby source"),
+    ('child_processes', 'gauge', "Child processes running, they stay constant across restarts"),
+    ('leaked_processes_total', 'counter', "Processes still running after a pipeline was stopped"),
+    ('process_cpu_percent', 'gauge', "CPU use of each pipeline process, 100 per core"),
+    ('process_rss_bytes', 'gauge', "Resident memory of each pipeline process"),
+]
+
+# URL resolution in the GUI runs on worker threads once the URL has not
+# changed for URL_RESOLVE_DEBOUNCE_MS, results are polled every URL_RESOLVE_POLL_MS
+URL_RESOLVE_DEBOUNCE_MS = 500
+URL_RESOLVE_POLL_MS = 50
+URL_RESOLVE_WORKERS = 2
+
+# Stream health: the configured URLs are resolved STREAM_HEALTH_WORKERS at a
+# time when the window opens and again every STREAM_HEALTH_INTERVAL seconds.
+# An extraction error matching STREAM_OFFLINE_PATTERN is a broadcast that is
+# not live right now rather than a broken URL.
+STREAM_HEALTH_INTERVAL = 300
+STREAM_HEALTH_WORKERS = 4
+STREAM_LIVE = 'live'
+STREAM_AVAILABLE = 'available'
+STREAM_OFFLINE = 'offline'
+STREAM_ERROR = 'error'
+STREAM_STATE_COLORS = {STREAM_LIVE: 'green', STREAM_AVAILABLE: 'black', STREAM_OFFLINE: 'gray', STREAM_ERROR: 'red'}
+STREAM_OFFLINE_PATTERN = re.compile(r'offline|not (currently )?live|will begin|premieres|has ended|upcoming',
+                                    re.IGNORECASE)
+
+# ffplay -stats status line, e.g. "  12.34 M-V:  0.001 fd=   0 aq=    0KB vq=  123KB ..."
+FFPLAY_STATUS_PATTERN = re.compile(r'^\s*(-?[\d.]+|nan)\s+[AMV]-[AV]:\s*\S+\s+fd=\s*(\d+)')
+# ffmpeg -stats progress line, e.g. "frame=  250 fps= 30 q=-0.0 size=N/A time=00:00:08.33 ... dup=3 drop=12 speed=1x"
+FFMPEG_STATS_PATTERN = re.compile(r'^frame=\s*(\d+)\s')
+FFMPEG_STATS_FIELD_PATTERN = re.compile(r'\b(dup|drop)=\s*(\d+)')
+RELAY_CHUNK_SIZE = 64 * 1024
+
+# Multi-source mosaic: every source is decoded at cell size and MOSAIC_FPS,
+# its health is checked every MOSAIC_HEALTH_INTERVAL seconds and a source
+# without a new frame for STALL_SECONDS is restarted on its own
+MOSAIC_FPS = DEFAULT_SOURCE_FPS
+MOSAIC_HEALTH_INTERVAL = 1
+MOSAIC_STATES = ['starting', 'playing', 'stalled', 'restarting', 'failed']
+
+# Monitor wall: one decoder writes frames at the largest tile size of the
+# monitors into a FrameRing of FRAME_RING_SLOTS shared memory slots, a
+# presenter process per monitor polls it every WALL_PRESENTER_POLL seconds
+# and shows the newest frame in that monitor's grid
+FRAME_RING_SLOTS = 4
+WALL_PRESENTER_POLL = 0.005
+
+# Offline render: the VOD is cut into RENDER_SEGMENTS_PER_WORKER segments per
+# worker, none shorter than RENDER_MIN_SEGMENT_SECONDS, each tiled and encoded
+# by a single threaded ffmpeg so the workers scale with the cores
+RENDER_SEGMENTS_PER_WORKER = 2
+RENDER_MIN_SEGMENT_SECONDS = 10
+RENDER_VIDEO_CODEC = 'libx264'
+RENDER_PRESET = 'veryfast'
+RENDER_CRF = 23
+RENDER_PROGRESS_INTERVAL = 1  # Seconds between progress reports
+
+# Network server: the tiled output is encoded once into HLS segments of
+# SERVE_SEGMENT_SECONDS, the last SERVE_PLAYLIST_SIZE of them listed in
+# SERVE_PLAYLIST_NAME, and served over HTTP. A client that requested nothing
+# for SERVE_CLIENT_TIMEOUT seconds is no longer counted as connected, the
+# bandwidth is measured over SERVE_STATS_INTERVAL seconds.
+SERVE_PORT = 8080
+SERVE_SEGMENT_SECONDS = 2
+SERVE_PLAYLIST_SIZE = 6
+SERVE_PLAYLIST_NAME = 'stream.m3u8'
+SERVE_CLIENT_TIMEOUT = 10
+SERVE_STATS_INTERVAL = 10
+SERVE_AUDIO_BITRATE = '128k'
+
+# Modules imported on first use, loaded by a background thread once the
+# window is shown so the first URL lookup does not wait for them
+WARM_UP_MODULES = ['yt_dlp', 'screeninfo', 'psutil', 'prettytable']
+WARM_UP_DELAY_MS = 100
+
+# Startup benchmark: runs of the GUI timed up to the first window, appended
+# to a JSON lines file in the application directory to follow them over time
+STARTUP_BENCHMARK_RUNS = 5
+STARTUP_BENCHMARK_FILE_NAME = 'startup_benchmark.jsonl'
+# Tiling benchmark: every tiling engine on synthetic testsrc2 sources of
+# BENCHMARK_SOURCES ('WIDTHxHEIGHT@FPS') for BENCHMARK_DURATION seconds of
+# video at BENCHMARK_DIVISIONS, into a null sink on a screen of the default
+# size. Results are appended to a JSON lines file like the startup benchmark.
+# The legacy graph builds a mosaic d times the source size, runs above
+# LEGACY_MAX_MOSAIC_PIXELS are skipped instead of swapping the machine to death.
+BENCHMARK_SOURCES = ['640x360@30', '1280x720@30', '1920x1080@60']
+BENCHMARK_DIVISIONS = [1, 2, 4, 8, 16, 32, 64]
+BENCHMARK_DURATION = 5
+BENCHMARK_TIMEOUT = 120
+BENCHMARK_FILE_NAME = 'tiling_benchmark.jsonl'
+COMPARE_ENGINES_SOURCE = '1280x720@30'  # The one source of --compare-engines
+LEGACY_MAX_MOSAIC_PIXELS = 16384 * 16384
+# Self test: play_video runs against stand-ins for yt-dlp, ffplay and ffmpeg,
+# launchers that start this program with --stand-in NAME. The JSON object in
+# STAND_IN_ENVIRONMENT gives the behaviour of each start of each stand-in, see
+# SELFTEST_SCENARIOS: (name, yt-dlp behaviours, ffplay behaviours, expected
+# failure kind, expected failure stage or None for any). The stall threshold is
+# lowered to SELFTEST_STALL_SECONDS and every scenario has to meet the
+# SELFTEST_*_BUDGET latencies in seconds.
+STAND_IN_ENVIRONMENT = 'VIDEO_TILER_STAND_IN'
+STAND_IN_CHUNK_INTERVAL = 0.02
+SELFTEST_SCENARIOS = [
+    ('player crash', ['normal'], ['crash_after:1', 'normal'], 'exit', 'player'),
+    ('source crash', ['crash_after:1', 'normal'], ['normal'], 'exit', 'source'),
+    ('orphaned child', ['crash_orphan:1', 'normal'], ['normal'], 'exit', 'source'),
+    ('source stall', ['stall_after:1', 'normal'], ['normal'], 'stall', 'source'),
+    ('player stall', ['normal'], ['stall_after:1', 'normal'], 'stall', 'player'),
+    ('partial output', ['partial:1', 'normal'], ['normal'], 'closed', 'player'),
+    ('slow start', ['slow_start:1.5'], ['normal'], None, None),
+    ('hung shutdown', ['normal'], ['hang_on_exit'], None, None),
+]
+SELFTEST_STALL_SECONDS = 2
+SELFTEST_DETECT_BUDGET = 0.5  # Exits, stalls get SELFTEST_STALL_SECONDS more
+SELFTEST_RESTART_BUDGET = 2.0  # From the detection to data flowing again
+SELFTEST_FIRST_FRAME_BUDGET = 1.5  # After the slow start delay
+SELFTEST_STOP_BUDGET = PROCESS_STOP_GRACE_SECONDS + PROCESS_KILL_SECONDS + 0.5
+SELFTEST_TIMEOUT = 30
+SELFTEST_FORMATS = [{'format_id': 'selftest', 'vcodec': 'avc1', 'acodec': 'mp4a', 'width': 1280, 'height': 720,
+                     'resolution': '1280x720', 'fps': 30, 'tbr': 2000, 'url': 'selftest://source',
+                     'protocol': 'https'}]
+STARTUP_PROBE_PATTERN = re.compile(r'^startup probe: (\w+) ([\d.]+)$', re.MULTILINE)
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$', re.MULTILINE)
+
+YT_DLP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+
 DefaultJsonConfiguration = """{
     "streaming_url_array": ["https://www.youtube.com/watch?v=ZzWBpGwKoaI", "https://x.com/i/broadcasts/1gqGvNDqqZgGB"],
     "streaming_url_user_added_array": []
 }"""
 
+def load_configuration():
+    """Return DefaultJsonConfiguration updated with configuration.json from the application directory."""
+    configuration = json.loads(DefaultJsonConfiguration)
+    try:
+        with open(app_data_path(CONFIGURATION_FILE_NAME), 'r', encoding='utf-8') as file:
+            configuration.update(json.load(file))
+    except (OSError, ValueError):
+        pass
+    return configuration
+
+def get_configured_urls(configuration=None):
+    """Return the configured stream URLs, the default ones first, without duplicates."""
+    if configuration is None:
+        configuration = load_configuration()
+    urls = configuration.get('streaming_url_array', []) + configuration.get('streaming_url_user_added_array', [])
+    return list(dict.fromkeys(urls))
+
 def add_to_path():
     # Get the directory of the current script
     script_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
@@ -69,44 +395,4887 @@ def find_executable(executable_name):
     def is_executable(path):
         return os.path.isfile(path) and os.access(path, os.X_OK)
 
-    # Check PATH
-    path = shutil.which(executable_name)
-    if path and is_executable(path):
-        return path
+    # Check PATH
+    path = shutil.which(executable_name)
+    if path and is_executable(path):
+        return path
+
+    # Check the directory of the script or executable
+    base_dir = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    exe_path = os.path.join(base_dir, executable_name)
+    if is_executable(exe_path):
+        return exe_path
+
+    # Check in a 'bin' directory
+    bin_dir = os.path.join(base_dir, 'bin', executable_name)
+    if is_executable(bin_dir):
+        return bin_dir
+
+    return None
+
+def program_command():
+    """Return the command starting this program, a frozen executable is its own interpreter."""
+    if getattr(sys, 'frozen', False):
+        return [sys.executable]
+    return [sys.executable, os.path.abspath(__file__)]
+
+_app_data_dir = None
+
+def get_app_data_dir():
+    """Return the application directory, created on first use."""
+    global _app_data_dir
+    if _app_data_dir is None:
+        import appdirs
+        app_data_dir = appdirs.user_data_dir(APP_NAME)
+        os.makedirs(app_data_dir, exist_ok=True)
+        _app_data_dir = app_data_dir
+    return _app_data_dir
+
+def app_data_path(file_name):
+    return os.path.join(get_app_data_dir(), file_name)
+
+def read_divisions():
+    """Read the number of divisions from a file."""
+    divisions_file = app_data_path(DIVISIONS_FILE_NAME)
+    if os.path.exists(divisions_file):
+        with open(divisions_file, 'r') as file:
+            content = file.read().strip()
+            if content.isdigit():
+                return int(content)
+    return 3  # Default number of divisions if the file does not exist or is invalid
+
+def write_divisions(divisions):
+    """Write the number of divisions to a file."""
+    with open(app_data_path(DIVISIONS_FILE_NAME), 'w') as file:
+        file.write(str(divisions))
+
+def read_tiling_engine():
+    """Read the selected tiling engine from a file."""
+    tiling_engine_file = app_data_path(TILING_ENGINE_FILE_NAME)
+    if os.path.exists(tiling_engine_file):
+        with open(tiling_engine_file, 'r') as file:
+            content = file.read().strip()
+            if content in TILING_ENGINES:
+                return content
+    return DEFAULT_TILING_ENGINE
+
+def write_tiling_engine(tiling_engine):
+    """Write the selected tiling engine to a file."""
+    with open(app_data_path(TILING_ENGINE_FILE_NAME), 'w') as file:
+        file.write(tiling_engine)
+
+def read_setting(name, default, allowed=None):
+    """Read one setting from the settings file."""
+    try:
+        with open(app_data_path(SETTINGS_FILE_NAME), 'r', encoding='utf-8') as file:
+            value = json.load(file).get(name, default)
+    except (OSError, ValueError):
+        return default
+    if allowed is not None and value not in allowed:
+        return default
+    return value
+
+def write_setting(name, value):
+    """Write one setting to the settings file, keeping the others."""
+    settings = {}
+    try:
+        with open(app_data_path(SETTINGS_FILE_NAME), 'r', encoding='utf-8') as file:
+            settings = json.load(file)
+    except (OSError, ValueError):
+        pass
+    settings[name] = value
+    with open(app_data_path(SETTINGS_FILE_NAME), 'w', encoding='utf-8') as file:
+        json.dump(settings, file, indent=4)
+
+def build_direct_input_arguments(media_format):
+    """Return the ffmpeg/ffplay input options to open a yt-dlp format's URL directly."""
+    arguments = []
+    headers = dict(media_format.get('http_headers') or {})
+    user_agent = headers.pop('User-Agent', None)
+    if user_agent:
+        arguments += ['-user_agent', user_agent]
+    if headers:
+        arguments += ['-headers', ''.join(f'{key}: {value}\r\n' for key, value in headers.items())]
+    arguments += ['-reconnect', '1', '-reconnect_streamed', '1', '-reconnect_on_network_error', '1',
+                  '-reconnect_delay_max', '5']
+    arguments += ['-i', media_format['url']]
+    return arguments
+
+def get_stream_url_expiry(url):
+    """Return the expiry timestamp embedded in a stream URL (expire=... or /expire/...), or None."""
+    match = re.search(r'[?&/]expire[=/](\d+)', url or '')
+    if match:
+        return int(match.group(1))
+    return None
+
+def get_info_expiry(info):
+    """Return the earliest stream URL expiry of an extract_info result, or None."""
+    expiries = [get_stream_url_expiry(f.get('url')) for f in info.get('formats') or []]
+    expiries.append(get_stream_url_expiry(info.get('url')))
+    expiries = [e for e in expiries if e]
+    return min(expiries) if expiries else None
+
+class InfoCache:
+    """TTL bounded, size capped cache of extract_info results keyed by URL.
+
+    Entries are dropped after INFO_CACHE_TTL seconds or shortly before the
+    stream URLs they contain expire, whichever comes first. The cache is
+    persisted as JSON, a relative path is taken from the application data
+    directory when the cache is first used. Changes are written
+    INFO_CACHE_SAVE_DELAY seconds after the first of them, and at exit, so a
+    batch of lookups rewrites the file once.
+    """
+    def __init__(self, path=None, ttl=INFO_CACHE_TTL, max_entries=INFO_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0  # Extraction time avoided by cache hits
+        self.dirty = False
+        self.save_timer = None
+
+    def _load(self):
+        self.loaded = True
+        if self.path and not os.path.isabs(self.path):
+            self.path = app_data_path(self.path)
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                for url, entry in json.load(file).items():
+                    self.entries[url] = entry
+        except Exception as e:
+            print(f"Failed to load info cache: {e}")
+
+    def save(self):
+        """Write the pending changes now."""
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if not self.path or not self.dirty:
+                return
+            self.dirty = False
+            data = json.dumps(self.entries)
+        try:
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                file.write(data)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Failed to save info cache: {e}")
+
+    def get(self, url):
+        """Return the cached info for url, or None on a miss."""
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            entry = self.entries.get(url)
+            if entry is not None and time.time() >= entry['expires']:
+                del self.entries[url]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(url)
+            self.hits += 1
+            self.saved_seconds += entry.get('extract_seconds', 0.0)
+            return entry['info']
+
+    def put(self, url, info, extract_seconds=0.0):
+        now = time.time()
+        info = {k: v for k, v in info.items() if k not in INFO_CACHE_DROPPED_KEYS}
+        for f in info.get('formats') or []:
+            f.pop('fragments', None)
+        expires = now + self.ttl
+        stream_expiry = get_info_expiry(info)
+        if stream_expiry:
+            expires = min(expires, stream_expiry - STREAM_URL_EXPIRY_MARGIN)
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            self.entries[url] = {'info': info, 'stored': now, 'expires': expires,
+                                 'extract_seconds': extract_seconds}
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._schedule_save()
+        return info
+
+    def invalidate(self, url):
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            if self.entries.pop(url, None) is not None:
+                self._schedule_save()
+
+    def _schedule_save(self):
+        # Called with the lock held
+        self.dirty = True
+        if self.save_timer is None and self.path:
+            self.save_timer = threading.Timer(INFO_CACHE_SAVE_DELAY, self.save)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'saved_seconds': self.saved_seconds,
+            }
+
+# Shared by every YouTubeVideo instance, so the title lookup and the format
+# selection of one Play click hit the extractor only once.
+info_cache = InfoCache(INFO_CACHE_FILE_NAME)
+atexit.register(info_cache.save)
+_extract_locks = {}  # URL: [lock, callers holding or waiting for it]
+_extract_locks_lock = threading.Lock()
+
+def extract_info(url, use_cache=True):
+    """Return yt_dlp's extract_info result for url through the shared info cache."""
+    with _extract_locks_lock:
+        entry = _extract_locks.setdefault(url, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        # One extraction per URL at a time, concurrent callers wait for its result
+        with entry[0]:
+            if use_cache:
+                info = info_cache.get(url)
+                if info is not None:
+                    return info
+
+            ydl_opts = {
+                'quiet': True,
+                'no_warnings': True,
+            }
+            import yt_dlp  # Loads hundreds of extractors, keep it off the startup path
+            start_time = time.time()
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.sanitize_info(ydl.extract_info(url, download=False))
+            return info_cache.put(url, info, time.time() - start_time)
+    finally:
+        # The last caller drops the lock, so only URLs being looked up have one
+        with _extract_locks_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _extract_locks[url]
+
+def check_stream(url, use_cache=True):
+    """Resolve url through the info cache and return its health.
+
+    The health is a dict with the url, its state (STREAM_LIVE,
+    STREAM_AVAILABLE, STREAM_OFFLINE or STREAM_ERROR), title, error message,
+    check time and the seconds the lookup took.
+    """
+    health = {'url': url, 'state': STREAM_ERROR, 'title': None, 'error': None, 'checked': time.time()}
+    try:
+        info = extract_info(url, use_cache)
+    except Exception as e:
+        health['error'] = (str(e).splitlines() or [''])[0].replace('ERROR: ', '', 1)
+        if STREAM_OFFLINE_PATTERN.search(health['error']):
+            health['state'] = STREAM_OFFLINE
+    else:
+        health['title'] = info.get('title')
+        live_status = info.get('live_status')
+        if info.get('is_live') or live_status == 'is_live':
+            health['state'] = STREAM_LIVE
+        elif live_status in ('is_upcoming', 'post_live') or not (info.get('formats') or info.get('url')):
+            health['state'] = STREAM_OFFLINE
+        else:
+            health['state'] = STREAM_AVAILABLE  # Videos, and recordings of past broadcasts
+    health['seconds'] = time.time() - health['checked']
+    return health
+
+def check_streams(urls, use_cache=True, max_workers=STREAM_HEALTH_WORKERS):
+    """Check the health of urls concurrently, return it in the same order, see check_stream()."""
+    urls = list(urls)
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(urls), max_workers), thread_name_prefix='stream-health') as executor:
+        return list(executor.map(lambda url: check_stream(url, use_cache), urls))
+
+def get_screen_size():
+    """Return the size of the first monitor, DEFAULT_SCREEN_WIDTH x DEFAULT_SCREEN_HEIGHT without one."""
+    try:
+        from screeninfo import get_monitors
+        monitor = get_monitors()[0]
+        return monitor.width, monitor.height
+    except Exception as e:
+        print(f"No monitor found ({e}), using {DEFAULT_SCREEN_WIDTH}x{DEFAULT_SCREEN_HEIGHT}")
+        return DEFAULT_SCREEN_WIDTH, DEFAULT_SCREEN_HEIGHT
+
+_refresh_rate = None
+
+def get_refresh_rate():
+    """Return the refresh rate of the primary monitor in Hz, DEFAULT_REFRESH_RATE when it can not be read."""
+    global _refresh_rate
+    if _refresh_rate is None:
+        rate = 0
+        try:
+            if sys.platform == 'win32':
+                import ctypes
+                hdc = ctypes.windll.user32.GetDC(0)
+                try:
+                    rate = ctypes.windll.gdi32.GetDeviceCaps(hdc, 116)  # VREFRESH
+                finally:
+                    ctypes.windll.user32.ReleaseDC(0, hdc)
+            elif shutil.which('xrandr'):
+                output = subprocess.run(['xrandr', '--current'], capture_output=True, text=True, timeout=5).stdout
+                match = re.search(r'(\d+(?:\.\d+)?)\*', output)  # The current mode is marked with *
+                rate = float(match.group(1)) if match else 0
+        except Exception as e:
+            print(f"Can not read the monitor refresh rate ({e})")
+        # 0 and 1 mean the hardware default on Windows
+        _refresh_rate = rate if rate > 1 else DEFAULT_REFRESH_RATE
+    return _refresh_rate
+
+def get_fps_cap(value=None):
+    """Return the output frame rate cap in fps for a FPS_CAPS value, the fps_cap setting by default."""
+    if value is None:
+        value = read_setting('fps_cap', FPS_CAP_DISPLAY)
+    if value in (FPS_CAP_DISPLAY, 0, '0'):
+        return get_refresh_rate()
+    return float(value)
+
+def parse_fps_cap(value):
+    """argparse type of --fps-cap: FPS_CAP_DISPLAY or a positive frame rate, returned unchanged."""
+    if value == FPS_CAP_DISPLAY:
+        return value
+    try:
+        fps = float(value)
+    except ValueError:
+        fps = None
+    if fps is None or not 0 < fps < float('inf'):
+        raise argparse.ArgumentTypeError(f"'{value}' is neither '{FPS_CAP_DISPLAY}' nor a positive frame rate")
+    return value
+
+def get_tile_size(screen_width, screen_height, divisions):
+    """Return the (width, height) of one tile, rounded down to even numbers for yuv420p."""
+    tile_width = max(2, (screen_width // divisions) // 2 * 2)
+    tile_height = max(2, (screen_height // divisions) // 2 * 2)
+    return tile_width, tile_height
+
+def fit_tile_size(tile_width, tile_height, source_width=None, source_height=None):
+    """Shrink a tile to the source aspect ratio, never larger than the source itself."""
+    if source_width and source_height:
+        scale = min(tile_width / source_width, tile_height / source_height, 1)
+        tile_width = max(2, int(source_width * scale) // 2 * 2)
+        tile_height = max(2, int(source_height * scale) // 2 * 2)
+    return tile_width, tile_height
+
+def build_tile_filter(divisions, screen_width, screen_height, tiling_engine=DEFAULT_TILING_ENGINE, fps_cap=None):
+    """Build the -vf filter graph showing the source divisions x divisions times, at most at fps_cap fps."""
+    d = divisions
+    source_fps = f'min(source_fps,{fps_cap:g})' if fps_cap else 'source_fps'
+    if tiling_engine == TILING_ENGINE_LEGACY:
+        graph = f"fps='{source_fps}'," if fps_cap else ''
+        return graph + (f'scale=w=iw*{d}/{d}:h=ih*{d}/{d},'
+                        f"fps='{source_fps}*{d}*{d}',tile={d}x{d}")
+
+    # Drop the frames above the cap first, scale once to the tile size,
+    # keeping the source aspect ratio and never upscaling (ffplay scales the
+    # canvas to the screen anyway), then copy that small frame d times into a
+    # row and the row d times into the canvas.
+    tile_width, tile_height = get_tile_size(screen_width, screen_height, d)
+    graph = f"fps='{source_fps}'," if fps_cap else ''
+    graph += (f"scale=w='min(iw,{tile_width})':h='min(ih,{tile_height})'"
+              f':force_original_aspect_ratio=decrease:force_divisible_by=2')
+    if d > 1:
+        row_labels = ''.join(f'[r{i}]' for i in range(d))
+        column_labels = ''.join(f'[c{i}]' for i in range(d))
+        graph += (f',split={d}{row_labels};{row_labels}hstack=inputs={d}'
+                  f',split={d}{column_labels};{column_labels}vstack=inputs={d}')
+    return graph
+
+def get_codec_decode_cost(vcodec):
+    """Return the relative decode cost of a yt-dlp vcodec string like 'avc1.4d401f'."""
+    codec = (vcodec or '').split('.')[0].lower()
+    return CODEC_DECODE_COSTS.get(codec, CODEC_DECODE_COST_UNKNOWN)
+
+def score_video_format(media_format, tile_width, tile_height):
+    """Return the tile scale and costs of showing media_format in a tile_width x tile_height tile."""
+    width = media_format.get('width') or 0
+    height = media_format.get('height') or 0
+    fps = media_format.get('fps') or DEFAULT_SOURCE_FPS
+    # The tiling graph fits the source into the tile keeping its aspect ratio
+    tile_scale = min(width / tile_width, height / tile_height) if width and height else 0
+    decode_cost = width * height * fps * get_codec_decode_cost(media_format.get('vcodec')) / 1e6
+    bitrate = media_format.get('vbr') or media_format.get('tbr') or 0
+    bandwidth_cost = FORMAT_BANDWIDTH_WEIGHT * bitrate / 1000
+    return {
+        'tile_scale': tile_scale,
+        'adequate': tile_scale >= FORMAT_ADEQUATE_SCALE,
+        'decode_cost': decode_cost,
+        'bandwidth_cost': bandwidth_cost,
+        'cost': decode_cost + bandwidth_cost,
+    }
+
+def is_playable_format(media_format):
+    """False for the storyboard image formats (sb0, sb1, ...) yt-dlp lists beside the media formats."""
+    return media_format.get('protocol') != 'mhtml' and media_format.get('ext') != 'mhtml'
+
+def select_video_format(formats, tile_width, tile_height, require_adequate=False):
+    """Return the cheapest adequate format, the sharpest one when none is.
+
+    With require_adequate, None is returned instead of an inadequate format.
+    Formats without video and the storyboards are never candidates.
+    """
+    scored = [(score_video_format(f, tile_width, tile_height), f) for f in formats
+              if f.get('vcodec') not in (None, 'none') and is_playable_format(f)]
+    adequate = [(score, f) for score, f in scored if score['adequate']]
+    if adequate:
+        return min(adequate, key=lambda item: item[0]['cost'])[1]
+    if require_adequate or not scored:
+        return None
+    return max(scored, key=lambda item: (item[0]['tile_scale'], -item[0]['cost']))[1]
+
+def _measure_numpy_renderer(ffmpeg_path, divisions, source_size, source_fps, duration,
+                            screen_width, screen_height, timeout):
+    """Run the NumPy renderer on a synthetic source into a null sink."""
+    import psutil
+    source_width, source_height = (int(x) for x in source_size.split('x'))
+    tile_width, tile_height = fit_tile_size(*get_tile_size(screen_width, screen_height, divisions),
+                                            source_width, source_height)
+    try:
+        renderer = NumpyTileRenderer(divisions, tile_width, tile_height, source_fps,
+                                     ffmpeg_path=ffmpeg_path, verbose=False)
+    except ImportError as e:
+        return {'status': f'skipped ({e})'}
+
+    sink_command = [ffmpeg_path, '-hide_banner', '-nostdin', '-loglevel', 'error'] + \
+        renderer.raw_input_arguments() + ['-f', 'null', '-']
+    start_time = time.time()
+    renderer.start(['-f', 'lavfi', '-i', f'testsrc2=size={source_size}:rate={source_fps}', '-t', str(duration)],
+                   player_command=sink_command)
+
+    # Sample the children while they run, the last sample is close enough to
+    # their total once the decoder reaches the end of the synthetic source.
+    # The renderer itself runs in this process, it counts in the memory use.
+    cpu_seconds = {}
+    peak_rss = 0
+    while renderer.is_running() and time.time() - start_time < timeout:
+        rss = psutil.Process().memory_info().rss
+        for process in (renderer.decoder_process, renderer.player_process):
+            try:
+                child = psutil.Process(process.pid)
+                times = child.cpu_times()
+                cpu_seconds[process.pid] = times.user + times.system
+                rss += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        peak_rss = max(peak_rss, rss)
+        time.sleep(0.2)
+    timed_out = renderer.is_running()
+    renderer.stop()
+    real_seconds = time.time() - start_time
+
+    if timed_out:
+        return {'status': f'timeout ({timeout}s)'}
+    stats = renderer.stats()
+    return {
+        'frames': stats['frames'],
+        'fps': stats['frames'] / real_seconds if real_seconds > 0 else None,
+        'cpu_seconds': sum(cpu_seconds.values()) + stats['render_cpu_seconds'],
+        'render_ms_avg': stats['render_ms_avg'],
+        'render_ms_max': stats['render_ms_max'],
+        'peak_rss_bytes': peak_rss or None,
+    }
+
+def _measure_filter_graph(ffmpeg_path, graph, source_size, source_fps, duration, timeout):
+    """Run a -vf graph on a synthetic source into a null sink, return its output frames, CPU time and memory."""
+    result = {'frames': 0, 'fps': None, 'cpu_seconds': None, 'peak_rss_bytes': None, 'status': 'ok'}
+    command = [
+        ffmpeg_path, '-hide_banner', '-nostdin', '-benchmark',
+        '-f', 'lavfi', '-i', f'testsrc2=size={source_size}:rate={source_fps}',
+        '-t', str(duration),
+        '-vf', graph,
+        '-f', 'null', '-'
+    ]
+    try:
+        completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   timeout=timeout, text=True, errors='replace')
+        frames = re.findall(r'frame=\s*(\d+)', completed.stderr)
+        bench = re.search(r'bench: utime=([\d.]+)s stime=([\d.]+)s rtime=([\d.]+)s', completed.stderr)
+        if completed.returncode != 0 or not frames or not bench:
+            result['status'] = f'failed (exit code {completed.returncode})'
+        else:
+            result['frames'] = int(frames[-1])
+            result['cpu_seconds'] = float(bench.group(1)) + float(bench.group(2))
+            real_seconds = float(bench.group(3))
+            if real_seconds > 0:
+                result['fps'] = result['frames'] / real_seconds
+            maxrss = re.search(r'bench: maxrss=(\d+)KiB', completed.stderr)
+            if maxrss:
+                result['peak_rss_bytes'] = int(maxrss.group(1)) * 1024
+    except subprocess.TimeoutExpired:
+        result['status'] = f'timeout ({timeout}s)'
+    return result
+
+def get_ffmpeg_version(ffmpeg_path):
+    """Return the version of an ffmpeg executable, like '7.0.2', None when it can not be read."""
+    try:
+        output = subprocess.run([ffmpeg_path, '-hide_banner', '-version'], capture_output=True, text=True,
+                                timeout=10).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    match = re.match(r'ffmpeg version (\S+)', output)
+    return match.group(1) if match else None
+
+def benchmark_tiling(sources=None, divisions_list=None, engines=None, duration=BENCHMARK_DURATION,
+                     screen_width=DEFAULT_SCREEN_WIDTH, screen_height=DEFAULT_SCREEN_HEIGHT,
+                     timeout=BENCHMARK_TIMEOUT, results_file=None):
+    """Measure the tiling throughput of every engine on synthetic sources, see BENCHMARK_SOURCES.
+
+    The filter graphs are the ones build_tile_filter gives the player and
+    the NumPy engine runs NumpyTileRenderer, both without an fps cap so the
+    fps is the throughput of the machine. Nothing needs the network or a
+    display. A run is real time when it reaches the source fps. The results
+    are appended as a JSON line to results_file, BENCHMARK_FILE_NAME in the
+    application directory by default, and returned.
+    """
+    from prettytable import PrettyTable
+    ffmpeg_path = find_executable('ffmpeg')
+    if not ffmpeg_path:
+        raise FileNotFoundError("ffmpeg executable not found.")
+    sources = sources or BENCHMARK_SOURCES
+    divisions_list = divisions_list or BENCHMARK_DIVISIONS
+    engines = engines or TILING_ENGINES
+
+    results = []
+    for source in sources:
+        source_size, source_fps = source.split('@')
+        source_fps = float(source_fps)
+        source_width, source_height = (int(x) for x in source_size.split('x'))
+        for divisions in divisions_list:
+            for tiling_engine in engines:
+                result = {'source': source, 'divisions': divisions, 'engine': tiling_engine, 'frames': 0,
+                          'fps': None, 'cpu_seconds': None, 'peak_rss_bytes': None, 'status': 'ok'}
+                if tiling_engine == TILING_ENGINE_LEGACY and \
+                        source_width * source_height * divisions * divisions > LEGACY_MAX_MOSAIC_PIXELS:
+                    result['status'] = 'skipped (mosaic too large)'
+                elif tiling_engine == TILING_ENGINE_NUMPY:
+                    result.update(_measure_numpy_renderer(ffmpeg_path, divisions, source_size, source_fps,
+                                                          duration, screen_width, screen_height, timeout))
+                else:
+                    result.update(_measure_filter_graph(
+                        ffmpeg_path, build_tile_filter(divisions, screen_width, screen_height, tiling_engine),
+                        source_size, source_fps, duration, timeout))
+                result['real_time'] = result['fps'] is not None and result['fps'] >= source_fps
+                results.append(result)
+                print(f"{source} divisions {divisions} engine {tiling_engine}: {result['status']}"
+                      + (f", {result['fps']:.1f} fps" if result['fps'] is not None else "")
+                      + (f", render {result['render_ms_avg']:.2f} ms/frame avg, {result['render_ms_max']:.2f} ms max"
+                         if result.get('render_ms_avg') is not None else ""), flush=True)
+
+    table = PrettyTable()
+    table.field_names = ["Source", "Divisions", "Engine", "fps", "x real time", "CPU (s)", "CPU/frame (ms)",
+                         "Peak RSS (MB)", "Status"]
+    for result in results:
+        source_fps = float(result['source'].split('@')[1])
+        fps, cpu = result['fps'], result['cpu_seconds']
+        table.add_row([
+            result['source'],
+            result['divisions'],
+            result['engine'],
+            f"{fps:.1f}" if fps is not None else 'N/A',
+            f"{fps / source_fps:.2f}" if fps is not None else 'N/A',
+            f"{cpu:.2f}" if cpu is not None else 'N/A',
+            f"{1000 * cpu / result['frames']:.2f}" if cpu is not None and result['frames'] else 'N/A',
+            f"{result['peak_rss_bytes'] / 1e6:.0f}" if result['peak_rss_bytes'] else 'N/A',
+            result['status']
+        ])
+    print(f"Sources: testsrc2 for {duration}s each, screen {screen_width}x{screen_height}")
+    print(table)
+
+    # The largest grid each engine tiles in real time, what the divisions spinbox can promise
+    summary = PrettyTable()
+    summary.field_names = ["Source"] + list(engines)
+    for source in sources:
+        row = [source]
+        for tiling_engine in engines:
+            real_time = [r['divisions'] for r in results
+                         if r['source'] == source and r['engine'] == tiling_engine and r['real_time']]
+            row.append(f"{max(real_time)}x{max(real_time)}" if real_time else 'none')
+        summary.add_row(row)
+    print("Largest grid tiled in real time:")
+    print(summary)
+
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    run = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'version': PROGRAM_VERSION,
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'cpu_count': os.cpu_count(),
+        'ffmpeg': get_ffmpeg_version(ffmpeg_path),
+        'numpy': numpy_version,
+        'duration': duration,
+        'screen': f"{screen_width}x{screen_height}",
+        'results': results,
+    }
+    results_file = results_file or app_data_path(BENCHMARK_FILE_NAME)
+    with open(results_file, 'a', encoding='utf-8') as file:
+        file.write(json.dumps(run) + '\n')
+    print(f"Results appended to {results_file}")
+    return run
+
+def compare_fps_caps(divisions_list=None, caps=None, source_size='1280x720', source_fps=60,
+                     duration=5, screen_width=1920, screen_height=1080, timeout=120):
+    """Measure filter graph CPU time per displayed frame without and with the output fps cap.
+
+    'before' is the graph as it was: legacy builds source_fps*d*d frames for
+    tile, downscale runs at the source fps. 'after' drops the frames above
+    each cap first.
+    """
+    from prettytable import PrettyTable
+    ffmpeg_path = find_executable('ffmpeg')
+    if not ffmpeg_path:
+        raise FileNotFoundError("ffmpeg executable not found.")
+    if divisions_list is None:
+        divisions_list = [1, 2, 4, 8, 16]
+    if caps is None:
+        caps = sorted({get_refresh_rate(), 30, POWER_SAVING_FPS}, reverse=True)
+
+    source_width, source_height = (int(x) for x in source_size.split('x'))
+
+    table = PrettyTable()
+    table.field_names = ["Divisions", "Engine", "Graph", "Frames", "CPU (s)", "CPU/displayed frame (ms)",
+                         "CPU/second of video (s)", "Status"]
+    results = []
+    for divisions in divisions_list:
+        for tiling_engine in (TILING_ENGINE_LEGACY, TILING_ENGINE_DOWNSCALE):
+            for fps_cap in [None] + list(caps):
+                result = {'divisions': divisions, 'engine': tiling_engine, 'fps_cap': fps_cap,
+                          'frames': 0, 'cpu_seconds': None, 'status': 'ok'}
+                if tiling_engine == TILING_ENGINE_LEGACY and \
+                        source_width * source_height * divisions * divisions > LEGACY_MAX_MOSAIC_PIXELS:
+                    result['status'] = 'skipped (mosaic too large)'
+                else:
+                    graph = build_tile_filter(divisions, screen_width, screen_height, tiling_engine, fps_cap)
+                    result.update(_measure_filter_graph(ffmpeg_path, graph, source_size, source_fps,
+                                                        duration, timeout))
+                results.append(result)
+                cpu = result['cpu_seconds']
+                table.add_row([
+                    divisions,
+                    tiling_engine,
+                    'before' if fps_cap is None else f'after, cap {fps_cap:g} fps',
+                    result['frames'],
+                    f"{cpu:.2f}" if cpu is not None else 'N/A',
+                    f"{1000 * cpu / result['frames']:.2f}" if cpu is not None and result['frames'] else 'N/A',
+                    f"{cpu / duration:.3f}" if cpu is not None else 'N/A',
+                    result['status']
+                ])
+                print(f"Divisions {divisions} engine {tiling_engine} cap {fps_cap}: {result['status']}")
+
+    print(f"Source: testsrc2 {source_size}@{source_fps} for {duration}s, screen {screen_width}x{screen_height}")
+    print(table)
+    return results
+
+_child_processes = set()  # Started by start_process() and not stopped yet
+_child_processes_lock = threading.Lock()
+
+def start_process(command, **popen_kwargs):
+    """Start command as the leader of a new process group, see stop_processes()."""
+    if sys.platform == 'win32':
+        popen_kwargs['creationflags'] = popen_kwargs.get('creationflags', 0) | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        popen_kwargs['start_new_session'] = True
+    process = subprocess.Popen(command, **popen_kwargs)
+    with _child_processes_lock:
+        _child_processes.add(process)
+    return process
+
+def child_process_count():
+    """Return how many processes from start_process() are running and not stopped yet."""
+    with _child_processes_lock:
+        return sum(1 for process in _child_processes if process.poll() is None)
+
+def stop_processes(processes, grace=PROCESS_STOP_GRACE_SECONDS, kill_seconds=PROCESS_KILL_SECONDS):
+    """Stop processes and everything they started, return how many processes are left running.
+
+    The process groups of processes from start_process() are signalled as a
+    whole, even once their leader exited, other processes together with the
+    descendants psutil finds. Everything is terminated, killed when still
+    running after grace seconds and given kill_seconds more, so this returns
+    within grace + kill_seconds.
+    """
+    import psutil
+    processes = [process for process in processes if process is not None]
+    with _child_processes_lock:
+        leaders = [process for process in processes if process in _child_processes]
+    # A group id is not reused while the group has members, a leader's
+    # descendants are found even after they are reparented. On Windows
+    # process groups only receive console events, all go through psutil.
+    groups = [process.pid for process in leaders] if sys.platform != 'win32' else []
+    descendants = []
+    for process in processes:
+        if process.pid in groups or process.poll() is not None:
+            continue
+        try:
+            descendants += psutil.Process(process.pid).children(recursive=True)
+        except psutil.Error:
+            pass
+
+    if grace > 0:
+        _signal_processes(processes, groups, descendants, kill=False)
+        running = _wait_processes(processes, groups, descendants, grace)
+    else:
+        running = True
+    if running:
+        _signal_processes(processes, groups, descendants, kill=True)
+        running = _wait_processes(processes, groups, descendants, kill_seconds)
+
+    with _child_processes_lock:
+        for process in processes:
+            if process.poll() is not None:
+                _child_processes.discard(process)
+    if running:
+        print(f"{len(running)} processes did not stop: {', '.join(str(pid) for pid in running)}")
+    return len(running)
+
+def _wait_processes(processes, groups, descendants, seconds):
+    """Poll until processes, groups and descendants are gone or seconds passed, return the pids left."""
+    scan_time = time.time()
+    deadline = scan_time + seconds
+    while True:
+        now = time.time()
+        scan = now >= deadline or now - scan_time >= PROCESS_SCAN_INTERVAL
+        running = _running_processes(processes, groups, descendants, scan)
+        if scan:
+            scan_time = now
+        if not running or (now >= deadline and scan):
+            return running
+        time.sleep(max(0, min(PROCESS_POLL_INTERVAL, deadline - now)))
+
+def _signal_processes(processes, groups, descendants, kill):
+    """Terminate or kill processes, groups and descendants."""
+    for pgid in groups:
+        try:
+            os.killpg(pgid, signal.SIGKILL if kill else signal.SIGTERM)
+        except OSError:
+            pass  # The group is gone
+    for process in processes:
+        if process.poll() is None:
+            try:
+                process.kill() if kill else process.terminate()
+            except OSError:
+                pass
+    for descendant in descendants:
+        try:
+            descendant.kill() if kill else descendant.terminate()
+        except Exception:  # psutil.Error, psutil is imported by the caller
+            pass
+
+def _running_processes(processes, groups, descendants, scan=True):
+    """Return the pids of processes, group members and descendants still running.
+
+    Groups with members are scanned for them all at once, leaving out
+    zombies, which still count as members until their parent reaps them.
+    Without scan such a group is returned as its id.
+    """
+    import psutil
+    running = {process.pid for process in processes if process.poll() is None}
+    for descendant in descendants:
+        try:
+            if descendant.status() != psutil.STATUS_ZOMBIE:
+                running.add(descendant.pid)
+        except psutil.Error:
+            pass
+    live_groups = set()
+    for pgid in groups:
+        try:
+            os.killpg(pgid, 0)
+            live_groups.add(pgid)
+        except OSError:
+            pass  # No member left
+    if live_groups and not scan:
+        running |= live_groups
+    elif live_groups:
+        for member in psutil.process_iter(['status']):
+            try:
+                if member.info['status'] != psutil.STATUS_ZOMBIE and os.getpgid(member.pid) in live_groups:
+                    running.add(member.pid)
+            except (OSError, psutil.Error):
+                pass
+    return sorted(running)
+
+@atexit.register
+def _stop_child_processes():
+    with _child_processes_lock:
+        processes = list(_child_processes)
+    if processes:
+        stop_processes(processes, grace=0)
+
+
+class ProcessSupervisor:
+    """Watch the processes spawned for one playback and report the first failure.
+
+    Each child has a thread blocked in wait(), the source output is pumped to
+    the player by a thread that counts bytes and sees the end of the stream,
+    and the player's status output is parsed for decoded frames. A watchdog
+    compares bytes and frames per second with the stall thresholds. Failures
+    are posted to a queue so the play loop wakes up as soon as one happens.
+    """
+    def __init__(self, startup_timeout=SUPERVISOR_STARTUP_TIMEOUT, stall_seconds=STALL_SECONDS,
+                 min_bytes_per_second=STALL_MIN_BYTES_PER_SECOND, min_fps=STALL_MIN_FPS):
+        self.startup_timeout = startup_timeout
+        self.stall_seconds = stall_seconds
+        self.min_bytes_per_second = min_bytes_per_second
+        self.min_fps = min_fps
+        self.events = queue.Queue()
+        self.processes = []  # (name, Popen)
+        self.start_time = time.time()
+        self.first_byte_time = None
+        self.first_frame_time = None
+        self.end_of_stream_time = None
+        self.bytes = 0
+        self.frames = 0  # Estimated from the ffplay status line
+        self.frame_drops = 0
+        self.frame_counter = None  # Callable returning exact frame counts, when the renderer has them
+        self.player_errors = deque(maxlen=5)
+        self.source_errors = deque(maxlen=5)
+        self.pumping = False
+        self.pump_source = None
+        self.pump_write_time = None  # Set while the pump waits for the player to take a chunk
+        self.retired = []  # Processes whose exit is expected, see retire()
+        self.switch_time = None  # Last switch_source() call and what followed it
+        self.switch_first_byte_time = None
+        self.switch_first_frame_time = None
+        self.switch_frames = 0
+        self.watchdog_reset = False
+        self.stopped = False
+        self.watchdog_thread = threading.Thread(target=self._watchdog, daemon=True)
+        self.watchdog_thread.start()
+
+    def spawn(self, name, command, fatal_exit_codes=None, stage='player', **popen_kwargs):
+        """Start a child process and watch it."""
+        process = start_process(command, **popen_kwargs)
+        self.watch(name, process, fatal_exit_codes, stage)
+        return process
+
+    def watch(self, name, process, fatal_exit_codes=None, stage='player'):
+        """Watch a child started elsewhere.
+
+        Any exit is a failure unless fatal_exit_codes is 'nonzero', used for
+        sources whose normal end of stream is followed by the player exiting.
+        stage ('source' or 'player') tells the play loop what has to be replaced.
+        """
+        self.processes.append((name, process))
+        thread = threading.Thread(target=self._wait, args=(name, process, fatal_exit_codes, stage), daemon=True)
+        thread.start()
+
+    def retire(self, process):
+        """Stop reporting the exit of a process that is being replaced."""
+        self.retired.append(process)
+
+    def _wait(self, name, process, fatal_exit_codes, stage):
+        exit_code = process.wait()
+        if process in self.retired:
+            return
+        if fatal_exit_codes == 'nonzero' and exit_code == 0:
+            print(f"{name} process finished")
+            return
+        reason = f"exited with code {exit_code}"
+        errors = self.player_errors if stage == 'player' else self.source_errors
+        if errors:
+            reason += f" ({errors[-1]})"
+        self._post(name, reason, kind='closed' if exit_code == 0 else 'exit', stage=stage)
+
+    def pump(self, name, source, sink):
+        """Copy source to sink in a thread, counting bytes for the watchdog."""
+        self.pumping = True
+        self.pump_source = source
+        thread = threading.Thread(target=self._pump, args=(name, sink), daemon=True)
+        thread.start()
+
+    def switch_source(self, source):
+        """Make the pump read from another source without touching the player."""
+        self.switch_time = time.time()
+        self.switch_first_byte_time = None
+        self.switch_first_frame_time = None
+        self.switch_frames = self.frame_count()
+        self.pump_source = source
+        self.watchdog_reset = True
+
+    def _pump(self, name, sink):
+        try:
+            while not self.stopped:
+                source = self.pump_source
+                chunk = source.read1(RELAY_CHUNK_SIZE)
+                if not chunk:
+                    if self.pump_source is not source:
+                        continue  # Switched to another source while this one ended
+                    break
+                now = time.time()
+                if self.first_byte_time is None:
+                    self.first_byte_time = now
+                if self.switch_time is not None and self.switch_first_byte_time is None \
+                        and source is self.pump_source:
+                    self.switch_first_byte_time = now
+                self.bytes += len(chunk)
+                self.pump_write_time = now
+                sink.write(chunk)
+                sink.flush()
+                self.pump_write_time = None
+        except (BrokenPipeError, OSError, ValueError):
+            pass  # Player closed its input, its exit is reported by _wait
+        finally:
+            self.end_of_stream_time = time.time()
+            if not self.stopped:
+                print(f"{name}: end of stream after {self.bytes} bytes")
+            try:
+                sink.close()  # Let the player drain its buffer and exit
+            except (BrokenPipeError, OSError):
+                pass
+
+    def read_source_errors(self, stderr):
+        """Drain the source's error output in a thread, so a full pipe never blocks it."""
+        thread = threading.Thread(target=self._read_source_errors, args=(stderr,), daemon=True)
+        thread.start()
+
+    def _read_source_errors(self, stderr):
+        try:
+            for line in stderr:
+                line = line.decode('utf-8', 'replace').strip()
+                if line:
+                    self.source_errors.append(line)
+        except (OSError, ValueError):
+            pass
+
+    def read_player_stats(self, stderr, source_fps=None):
+        """Parse ffplay's -stats status lines in a thread to count decoded frames."""
+        thread = threading.Thread(target=self._read_player_stats,
+                                  args=(stderr, source_fps or DEFAULT_SOURCE_FPS), daemon=True)
+        thread.start()
+
+    def _read_player_stats(self, stderr, source_fps):
+        last_clock = None
+        pending = b''
+        try:
+            while True:
+                chunk = stderr.read1(4096)
+                if not chunk:
+                    break
+                # Status lines end with \r, errors with \n
+                lines = re.split(rb'[\r\n]', pending + chunk)
+                pending = lines.pop()
+                for line in lines:
+                    line = line.decode('utf-8', 'replace')
+                    match = FFPLAY_STATUS_PATTERN.match(line)
+                    if not match:
+                        if line.strip():
+                            self.player_errors.append(line.strip())
+                        continue
+                    self.frame_drops = int(match.group(2))
+                    try:
+                        clock = float(match.group(1))
+                    except ValueError:
+                        continue
+                    # The master clock only moves while frames are shown
+                    if last_clock is not None and clock > last_clock:
+                        self.frames += max(1, round((clock - last_clock) * source_fps))
+                        self._frames_advanced()
+                    last_clock = clock
+        except (OSError, ValueError):
+            pass
+
+    def count_frames(self, frame_counter):
+        """Use an exact frame counter, such as the NumPy renderer's, instead of ffplay's clock."""
+        self.frame_counter = frame_counter
+
+    def frame_count(self):
+        if self.frame_counter is not None:
+            count = self.frame_counter()
+            if count > self.switch_frames:
+                self._frames_advanced()
+            return count
+        return self.frames
+
+    def _frames_advanced(self):
+        now = time.time()
+        if self.first_frame_time is None:
+            self.first_frame_time = now
+        if self.switch_first_byte_time is not None and self.switch_first_frame_time is None:
+            self.switch_first_frame_time = now
+
+    def _watchdog(self):
+        samples = deque()  # (time, bytes, frames)
+        active_since = None
+        last_bytes = last_frames = 0
+        bytes_time = frames_time = None  # When the byte and frame counts last moved
+        while not self.stopped:
+            time.sleep(SUPERVISOR_WATCHDOG_INTERVAL)
+            now = time.time()
+            byte_count = self.bytes
+            frame_count = self.frame_count()
+            if self.watchdog_reset:
+                # A new source took over, judge it on a fresh window
+                self.watchdog_reset = False
+                samples.clear()
+
+            if not byte_count and not frame_count:
+                if now - self.start_time > self.startup_timeout:
+                    self._post('watchdog', f"no data after {self.startup_timeout}s",
+                               self.start_time + self.startup_timeout, kind='stall', stage='source')
+                    return
+                continue
+            if active_since is None:
+                active_since = now
+            if byte_count != last_bytes:
+                bytes_time, last_bytes = now, byte_count
+            if frame_count != last_frames:
+                frames_time, last_frames = now, frame_count
+
+            # Keep the newest sample at least stall_seconds old as the window start
+            samples.append((now, byte_count, frame_count))
+            while len(samples) > 1 and samples[1][0] <= now - self.stall_seconds:
+                samples.popleft()
+            window_start, window_bytes, window_frames = samples[0]
+            elapsed = now - window_start
+            if elapsed < self.stall_seconds or self.end_of_stream_time is not None:
+                continue
+
+            bytes_per_second = (byte_count - window_bytes) / elapsed
+            fps = (frame_count - window_frames) / elapsed
+            # The bytes stopped no later than the frames and the pump is not blocked
+            # on the player: the player only ran out of what the source had sent
+            bytes_stopped = self.pumping and self.pump_write_time is None and bytes_time is not None \
+                and frames_time is not None and bytes_time <= frames_time
+            if self.pumping and byte_count and bytes_per_second < self.min_bytes_per_second:
+                if self.pump_write_time is not None:
+                    # The source has data, the player stopped reading it
+                    self._post('watchdog', f"stalled, the player took no data for {self.stall_seconds}s",
+                               window_start, kind='stall', stage='player')
+                else:
+                    self._post('watchdog', f"stalled, {bytes_per_second:.0f} bytes/s for {self.stall_seconds}s",
+                               window_start, kind='stall', stage='source')
+                samples.clear()
+            elif self.first_frame_time is not None and fps < self.min_fps and bytes_stopped:
+                self._post('watchdog', f"stalled, no data from the source for {now - bytes_time:.1f}s",
+                           window_start, kind='stall', stage='source')
+                samples.clear()
+            elif self.first_frame_time is not None and fps < self.min_fps:
+                self._post('watchdog', f"stalled, {fps:.1f} fps for {self.stall_seconds}s",
+                           window_start, kind='stall', stage='player')
+                samples.clear()
+
+    def _post(self, source, reason, occurred=None, kind='exit', stage='player'):
+        if not self.stopped:
+            self.events.put({'source': source, 'reason': reason, 'kind': kind, 'stage': stage,
+                             'occurred': occurred or time.time()})
+
+    def wait_for_failure(self, timeout=None):
+        """Block until a failure is reported, return it or None on timeout."""
+        try:
+            event = self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        event['detected'] = time.time()
+        return event
+
+    def is_up(self):
+        """True once data flows through the pipeline."""
+        return self.first_byte_time is not None or self.first_frame_time is not None
+
+    def up_time(self):
+        times = [t for t in (self.first_byte_time, self.first_frame_time) if t is not None]
+        return min(times) if times else None
+
+    def stop(self, grace=PROCESS_STOP_GRACE_SECONDS):
+        """Stop watching and stop every child, see stop_processes(), return how many were leaked."""
+        self.stopped = True
+        return stop_processes([process for name, process in self.processes], grace)
+
+
+class RelayBuffer:
+    """Memory bounded ring buffer between a source process's output and the player.
+
+    A thread reads the source pipe into the ring. When the ring is full it
+    stops reading, which backpressures the source through the OS pipe, or
+    with drop_oldest it discards the oldest bytes instead. The player side
+    reads with read1(), like a pipe, once prefill bytes are buffered at the
+    start and again after each underrun.
+    """
+    def __init__(self, source, capacity, prefill=0, drop_oldest=False):
+        self.source = source
+        self.capacity = max(capacity, 2 * RELAY_CHUNK_SIZE)
+        self.ring = bytearray(self.capacity)
+        self.read_position = 0
+        self.fill = 0
+        self.prefill = min(prefill, self.capacity // 2)
+        self.buffering = self.prefill > 0
+        self.drop_oldest = drop_oldest
+        self.condition = threading.Condition()
+        self.closed = False
+        self.eof = False
+        self.starved = False
+        self.underruns = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.bytes_dropped = 0
+        self.start_time = time.time()
+        self.last_data_time = None
+        self.throughput = 0.0  # Bytes per second read from the source over the last second
+        self.thread = threading.Thread(target=self._fill, daemon=True)
+        self.thread.start()
+
+    def _fill(self):
+        chunk = bytearray(RELAY_CHUNK_SIZE)
+        view = memoryview(chunk)
+        rate_start, rate_bytes = time.time(), 0
+        try:
+            while True:
+                with self.condition:
+                    while not self.drop_oldest and not self.closed \
+                            and self.capacity - self.fill < RELAY_CHUNK_SIZE:
+                        self.condition.wait()
+                    if self.closed:
+                        break
+                count = self.source.readinto1(view)
+                if not count:
+                    break
+                now = time.time()
+                with self.condition:
+                    if self.closed:
+                        break
+                    overflow = self.fill + count - self.capacity
+                    if overflow > 0:  # Only with drop_oldest
+                        self.read_position = (self.read_position + overflow) % self.capacity
+                        self.fill -= overflow
+                        self.bytes_dropped += overflow
+                    write_position = (self.read_position + self.fill) % self.capacity
+                    first = min(count, self.capacity - write_position)
+                    self.ring[write_position:write_position + first] = view[:first]
+                    self.ring[:count - first] = view[first:count]
+                    self.fill += count
+                    self.bytes_in += count
+                    self.last_data_time = now
+                    self.condition.notify_all()
+                rate_bytes += count
+                if now - rate_start >= 1:
+                    self.throughput = rate_bytes / (now - rate_start)
+                    rate_start, rate_bytes = now, 0
+        except (OSError, ValueError):
+            pass
+        with self.condition:
+            self.eof = True
+            self.condition.notify_all()
+
+    def set_drop_oldest(self, drop_oldest):
+        with self.condition:
+            self.drop_oldest = drop_oldest
+            self.condition.notify_all()
+
+    def read1(self, size=-1):
+        """Return up to size buffered bytes, b'' at the end of the stream."""
+        if size is None or size < 0:
+            size = RELAY_CHUNK_SIZE
+        with self.condition:
+            while True:
+                if self.closed:
+                    return b''
+                if self.buffering:
+                    if self.fill < self.prefill and not self.eof:
+                        self.condition.wait()
+                        continue
+                    self.buffering = False
+                if self.fill:
+                    break
+                if self.eof:
+                    return b''
+                if not self.starved and self.bytes_out:
+                    # The player caught up with the source, buffer again before feeding it
+                    self.starved = True
+                    self.underruns += 1
+                    self.buffering = self.prefill > 0
+                self.condition.wait()
+            self.starved = False
+            count = min(size, self.fill, self.capacity - self.read_position)
+            data = bytes(self.ring[self.read_position:self.read_position + count])
+            self.read_position = (self.read_position + count) % self.capacity
+            self.fill -= count
+            self.bytes_out += count
+            self.condition.notify_all()
+            return data
+
+    def stats(self):
+        """Fill level, underruns and throughput of the buffer."""
+        with self.condition:
+            elapsed = max(time.time() - self.start_time, 1e-6)
+            return {
+                'capacity': self.capacity,
+                'fill': self.fill,
+                'fill_percent': 100.0 * self.fill / self.capacity,
+                'underruns': self.underruns,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'bytes_dropped': self.bytes_dropped,
+                'throughput': self.throughput,
+                'average_throughput': self.bytes_in / elapsed,
+            }
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class StandbySource:
+    """A pre-resolved source process kept connected and buffering, ready to take over.
+
+    Until it is promoted its RelayBuffer keeps only the newest buffer_size
+    bytes, so the player joins the live stream where it is now. Once promoted
+    the buffer applies backpressure instead and is read by the supervisor's
+    pump through read1(), like a pipe. Without drop_oldest, for videos that
+    should start at the beginning, it applies backpressure from the start.
+    """
+    def __init__(self, name, command, buffer_size=RELAY_BUFFER_DEFAULT, drop_oldest=True):
+        self.name = name
+        self.command = command
+        self.process = start_process(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self.buffer = RelayBuffer(self.process.stdout, buffer_size, drop_oldest=drop_oldest)
+
+    def is_ready(self, max_age=STALL_SECONDS):
+        """True while the source is running and received data recently."""
+        last_data_time = self.buffer.last_data_time
+        if last_data_time is None:
+            return False
+        if not self.buffer.drop_oldest:
+            # A full buffer holds the source back, it has no new data to show
+            return self.process.poll() in (None, 0)
+        return self.process.poll() is None and time.time() - last_data_time < max_age
+
+    def promote(self):
+        self.buffer.set_drop_oldest(False)
+
+    def read1(self, size=-1):
+        """Return the next buffered bytes, b'' at the end of the stream."""
+        return self.buffer.read1(size)
+
+    def stats(self):
+        return self.buffer.stats()
+
+    def close(self):
+        self.buffer.close()
+        return stop_processes([self.process], grace=0)
+
+
+class RestartBackoff:
+    """Exponential delay between restarts, reset once a pipeline stays up long enough."""
+    def __init__(self, initial=RESTART_BACKOFF_INITIAL, maximum=RESTART_BACKOFF_MAXIMUM,
+                 reset_after=RESTART_BACKOFF_RESET):
+        self.initial = initial
+        self.maximum = maximum
+        self.reset_after = reset_after
+        self.failures = 0
+
+    def next_delay(self, uptime):
+        """Delay before the next restart of a pipeline that ran for uptime seconds."""
+        if uptime >= self.reset_after:
+            self.failures = 0
+        delay = 0 if self.failures == 0 else min(self.maximum, self.initial * 2 ** (self.failures - 1))
+        self.failures += 1
+        return delay
+
+
+class GridAutoTuner:
+    """Keep the grid at the largest divisions that still play at source fps.
+
+    sample() is fed the system CPU use and the player's frame counters and
+    returns the divisions to switch to when they should change, see the
+    AUTO_DIVISIONS_* constants. Every change is kept in history with the
+    measurements behind it.
+    """
+    def __init__(self, divisions, minimum=1, maximum=AUTO_DIVISIONS_MAXIMUM):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.divisions = min(max(divisions, minimum), maximum)
+        self.history = []  # Adjustments, oldest first
+        self.overloaded = {}  # Divisions that overloaded, with when they did
+        self.reset()
+
+    def reset(self, now=None):
+        """Start measuring a new pipeline, the first seconds after a (re)start are ignored."""
+        self.start_time = now or time.time()
+        self.last_sample = None
+        self.overloaded_since = None
+        self.headroom_since = None
+
+    def sample(self, cpu_percent, frames, frame_drops, source_fps, now=None):
+        """Add a measurement, return the new divisions when the grid should change, else None."""
+        now = now or time.time()
+        previous = self.last_sample
+        self.last_sample = (now, frames, frame_drops)
+        if previous is None or now - self.start_time < AUTO_DIVISIONS_SETTLE_SECONDS or now <= previous[0]:
+            return None
+        elapsed = now - previous[0]
+        fps = (frames - previous[1]) / elapsed
+        drops = max(0, frame_drops - previous[2]) / elapsed
+        min_fps = AUTO_DIVISIONS_MIN_FPS_RATIO * source_fps
+        measurements = {'cpu_percent': cpu_percent, 'fps': fps, 'drops_per_second': drops}
+
+        if cpu_percent > AUTO_DIVISIONS_CPU_HIGH or drops > AUTO_DIVISIONS_MAX_DROPS or \
+                (fps < min_fps and cpu_percent >= AUTO_DIVISIONS_CPU_LOW):
+            self.headroom_since = None
+            if self.overloaded_since is None:
+                self.overloaded_since = now
+            if now - self.overloaded_since >= AUTO_DIVISIONS_DOWN_SECONDS and self.divisions > self.minimum:
+                self.overloaded[self.divisions] = now
+                severe = cpu_percent >= 98 or fps < source_fps / 2
+                step = max(1, self.divisions // 4) if severe else 1
+                return self._change(max(self.minimum, self.divisions - step), "overloaded", measurements, now)
+        elif cpu_percent < AUTO_DIVISIONS_CPU_LOW and not drops and fps >= min_fps:
+            self.overloaded_since = None
+            if self.headroom_since is None:
+                self.headroom_since = now
+            larger = self.divisions + 1
+            if now - self.headroom_since >= AUTO_DIVISIONS_UP_SECONDS and larger <= self.maximum and \
+                    now - self.overloaded.get(larger, now - AUTO_DIVISIONS_RETRY_SECONDS) >= AUTO_DIVISIONS_RETRY_SECONDS:
+                return self._change(larger, "headroom", measurements, now)
+        else:
+            self.overloaded_since = None
+            self.headroom_since = None
+        return None
+
+    def _change(self, divisions, reason, measurements, now):
+        change = dict(measurements, time=now, reason=reason, divisions_from=self.divisions, divisions_to=divisions)
+        self.history.append(change)
+        print(f"Auto divisions: {self.divisions} -> {divisions} ({reason}, CPU {measurements['cpu_percent']:.0f}%, "
+              f"{measurements['fps']:.1f} fps, {measurements['drops_per_second']:.1f} drops/s)")
+        self.divisions = divisions
+        self.reset(now)
+        return divisions
+
+    def stats(self):
+        return {'divisions': self.divisions, 'changes': len(self.history), 'history': list(self.history)}
+
+
+class RotationScheduler:
+    """Decide which URL plays and when the next one takes over.
+
+    Round robin plays urls in turn for interval seconds each. With a
+    timetable, a list of (minutes after midnight, URL), every URL plays from
+    its time of day until the next entry's. Every switch is kept in history
+    with the time it took until the new source played.
+    """
+    def __init__(self, urls=None, interval=ROTATION_SECONDS, timetable=None):
+        self.timetable = sorted(timetable) if timetable else None
+        self.urls = [url for minute, url in self.timetable] if self.timetable else list(urls or [])
+        if not self.urls:
+            raise ValueError("Nothing to rotate, no URLs are configured")
+        self.interval = interval
+        self.index = None
+        self.switch_time = None
+        self.history = []  # Switches, oldest first
+
+    @classmethod
+    def from_configuration(cls, configuration=None, interval=None):
+        """Build the scheduler of the configuration's rotation_schedule, or round robin over its URLs."""
+        if configuration is None:
+            configuration = load_configuration()
+        timetable = []
+        for entry in configuration.get('rotation_schedule') or []:
+            try:
+                hours, minutes = (int(x) for x in entry['time'].split(':'))
+                timetable.append((hours * 60 + minutes, entry['url']))
+            except (KeyError, ValueError, AttributeError, TypeError):
+                print(f"Ignoring invalid rotation schedule entry: {entry}")
+        return cls(get_configured_urls(configuration), interval or read_setting('rotation_seconds', ROTATION_SECONDS),
+                   timetable)
+
+    def _next_switch_time(self, now):
+        if not self.timetable:
+            return now + self.interval
+        minute = self.timetable[(self.index + 1) % len(self.timetable)][0]
+        local = time.localtime(now)
+        midnight = now - local.tm_hour * 3600 - local.tm_min * 60 - local.tm_sec
+        switch_time = midnight + minute * 60
+        return switch_time if switch_time > now else switch_time + 24 * 3600
+
+    def first(self, now=None):
+        """Start the rotation, return the URL to play now."""
+        now = now or time.time()
+        self.index = 0
+        if self.timetable:
+            local = time.localtime(now)
+            minute = local.tm_hour * 60 + local.tm_min
+            # The last entry started today, else the last one of yesterday
+            started = [i for i, (entry_minute, url) in enumerate(self.timetable) if entry_minute <= minute]
+            self.index = started[-1] if started else len(self.timetable) - 1
+        self.switch_time = self._next_switch_time(now)
+        return self.urls[self.index]
+
+    def upcoming(self):
+        """URL that plays after the current one."""
+        return self.urls[(self.index + 1) % len(self.urls)]
+
+    def advance(self, now=None):
+        """Move to the next URL, return it."""
+        now = now or time.time()
+        self.index = (self.index + 1) % len(self.urls)
+        self.switch_time = self._next_switch_time(now)
+        return self.urls[self.index]
+
+    def stats(self):
+        switch_seconds = [s['switch_seconds'] for s in self.history if s.get('switch_seconds') is not None]
+        return {
+            'switches': len(self.history),
+            'prefetched': sum(1 for s in self.history if s['prefetched']),
+            'switch_seconds_avg': sum(switch_seconds) / len(switch_seconds) if switch_seconds else None,
+            'switch_seconds_max': max(switch_seconds) if switch_seconds else None,
+            'history': list(self.history),
+        }
+
+
+class RotationPrefetch:
+    """Resolve the next URL of a rotation in the background and start buffering it.
+
+    A YouTubeVideo with the playing video's settings resolves url, which also
+    fills the info cache for the switch, and a StandbySource connects to the
+    formats it chose. Live streams keep their newest bytes, other videos
+    buffer their beginning and wait for the player.
+    """
+    def __init__(self, url, playing):
+        self.url = url
+        self.video = YouTubeVideo(None, url, playing.divisions, verbose=False, tiling_engine=playing.tiling_engine,
+                                  playback_mode=playing.playback_mode, hot_standby=False, resolve=False,
+                                  audio_mode=playing.audio_mode, audio_max_abr=playing.audio_max_abr,
+                                  fps_cap=playing.fps_cap)
+        self.standby = None
+        self.closed = False
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._prefetch, daemon=True)
+        self.thread.start()
+
+    def _prefetch(self):
+        start_time = time.time()
+        if not self.video.resolve():
+            print(f"Rotation prefetch of '{self.url}' failed: {self.video.resolve_error}")
+            return
+        standby = StandbySource(*self.video._build_standby_command(), self.video._relay_buffer_size()[0],
+                                drop_oldest=self.video.is_live)
+        with self.lock:
+            if self.closed:
+                standby.close()
+                return
+            self.standby = standby
+        print(f"Rotation prefetch: '{self.video.title}' resolved in {time.time() - start_time:.2f}s, buffering")
+
+    def take(self, command):
+        """Return the buffering StandbySource if it runs command and is ready, else None."""
+        with self.lock:
+            standby = self.standby
+            if standby is None or standby.command != command or not standby.is_ready():
+                return None
+            self.standby = None
+            return standby
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            standby, self.standby = self.standby, None
+        if standby:
+            standby.close()
+
+
+class Telemetry:
+    """Export the latest pipeline sample for graphing, see TELEMETRY_METRICS.
+
+    record() appends every sample to a JSON lines file, a relative path is
+    taken from the application data directory. With a port, a threaded HTTP
+    server on TELEMETRY_HOST serves the latest sample as Prometheus text on
+    /metrics and as JSON on /metrics.json.
+    """
+    def __init__(self, path=None, port=None):
+        self.path = app_data_path(path) if path and not os.path.isabs(path) else path
+        self.port = port
+        self.latest = None
+        self.lock = threading.Lock()
+        self.http_server = None
+        if port:
+            self._serve(port)
+
+    def record(self, sample):
+        with self.lock:
+            self.latest = sample
+        if self.path:
+            try:
+                with open(self.path, 'a', encoding='utf-8') as file:
+                    file.write(json.dumps(sample) + '\n')
+            except OSError as e:
+                print(f"Failed to write telemetry: {e}")
+
+    def prometheus_text(self):
+        """Return the latest sample in the Prometheus text exposition format."""
+        with self.lock:
+            sample = self.latest
+        if sample is None:
+            return ''
+        lines = []
+        for name, metric_type, help_text in TELEMETRY_METRICS:
+            if name == 'restarts_total':
+                values = [({'kind': kind}, count) for kind, count in sample['restarts'].items()]
+            elif name.startswith('process_'):
+                key = name[len('process_'):]
+                values = [({'process': process}, stats[key]) for process, stats in sample['processes'].items()
+                          if stats.get(key) is not None]
+            else:
+                values = [({}, sample.get(name))] if sample.get(name) is not None else []
+            if not values:
+                continue
+            lines.append(f"# HELP {TELEMETRY_PREFIX}{name} {help_text}")
+            lines.append(f"# TYPE {TELEMETRY_PREFIX}{name} {metric_type}")
+            for labels, value in values:
+                labels = dict(labels, url=sample['url'])
+                label_text = ','.join(f'{key}="{self._escape_label(label)}"' for key, label in labels.items())
+                lines.append(f"{TELEMETRY_PREFIX}{name}{{{label_text}}} {value}")
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _escape_label(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def _serve(self, port):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        telemetry = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                if path == '/metrics':
+                    body, content_type = telemetry.prometheus_text(), 'text/plain; version=0.0.4'
+                elif path == '/metrics.json':
+                    with telemetry.lock:
+                        body, content_type = json.dumps(telemetry.latest), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                body = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scraped every few seconds
+
+        try:
+            self.http_server = ThreadingHTTPServer((TELEMETRY_HOST, port), MetricsRequestHandler)
+        except OSError as e:
+            print(f"Can not serve telemetry on {TELEMETRY_HOST}:{port}: {e}")
+            return
+        self.http_server.daemon_threads = True
+        threading.Thread(target=self.http_server.serve_forever, daemon=True).start()
+        print(f"Serving telemetry on http://{TELEMETRY_HOST}:{self.http_server.server_address[1]}/metrics")
+
+    def close(self):
+        if self.http_server is not None:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+            self.http_server = None
+
+
+_telemetry = None
+
+def get_telemetry(path=None, port=None):
+    """Return the shared Telemetry, from the telemetry_file and telemetry_port settings unless given.
+
+    None when neither a file nor a port is configured. The first call decides,
+    the GUI plays many videos over one Telemetry.
+    """
+    global _telemetry
+    if _telemetry is None:
+        path = path or read_setting('telemetry_file', None)
+        port = port or read_setting('telemetry_port', None)
+        if not path and not port:
+            return None
+        _telemetry = Telemetry(path, port)
+    return _telemetry
+
+def format_telemetry(sample):
+    """One line summary of a telemetry sample for the status bar."""
+    parts = []
+    if sample.get('decode_fps') is not None:
+        parts.append(f"{sample['decode_fps']:.1f}/{sample['output_fps']:g} fps")
+    parts.append(f"{sample['frames_dropped_total']} dropped")
+    if sample.get('download_bytes_per_second') is not None:
+        parts.append(f"{8 * sample['download_bytes_per_second'] / 1e6:.1f} Mbit/s")
+    cpu = [stats['cpu_percent'] for stats in sample['processes'].values() if stats.get('cpu_percent') is not None]
+    if cpu:
+        parts.append(f"CPU {sum(cpu):.0f}%")
+    restarts = sum(sample['restarts'].values())
+    if restarts:
+        parts.append(f"{restarts} restarts")
+    return ', '.join(parts)
+
+
+class AudioBranch:
+    """Play one audio stream in an ffplay without video, restarted on its own.
+
+    The audio never goes through the video player or its tiling graph, and
+    its failures do not restart the video. check() restarts it with a
+    RestartBackoff once it exited and has to be called regularly.
+    """
+    def __init__(self, name, player_command, source_command=None):
+        self.name = name
+        self.player_command = player_command  # Reads stdin when there is a source command
+        self.source_command = source_command
+        self.processes = []
+        self.backoff = RestartBackoff()
+        self.start_time = None
+        self.restart_time = None
+        self.restarts = 0
+        self.stopped = False
+
+    def start(self):
+        if self.source_command:
+            source = start_process(self.source_command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            player = start_process(self.player_command, stdin=source.stdout, stderr=subprocess.DEVNULL)
+            source.stdout.close()  # The player owns the pipe now
+            self.processes = [source, player]
+        else:
+            player = start_process(self.player_command, stdin=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.processes = [player]
+        self.start_time = time.time()
+
+    def check(self):
+        if self.stopped or not self.processes:
+            return
+        player = self.processes[-1]
+        if player.poll() is None:
+            return
+        now = time.time()
+        if self.restart_time is None:
+            delay = self.backoff.next_delay(now - self.start_time)
+            self.restart_time = now + delay
+            print(f"{self.name} exited with code {player.returncode}, restarting in {delay:.2f}s")
+        elif now >= self.restart_time:
+            self.restart_time = None
+            self.restarts += 1
+            self._kill()
+            self.start()
+
+    def _kill(self):
+        return stop_processes(self.processes, grace=0)
+
+    def stop(self):
+        self.stopped = True
+        return self._kill()
+
+
+def build_audio_branch(name, url, audio_format, ffplay_path, yt_dlp_path):
+    """Return an AudioBranch playing audio_format, from its URL or through yt-dlp."""
+    player_command = [ffplay_path, '-nodisp', '-vn', '-loglevel', 'error', '-hide_banner']
+    if audio_format.get('url') and audio_format.get('protocol', 'https') in DIRECT_PLAYBACK_PROTOCOLS:
+        return AudioBranch(name, player_command + build_direct_input_arguments(audio_format))
+    source_command = [yt_dlp_path, url, '-4', '-f', audio_format['format_id'], '-o', '-',
+                      '--quiet', '--no-warnings']
+    return AudioBranch(name, player_command + ['-i', '-'], source_command)
+
+
+def get_subsampled_tile_size(tile_width, tile_height, step=1):
+    """Size of a tile taking every step-th pixel of a tile_width x tile_height yuv420p frame."""
+    return tile_width // (2 * step) * 2, tile_height // (2 * step) * 2
+
+def build_tile_planes(frame, canvas, tile_width, tile_height, divisions, step=1):
+    """Return (canvas plane, tile plane) view pairs of a yuv420p frame and its divisions x divisions canvas.
+
+    Canvas planes are shaped (tile row, y, tile column, x) so a single
+    broadcast np.copyto of the tile plane fills every tile. With step, the
+    tiles take every step-th pixel of the frame, see get_subsampled_tile_size().
+    """
+    d = divisions
+    out_width, out_height = get_subsampled_tile_size(tile_width, tile_height, step)
+    planes = []
+    offset = 0
+    canvas_offset = 0
+    for plane_width, plane_height, scale in ((tile_width, tile_height, 1),
+                                             (tile_width // 2, tile_height // 2, 2),
+                                             (tile_width // 2, tile_height // 2, 2)):
+        size = plane_width * plane_height
+        width, height = out_width // scale, out_height // scale
+        tile_plane = frame[offset:offset + size].reshape(plane_height, plane_width)
+        tile_plane = tile_plane[:height * step:step, :width * step:step][None, :, None, :]
+        canvas_size = width * height * d * d
+        canvas_plane = canvas[canvas_offset:canvas_offset + canvas_size].reshape(d, height, d, width)
+        planes.append((canvas_plane, tile_plane))
+        offset += size
+        canvas_offset += canvas_size
+    return planes
+
+
+class NumpyTileRenderer:
+    """Replicate one decoded frame divisions x divisions times with NumPy.
+
+    ffmpeg decodes and downscales the source to the tile size and writes raw
+    yuv420p frames to a pipe. Each frame is read into a preallocated buffer and
+    broadcast into one reused canvas, which is written to the player's stdin.
+    Nothing is allocated per frame. The renderer is video only.
+    """
+    def __init__(self, divisions, tile_width, tile_height, source_fps=None,
+                 ffmpeg_path=None, ffplay_path=None, verbose=True, report_interval=5, fps_cap=None):
+        import numpy as np  # Only needed by this renderer
+
+        self.divisions = divisions
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.source_fps = source_fps or DEFAULT_SOURCE_FPS
+        self.output_fps = min(self.source_fps, fps_cap) if fps_cap else self.source_fps
+        self.ffmpeg_path = ffmpeg_path or find_executable('ffmpeg')
+        self.ffplay_path = ffplay_path or find_executable('ffplay')
+        self.verbose = verbose
+        self.report_interval = report_interval
+        self.decoder_process = None
+        self.player_process = None
+        self.thread = None
+        self.running = False
+
+        d = divisions
+        luma_size = tile_width * tile_height
+        chroma_size = luma_size // 4
+        self.frame_size = luma_size + 2 * chroma_size
+        self.canvas_width = tile_width * d
+        self.canvas_height = tile_height * d
+
+        # Tile planes are views on the read buffer, canvas planes are views on
+        # the output buffer
+        self.frame_buffer = bytearray(self.frame_size)
+        frame = np.frombuffer(self.frame_buffer, dtype=np.uint8)
+        self.canvas_buffer = np.empty(self.frame_size * d * d, dtype=np.uint8)
+        self.planes = build_tile_planes(frame, self.canvas_buffer, tile_width, tile_height, d)
+        self._copyto = np.copyto
+
+        self.frames = 0
+        self.render_seconds = 0.0
+        self.render_seconds_max = 0.0
+        self.render_cpu_seconds = 0.0
+        self.decoder_duplicates = 0  # From the decoder's -stats line, the fps filter fills and trims frames
+        self.decoder_drops = 0
+
+    def decoder_command(self, input_arguments):
+        w, h = self.tile_width, self.tile_height
+        return [
+            self.ffmpeg_path, '-hide_banner', '-nostdin', '-loglevel', 'error', '-stats'
+        ] + input_arguments + [
+            '-an', '-vf',
+            f'fps={self.output_fps:g},'
+            f'scale=w={w}:h={h}:force_original_aspect_ratio=decrease,pad={w}:{h}:(ow-iw)/2:(oh-ih)/2',
+            '-pix_fmt', 'yuv420p', '-f', 'rawvideo', '-'
+        ]
+
+    def raw_input_arguments(self):
+        """Input options describing the canvas written by the renderer."""
+        return [
+            '-f', 'rawvideo', '-pixel_format', 'yuv420p',
+            '-video_size', f'{self.canvas_width}x{self.canvas_height}',
+            '-framerate', f'{self.output_fps:g}', '-i', '-'
+        ]
+
+    def player_command(self):
+        return [self.ffplay_path] + self.raw_input_arguments() + [
+            '-autoexit', '-loglevel', 'error', '-hide_banner', '-fs'
+        ]
+
+    def start(self, input_arguments, stdin=None, player_command=None):
+        """Start decoder, render thread and player, return the player process."""
+        if player_command is None:
+            player_command = self.player_command()
+        self.decoder_process = start_process(
+            self.decoder_command(input_arguments), stdin=stdin if stdin is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        threading.Thread(target=self._read_decoder_stats, args=(self.decoder_process.stderr,), daemon=True).start()
+        self.player_process = start_process(
+            player_command, stdin=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        self.running = True
+        self.thread = threading.Thread(target=self._render_loop, daemon=True)
+        self.thread.start()
+        return self.player_process
+
+    def _read_decoder_stats(self, stderr):
+        pending = b''
+        try:
+            while True:
+                chunk = stderr.read1(4096)
+                if not chunk:
+                    break
+                lines = re.split(rb'[\r\n]', pending + chunk)
+                pending = lines.pop()
+                for line in lines:
+                    line = line.decode('utf-8', 'replace')
+                    if FFMPEG_STATS_PATTERN.match(line):
+                        fields = dict(FFMPEG_STATS_FIELD_PATTERN.findall(line))
+                        self.decoder_duplicates = int(fields.get('dup', self.decoder_duplicates))
+                        self.decoder_drops = int(fields.get('drop', self.decoder_drops))
+        except (OSError, ValueError):
+            pass
+
+    def _read_frame(self, source, view):
+        filled = 0
+        while filled < self.frame_size:
+            count = source.readinto(view[filled:])
+            if not count:
+                return False
+            filled += count
+        return True
+
+    def _render_loop(self):
+        source = self.decoder_process.stdout
+        sink = self.player_process.stdin
+        view = memoryview(self.frame_buffer)
+        canvas = memoryview(self.canvas_buffer)
+        budget_ms = 1000 / self.output_fps
+        report_time = time.time()
+        report_frames = 0
+        cpu_start = time.thread_time()
+        try:
+            while self.running and self._read_frame(source, view):
+                render_start = time.perf_counter()
+                for canvas_plane, tile_plane in self.planes:
+                    self._copyto(canvas_plane, tile_plane)
+                render_time = time.perf_counter() - render_start
+
+                self.frames += 1
+                self.render_seconds += render_time
+                self.render_seconds_max = max(self.render_seconds_max, render_time)
+                sink.write(canvas)
+
+                now = time.time()
+                if self.verbose and now - report_time >= self.report_interval:
+                    fps = (self.frames - report_frames) / (now - report_time)
+                    stats = self.stats()
+                    print(f"NumPy renderer {self.divisions}x{self.divisions}: {fps:.1f} fps, "
+                          f"render {stats['render_ms_avg']:.2f} ms/frame avg, "
+                          f"{stats['render_ms_max']:.2f} ms max (budget {budget_ms:.1f} ms)")
+                    report_time = now
+                    report_frames = self.frames
+        except (BrokenPipeError, OSError, ValueError):
+            pass  # Player closed or renderer stopped
+        finally:
+            self.render_cpu_seconds = time.thread_time() - cpu_start
+            self.running = False
+            try:
+                sink.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+    def is_running(self):
+        return self.running
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'render_ms_avg': 1000 * self.render_seconds / self.frames if self.frames else 0.0,
+            'render_ms_max': 1000 * self.render_seconds_max,
+            'render_cpu_seconds': self.render_cpu_seconds,
+            'decoder_duplicates': self.decoder_duplicates,
+            'decoder_drops': self.decoder_drops,
+        }
+
+    def stop(self):
+        self.running = False
+        stop_processes([self.decoder_process, self.player_process], grace=0)
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+
+
+class OfflineRenderer:
+    """Tile a VOD into a video file, encoding time segments in parallel.
+
+    The source is cut into time segments, each tiled with the downscale
+    graph and encoded by its own single threaded ffmpeg process, as many at
+    a time as there are workers. The segments are then joined by the concat
+    demuxer without re-encoding, and the audio is copied from its input.
+    """
+    def __init__(self, video_input, audio_input, duration, divisions, screen_width, screen_height, output,
+                 ffmpeg_path, tiling_engine=TILING_ENGINE_DOWNSCALE, workers=None, progress=None):
+        self.video_input = video_input  # ffmpeg input options ending with -i, seeked with -ss
+        self.audio_input = audio_input  # Same for the audio, None for a silent output
+        self.duration = duration
+        self.divisions = divisions
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.output = output
+        self.ffmpeg_path = ffmpeg_path
+        if tiling_engine == TILING_ENGINE_NUMPY:
+            tiling_engine = TILING_ENGINE_DOWNSCALE  # The NumPy renderer only plays
+        self.tiling_engine = tiling_engine
+        self.workers = workers or os.cpu_count() or 1
+        self.progress = progress  # Called with (fraction done, seconds left or None)
+        self.encoded_seconds = {}  # Segment index: seconds of it encoded so far
+        self.processes = []
+        self.lock = threading.Lock()
+        self.cancelled = False
+        self.start_time = None
+        self.last_report_time = 0
+
+    def segments(self):
+        """Return (index, start, length) of the segments to encode."""
+        count = max(1, min(self.workers * RENDER_SEGMENTS_PER_WORKER,
+                           int(self.duration // RENDER_MIN_SEGMENT_SECONDS)))
+        length = self.duration / count
+        return [(index, index * length, length if index < count - 1 else self.duration - index * length)
+                for index in range(count)]
+
+    def segment_command(self, start, length, path):
+        # -threads before -i is for the decoder, after it for the encoder
+        return [self.ffmpeg_path, '-hide_banner', '-nostdin', '-loglevel', 'error',
+                '-filter_threads', '1', '-threads', '1', '-ss', f'{start:.3f}'] + self.video_input + [
+            '-t', f'{length:.3f}', '-map', '0:v:0',
+            '-vf', build_tile_filter(self.divisions, self.screen_width, self.screen_height, self.tiling_engine),
+            '-c:v', RENDER_VIDEO_CODEC, '-preset', RENDER_PRESET, '-crf', str(RENDER_CRF), '-pix_fmt', 'yuv420p',
+            '-threads', '1', '-progress', 'pipe:1', '-nostats', '-y', path
+        ]
+
+    def concat_command(self, list_path):
+        command = [self.ffmpeg_path, '-hide_banner', '-nostdin', '-loglevel', 'error',
+                   '-f', 'concat', '-safe', '0', '-i', list_path]
+        if self.audio_input:
+            command += self.audio_input + ['-map', '0:v:0', '-map', '1:a:0?', '-shortest']
+        return command + ['-c', 'copy', '-movflags', '+faststart', '-y', self.output]
+
+    def _encode_segment(self, index, start, length, path):
+        if self.cancelled:
+            return
+        process = start_process(self.segment_command(start, length, path), stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=True)
+        with self.lock:
+            self.processes.append(process)
+        for line in process.stdout:
+            key, _, value = line.strip().partition('=')
+            if key == 'out_time_us' and value.isdigit():
+                self.encoded_seconds[index] = min(int(value) / 1e6, length)
+                self._report()
+        error = process.stderr.read().strip()
+        if process.wait() != 0 and not self.cancelled:
+            raise RuntimeError(f"segment {index} failed: {error.splitlines()[-1] if error else process.returncode}")
+        self.encoded_seconds[index] = length
+        self._report()
+
+    def _report(self, force=False):
+        now = time.time()
+        if self.progress is None or (not force and now - self.last_report_time < RENDER_PROGRESS_INTERVAL):
+            return
+        self.last_report_time = now
+        fraction = min(sum(self.encoded_seconds.values()) / self.duration, 1.0)
+        elapsed = now - self.start_time
+        self.progress(fraction, elapsed * (1 - fraction) / fraction if fraction > 0 else None)
+
+    def run(self):
+        """Render the output file, return timing stats. Raises RuntimeError when ffmpeg fails."""
+        self.start_time = time.time()
+        segments = self.segments()
+        temp_dir = tempfile.mkdtemp(prefix='video-tiler-render-')
+        try:
+            paths = [os.path.join(temp_dir, f'segment{index:04d}.mp4') for index, _, _ in segments]
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(self._encode_segment, index, start, length, paths[index])
+                           for index, start, length in segments]
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    self.cancel()
+                    raise
+            if self.cancelled:
+                raise RuntimeError("render cancelled")
+            encode_seconds = time.time() - self.start_time
+
+            list_path = os.path.join(temp_dir, 'segments.txt')
+            with open(list_path, 'w', encoding='utf-8') as file:
+                for path in paths:
+                    escaped = path.replace("'", "'\\''")
+                    file.write(f"file '{escaped}'\n")
+            completed = subprocess.run(self.concat_command(list_path), stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.PIPE, text=True)
+            if completed.returncode != 0:
+                raise RuntimeError(f"concat failed: {completed.stderr.strip()}")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        self._report(force=True)
+        seconds = time.time() - self.start_time
+        return {
+            'duration': self.duration,
+            'segments': len(segments),
+            'workers': self.workers,
+            'encode_seconds': encode_seconds,
+            'seconds': seconds,
+            'speed': self.duration / seconds,  # Times real time
+        }
+
+    def cancel(self):
+        self.cancelled = True
+        with self.lock:
+            processes = list(self.processes)
+        stop_processes(processes)
+
+
+def format_duration(seconds):
+    """Format seconds as 1h02m03s, 2m03s or 3s."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m{seconds:02d}s"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
+
+
+class MosaicSource:
+    """One URL of a multi-source mosaic, decoded on its own at cell size.
+
+    ffmpeg writes raw yuv420p frames at the mosaic frame rate. A thread reads
+    each frame into a back buffer and swaps it with the front buffer, which
+    the compositor copies into the cells of this source. A source that fails
+    is restarted by MosaicRenderer without touching the others.
+    """
+    def __init__(self, index, url, cells, cell_width, cell_height, fps, ffmpeg_path, yt_dlp_path):
+        self.index = index
+        self.url = url
+        self.cells = cells  # (row, column) of the cells showing this source
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.fps = fps
+        self.ffmpeg_path = ffmpeg_path
+        self.yt_dlp_path = yt_dlp_path
+        self.frame_size = cell_width * cell_height * 3 // 2
+        self.front = bytearray(self.frame_size)
+        self.back = bytearray(self.frame_size)
+        self.lock = threading.Lock()
+        self.video = None  # Resolved YouTubeVideo
+        self.processes = []
+        self.thread = None
+        self.state = 'starting'
+        self.reason = None
+        self.errors = deque(maxlen=5)
+        self.frames = 0
+        self.start_time = None
+        self.last_frame_time = None
+        self.restarts = 0
+        self.backoff = RestartBackoff()
+        self.restart_time = None  # When the pending restart is due
+
+    @property
+    def title(self):
+        return self.video.title if self.video and self.video.title else self.url
+
+    def resolve(self, divisions, screen_width, screen_height):
+        """Extract the source info and choose the smallest format covering a cell."""
+        # Cells only need video, the one audio track of the mosaic has its own branch
+        video = YouTubeVideo(None, self.url, divisions, verbose=False, resolve=False,
+                             audio_mode=AUDIO_MODE_SEPARATE)
+        video._get_video_info()
+        video.screen_width, video.screen_height = screen_width, screen_height
+        video._choose_format()
+        if not video.selected_formats:
+            # Every format is smaller than a cell, take the largest one with video
+            formats = [f for f in extract_info(self.url).get('formats', []) if f.get('vcodec') not in (None, 'none')]
+            if not formats:
+                raise ValueError("no format with video found")
+            video.selected_formats = [max(formats, key=lambda f: (f.get('height') or 0, f.get('width') or 0))]
+            video.format = video.selected_formats[0]['format_id']
+        self.video = video
+
+    def decoder_command(self, input_arguments):
+        w, h = self.cell_width, self.cell_height
+        # VODs are read at their own speed, live streams arrive at it anyway
+        pace = [] if self.video.is_live else ['-re']
+        return [
+            self.ffmpeg_path, '-hide_banner', '-nostdin', '-loglevel', 'error'
+        ] + pace + input_arguments + [
+            '-map', '0:v:0', '-an', '-sn', '-vf',
+            f'fps={self.fps:g},scale=w={w}:h={h}:force_original_aspect_ratio=decrease,'
+            f'pad={w}:{h}:(ow-iw)/2:(oh-ih)/2',
+            '-pix_fmt', 'yuv420p', '-f', 'rawvideo', '-'
+        ]
+
+    def start(self):
+        video_format = self.video.selected_formats[0]
+        if video_format.get('url') and video_format.get('protocol', 'https') in DIRECT_PLAYBACK_PROTOCOLS:
+            decoder = start_process(self.decoder_command(build_direct_input_arguments(video_format)),
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            self.processes = [decoder]
+        else:
+            # Only the video format: the audio of the mosaic comes from a single source
+            relay = start_process(
+                [self.yt_dlp_path, self.url, '-4', '-f', video_format['format_id'], '-o', '-',
+                 '--quiet', '--no-warnings'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            decoder = start_process(self.decoder_command(['-i', '-']), stdin=relay.stdout,
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            relay.stdout.close()  # The decoder owns the pipe now
+            self.processes = [relay, decoder]
+        self.start_time = time.time()
+        self.last_frame_time = None
+        self.state = 'starting'
+        threading.Thread(target=self._read_errors, args=(decoder.stderr,), daemon=True).start()
+        self.thread = threading.Thread(target=self._read_frames, args=(decoder.stdout,), daemon=True)
+        self.thread.start()
+
+    def _read_errors(self, stderr):
+        try:
+            for line in stderr:
+                line = line.decode('utf-8', 'replace').strip()
+                if line:
+                    self.errors.append(line)
+        except (OSError, ValueError):
+            pass
+
+    def _read_frames(self, stdout):
+        view = memoryview(self.back)
+        try:
+            while True:
+                filled = 0
+                while filled < self.frame_size:
+                    count = stdout.readinto(view[filled:])
+                    if not count:
+                        return
+                    filled += count
+                with self.lock:
+                    self.front, self.back = self.back, self.front
+                    self.frames += 1
+                    self.last_frame_time = time.time()
+                view = memoryview(self.back)
+        except (OSError, ValueError):
+            pass
+
+    def check(self, stall_seconds):
+        """Update the health state, return a failure reason or None."""
+        if self.state in ('restarting', 'failed'):
+            return None
+        now = time.time()
+        for process in self.processes:
+            if process.poll() is not None:
+                error = f" ({self.errors[-1]})" if self.errors else ""
+                return f"exited with code {process.returncode}{error}"
+        if self.last_frame_time is None:
+            if now - self.start_time > SUPERVISOR_STARTUP_TIMEOUT:
+                return f"no frame after {SUPERVISOR_STARTUP_TIMEOUT}s"
+            return None
+        if now - self.last_frame_time > stall_seconds:
+            self.state = 'stalled'
+            return f"no frame for {stall_seconds}s"
+        self.state = 'playing'
+        return None
+
+    def stop(self):
+        stop_processes(self.processes, grace=0)
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+
+    def stats(self):
+        return {
+            'url': self.url,
+            'title': self.title,
+            'state': self.state,
+            'reason': self.reason,
+            'cells': len(self.cells),
+            'frames': self.frames,
+            'restarts': self.restarts,
+        }
+
+
+class MosaicRenderer:
+    """Show several URLs in one grid, each decoded once at cell size.
+
+    Cells are given to the sources in turn, so with fewer sources than cells
+    a source fills several cells. The compositor copies the newest frame of
+    every source into its cells with NumPy at MOSAIC_FPS and writes the
+    canvas to one ffplay. A health thread restarts a failed source with its
+    own backoff while the others keep playing, and its cells keep the last
+    frame. The audio of one source only is played, by an ffplay without
+    video.
+    """
+    label = 'Mosaic'  # Shown in the log messages
+
+    def __init__(self, urls, divisions, screen_width=DEFAULT_SCREEN_WIDTH, screen_height=DEFAULT_SCREEN_HEIGHT,
+                 audio_source=0, fps=None, verbose=True):
+        import numpy as np  # Only needed by the mosaic and the NumPy renderer
+
+        if not urls:
+            raise ValueError("The mosaic needs at least one URL")
+        self._init_renderer(fps, MOSAIC_FPS, verbose)
+        self.divisions = divisions
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.audio_source = audio_source if audio_source is not None and 0 <= audio_source < len(urls) else None
+
+        d = divisions
+        self.cell_width, self.cell_height = get_tile_size(screen_width, screen_height, d)
+        self.canvas_width = self.cell_width * d
+        self.canvas_height = self.cell_height * d
+        cells = [(row, column) for row in range(d) for column in range(d)]
+        self.sources = [
+            MosaicSource(index, url, cells[index::len(urls)], self.cell_width, self.cell_height, self.fps,
+                         self.ffmpeg_path, self.yt_dlp_path)
+            for index, url in enumerate(urls[:len(cells)])  # Sources beyond the cell count are not shown
+        ]
+
+        # Canvas planes shaped (cell row, y, cell column, x) like NumpyTileRenderer,
+        # black until a source has a frame
+        self.canvas_buffer = np.empty(self.canvas_width * self.canvas_height * 3 // 2, dtype=np.uint8)
+        self.canvas_planes = []
+        offset = 0
+        for plane_width, plane_height, black in ((self.cell_width, self.cell_height, 16),
+                                                 (self.cell_width // 2, self.cell_height // 2, 128),
+                                                 (self.cell_width // 2, self.cell_height // 2, 128)):
+            size = plane_width * plane_height * d * d
+            plane = self.canvas_buffer[offset:offset + size].reshape(d, plane_height, d, plane_width)
+            plane.fill(black)
+            self.canvas_planes.append((plane, plane_width, plane_height))
+            offset += size
+        self._np = np
+
+    def _init_renderer(self, fps, default_fps, verbose):
+        """Set up what the mosaic and the wall share: the executables, the frame rate and the run state."""
+        self.fps = fps or min(default_fps, get_fps_cap())
+        self.verbose = verbose
+        self.ffmpeg_path = find_executable('ffmpeg')
+        self.ffplay_path = find_executable('ffplay')
+        self.yt_dlp_path = find_executable('yt-dlp')
+        if not self.yt_dlp_path or not self.ffmpeg_path or not self.ffplay_path:
+            raise FileNotFoundError("One or more required executables (yt-dlp, ffmpeg, ffplay) not found.")
+        self.stall_seconds = read_setting('stall_seconds', STALL_SECONDS)
+        self.player_process = None
+        self.audio_branch = None
+        self.running = False
+        self.stopped = False
+        self.frames = 0
+        self.threads = []
+
+    def raw_input_arguments(self):
+        return [
+            '-f', 'rawvideo', '-pixel_format', 'yuv420p',
+            '-video_size', f'{self.canvas_width}x{self.canvas_height}',
+            '-framerate', f'{self.fps:g}', '-i', '-'
+        ]
+
+    def player_command(self):
+        return [self.ffplay_path] + self.raw_input_arguments() + [
+            '-autoexit', '-loglevel', 'error', '-hide_banner', '-fs', '-window_title', 'Video Tiler mosaic'
+        ]
+
+    def _start_audio(self):
+        source = self.sources[self.audio_source]
+        video = source.video
+        audio_format = video.audio_format
+        if audio_format is None and video.selected_formats[0].get('acodec') not in (None, 'none'):
+            audio_format = video.selected_formats[0]  # Muxed format, its video is not decoded by -vn
+        if audio_format is None:
+            print(f"{self.label} source {source.index} '{source.title}' has no audio, it is silent")
+            return
+        self.audio_branch = build_audio_branch(f'{self.label} audio', source.url, audio_format,
+                                               self.ffplay_path, self.yt_dlp_path)
+        self.audio_branch.start()
+
+    def start(self):
+        """Resolve every source in parallel, then start the decoders, the player and the audio."""
+        def resolve(source):
+            try:
+                source.resolve(self.divisions, self.screen_width, self.screen_height)
+                source.start()
+            except Exception as e:
+                self._fail(source, f"failed to start: {e}")
+
+        with ThreadPoolExecutor(max_workers=min(len(self.sources), URL_RESOLVE_WORKERS * 2)) as executor:
+            list(executor.map(resolve, self.sources))
+        if self.stopped:
+            for source in self.sources:
+                source.stop()
+            return None
+        self.player_process = start_process(self.player_command(), stdin=subprocess.PIPE,
+                                            stderr=subprocess.DEVNULL)
+        if self.audio_source is not None and self.sources[self.audio_source].video is not None:
+            self._start_audio()
+        self.running = True
+        for target in (self._composite_loop, self._health_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        for source in self.sources:
+            print(f"{self.label} source {source.index} '{source.title}': {len(source.cells)} cells, {source.state}")
+        return self.player_process
+
+    def _composite_loop(self):
+        sink = self.player_process.stdin
+        canvas = memoryview(self.canvas_buffer)
+        np = self._np
+        interval = 1 / self.fps
+        next_time = time.perf_counter()
+        try:
+            while self.running:
+                for source in self.sources:
+                    if not source.frames:
+                        continue
+                    with source.lock:
+                        frame = np.frombuffer(source.front, dtype=np.uint8)
+                        offset = 0
+                        for plane, plane_width, plane_height in self.canvas_planes:
+                            size = plane_width * plane_height
+                            source_plane = frame[offset:offset + size].reshape(plane_height, plane_width)
+                            for row, column in source.cells:
+                                np.copyto(plane[row, :, column, :], source_plane)
+                            offset += size
+                sink.write(canvas)
+                self.frames += 1
+
+                next_time += interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -interval:
+                    next_time = time.perf_counter()  # Too late, do not try to catch up
+        except (BrokenPipeError, OSError, ValueError):
+            pass  # Player closed
+        finally:
+            self.running = False
+            try:
+                sink.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+    def _fail(self, source, reason):
+        if self.stopped:
+            return  # Its processes were killed by stop()
+        source.reason = reason
+        source.stop()
+        # 'failed' sources never started, both are retried after the backoff delay
+        source.state = 'failed' if source.video is None else 'restarting'
+        delay = source.backoff.next_delay(time.time() - (source.start_time or time.time()))
+        source.restart_time = time.time() + delay
+        print(f"{self.label} source {source.index} '{source.title}' {reason}, restarting in {delay:.2f}s")
+
+    def _health_loop(self):
+        while self.running:
+            time.sleep(MOSAIC_HEALTH_INTERVAL)
+            now = time.time()
+            for source in self.sources:
+                previous_state = source.state
+                reason = source.check(self.stall_seconds)
+                if reason is not None:
+                    self._fail(source, reason)
+                elif source.state in ('restarting', 'failed') and now >= source.restart_time:
+                    self._restart(source)
+                elif source.state != previous_state and self.verbose:
+                    print(f"{self.label} source {source.index} '{source.title}': {source.state}")
+            if self.audio_branch is not None:
+                self.audio_branch.check()
+            self._check_players()
+
+    def _check_players(self):
+        """Called by the health thread, the player's exit is seen by is_running()."""
+
+    def _restart(self, source):
+        source.restarts += 1
+        try:
+            info_cache.invalidate(source.url)  # Its stream URLs may have expired
+            source.resolve(self.divisions, self.screen_width, self.screen_height)
+            source.start()
+            print(f"{self.label} source {source.index} '{source.title}' restarted")
+        except Exception as e:
+            self._fail(source, f"failed to restart: {e}")
+
+    def is_running(self):
+        return self.running and self.player_process.poll() is None
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'sources': [source.stats() for source in self.sources],
+        }
+
+    def _processes(self):
+        """Return every process of the mosaic, stop() stops them together."""
+        processes = [self.player_process]
+        for source in self.sources:
+            processes += source.processes
+        if self.audio_branch is not None:
+            processes += self.audio_branch.processes
+        return processes
+
+    def stop(self):
+        self.stopped = True
+        self.running = False
+        if self.audio_branch is not None:
+            self.audio_branch.stopped = True
+        stop_processes(self._processes(), grace=0)
+        # The processes are gone, this joins the threads around them
+        for source in self.sources:
+            source.stop()
+        if self.audio_branch is not None:
+            self.audio_branch.stop()
+        for thread in self.threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=5)
+
+
+class FrameRing:
+    """Fixed size frames in a shared memory ring, written by one process and read by others.
+
+    The header holds the number of frames written, a running flag and the
+    sequence number of the frame in each slot, -1 while the slot is written.
+    The writer fills the slot of begin_write() in place and publishes it.
+    Readers use the newest slot where it is and check is_valid() afterwards,
+    in case the writer lapped them meanwhile.
+    """
+    HEADER_FIELDS = 2  # Frames written, running
+
+    def __init__(self, frame_size, slots=FRAME_RING_SLOTS, name=None):
+        from multiprocessing import shared_memory
+        import numpy as np
+
+        self.frame_size = frame_size
+        self.slots = slots
+        self.owner = name is None
+        header_size = 8 * (self.HEADER_FIELDS + slots)
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=header_size + frame_size * slots)
+        else:
+            try:
+                self.shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Before Python 3.13 the resource tracker of a process attaching
+                # the ring would unlink it when that process exits
+                self.shm = shared_memory.SharedMemory(name=name)
+                if os.name == 'posix':
+                    from multiprocessing import resource_tracker
+                    resource_tracker.unregister(self.shm._name, 'shared_memory')
+        self.header = np.ndarray((self.HEADER_FIELDS + slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.sequences = self.header[self.HEADER_FIELDS:]
+        if self.owner:
+            self.header[0] = 0
+            self.header[1] = 1
+            self.sequences[:] = -1
+        self.frames = [self.shm.buf[header_size + i * frame_size:header_size + (i + 1) * frame_size]
+                       for i in range(slots)]
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def begin_write(self):
+        """Return the writable view of the next slot, invalidated until publish()."""
+        sequence = int(self.header[0])
+        self.sequences[sequence % self.slots] = -1
+        return self.frames[sequence % self.slots]
+
+    def publish(self):
+        sequence = int(self.header[0])
+        self.sequences[sequence % self.slots] = sequence
+        self.header[0] = sequence + 1
+
+    def latest(self):
+        """Return the sequence number of the newest frame, None before the first one."""
+        sequence = int(self.header[0]) - 1
+        return sequence if sequence >= 0 and self.is_valid(sequence) else None
+
+    def is_valid(self, sequence):
+        return int(self.sequences[sequence % self.slots]) == sequence
+
+    def is_running(self):
+        return bool(self.header[1])
+
+    def close(self):
+        if self.owner and self.header is not None:
+            self.header[1] = 0  # Presenters exit when they see it
+        self.header = self.sequences = None
+        self.frames = []
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # Views on it are still alive, the mapping goes with the process
+        if self.owner:
+            self.shm.unlink()
+            self.owner = False
+
+
+class WallSource(MosaicSource):
+    """The single source of a monitor wall, decoded into a FrameRing instead of a double buffer."""
+    def __init__(self, url, tile_width, tile_height, fps, ffmpeg_path, yt_dlp_path, ring):
+        super().__init__(0, url, [], tile_width, tile_height, fps, ffmpeg_path, yt_dlp_path)
+        self.ring = ring
+
+    def _read_frames(self, stdout):
+        try:
+            while True:
+                view = self.ring.begin_write()
+                filled = 0
+                while filled < self.frame_size:
+                    count = stdout.readinto(view[filled:])
+                    if not count:
+                        return
+                    filled += count
+                self.ring.publish()
+                self.frames += 1
+                self.last_frame_time = time.time()
+        except (OSError, ValueError):
+            pass
+
+
+def get_monitor_geometries():
+    """Return the position and size of every monitor, one DEFAULT_SCREEN_WIDTH x DEFAULT_SCREEN_HEIGHT without any."""
+    try:
+        from screeninfo import get_monitors
+        monitors = [{'x': m.x, 'y': m.y, 'width': m.width, 'height': m.height, 'name': m.name}
+                    for m in get_monitors()]
+        if monitors:
+            return monitors
+        print(f"No monitor found, using {DEFAULT_SCREEN_WIDTH}x{DEFAULT_SCREEN_HEIGHT}")
+    except Exception as e:
+        print(f"No monitor found ({e}), using {DEFAULT_SCREEN_WIDTH}x{DEFAULT_SCREEN_HEIGHT}")
+    return [{'x': 0, 'y': 0, 'width': DEFAULT_SCREEN_WIDTH, 'height': DEFAULT_SCREEN_HEIGHT, 'name': None}]
+
+
+class WallRenderer(MosaicRenderer):
+    """Span one URL over every monitor, decoded once.
+
+    The source is decoded at the largest tile size of the monitors into a
+    FrameRing in shared memory. Every monitor has a presenter process (see
+    run_wall_presenter) showing the newest frame of the ring in its own grid
+    through an ffplay placed on that monitor, ffplay scales the canvas to
+    the monitor. The source, its audio and its restarts are handled as a
+    MosaicRenderer source, a crashed presenter is restarted on its own and
+    closing any presenter window stops the wall.
+    """
+    label = 'Wall'
+
+    def __init__(self, url, monitors=None, divisions_list=None, fps=None, verbose=True):
+        if monitors is None:
+            monitors = get_monitor_geometries()
+        if not divisions_list:
+            divisions_list = [read_divisions()]
+        # Monitors without their own divisions use the last ones given
+        divisions_list = list(divisions_list) + [divisions_list[-1]] * (len(monitors) - len(divisions_list))
+
+        self._init_renderer(fps, DEFAULT_SOURCE_FPS, verbose)
+        self.monitors = monitors
+
+        # The largest tile of the monitors is decoded, the format is chosen for its monitor
+        tiles = [get_tile_size(m['width'], m['height'], d) for m, d in zip(monitors, divisions_list)]
+        largest = max(range(len(monitors)), key=lambda i: tiles[i][0] * tiles[i][1])
+        self.tile_width, self.tile_height = tiles[largest]
+        self.divisions = divisions_list[largest]
+        self.screen_width = monitors[largest]['width']
+        self.screen_height = monitors[largest]['height']
+
+        self.ring = FrameRing(self.tile_width * self.tile_height * 3 // 2)
+        self.sources = [WallSource(url, self.tile_width, self.tile_height, self.fps,
+                                   self.ffmpeg_path, self.yt_dlp_path, self.ring)]
+        self.presenters = []
+        for monitor, d, (tile_width, tile_height) in zip(monitors, divisions_list, tiles):
+            # Monitors with smaller tiles take every step-th pixel of the decoded ones
+            tile_width, tile_height = fit_tile_size(tile_width, tile_height, self.tile_width, self.tile_height)
+            step = max(1, min(self.tile_width // tile_width, self.tile_height // tile_height))
+            self.presenters.append({'monitor': monitor, 'divisions': d, 'step': step, 'process': None,
+                                    'backoff': RestartBackoff(), 'start_time': None, 'restart_time': None,
+                                    'restarts': 0})
+        self.audio_source = 0
+
+    def presenter_command(self, presenter):
+        monitor = presenter['monitor']
+        spec = {
+            'ring': self.ring.name, 'slots': self.ring.slots, 'frame_size': self.ring.frame_size,
+            'tile_width': self.tile_width, 'tile_height': self.tile_height, 'step': presenter['step'],
+            'divisions': presenter['divisions'], 'fps': self.fps, 'ffplay': self.ffplay_path,
+            'x': monitor['x'], 'y': monitor['y'], 'width': monitor['width'], 'height': monitor['height'],
+        }
+        return program_command() + ['--wall-presenter', json.dumps(spec)]
+
+    def _start_presenter(self, presenter):
+        # The presenter's ffplay joins its process group, they are stopped together
+        presenter['process'] = start_process(self.presenter_command(presenter), stdin=subprocess.DEVNULL)
+        presenter['start_time'] = time.time()
+        presenter['restart_time'] = None
+
+    def start(self):
+        """Resolve and start the source, then a presenter per monitor and the audio."""
+        source = self.sources[0]
+        try:
+            source.resolve(self.divisions, self.screen_width, self.screen_height)
+            source.start()
+        except Exception as e:
+            self._fail(source, f"failed to start: {e}")
+        if self.stopped:
+            source.stop()
+            return None
+        for presenter in self.presenters:
+            self._start_presenter(presenter)
+        if source.video is not None:
+            self._start_audio()
+        self.running = True
+        thread = threading.Thread(target=self._health_loop, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+        for presenter in self.presenters:
+            monitor = presenter['monitor']
+            tile_width, tile_height = get_subsampled_tile_size(self.tile_width, self.tile_height, presenter['step'])
+            print(f"Wall monitor {monitor['name'] or ''} {monitor['width']}x{monitor['height']}"
+                  f"+{monitor['x']}+{monitor['y']}: {presenter['divisions']}x{presenter['divisions']} "
+                  f"tiles of {tile_width}x{tile_height}")
+        return self.presenters[0]['process']
+
+    def _check_players(self):
+        now = time.time()
+        for presenter in self.presenters:
+            process = presenter['process']
+            if presenter['restart_time'] is not None:
+                if now >= presenter['restart_time']:
+                    presenter['restarts'] += 1
+                    self._start_presenter(presenter)
+            elif process.poll() == 0:
+                print("A wall presenter window was closed, stopping the wall")
+                self.running = False
+            elif process.poll() is not None:
+                delay = presenter['backoff'].next_delay(now - presenter['start_time'])
+                presenter['restart_time'] = now + delay
+                print(f"Wall presenter of monitor {presenter['monitor']['name'] or ''} exited with code "
+                      f"{process.returncode}, restarting in {delay:.2f}s")
+
+    def is_running(self):
+        return self.running
+
+    def stats(self):
+        return {
+            'frames': self.sources[0].frames,
+            'sources': [source.stats() for source in self.sources],
+            'presenters': [{'monitor': p['monitor'], 'divisions': p['divisions'], 'restarts': p['restarts']}
+                           for p in self.presenters],
+        }
+
+    def _processes(self):
+        return super()._processes() + [presenter['process'] for presenter in self.presenters]
+
+    def stop(self):
+        super().stop()  # Presenters included
+        self.ring.close()
+
+
+def run_wall_presenter(spec):
+    """Show the frames of a wall's FrameRing in a grid on one monitor, return the exit code.
+
+    Runs in its own process, started by WallRenderer with --wall-presenter.
+    The tiles are copied from the shared memory straight into the canvas.
+    """
+    import numpy as np
+    ring = FrameRing(spec['frame_size'], spec['slots'], name=spec['ring'])
+    d = spec['divisions']
+    tile_width, tile_height = get_subsampled_tile_size(spec['tile_width'], spec['tile_height'], spec['step'])
+    canvas_width, canvas_height = tile_width * d, tile_height * d
+    canvas = np.empty(canvas_width * canvas_height * 3 // 2, dtype=np.uint8)
+    slot_planes = [build_tile_planes(np.frombuffer(frame, dtype=np.uint8), canvas,
+                                     spec['tile_width'], spec['tile_height'], d, spec['step'])
+                   for frame in ring.frames]
+    # Left in the presenter's process group, so stopping the presenter stops it
+    player = subprocess.Popen([
+        spec['ffplay'], '-f', 'rawvideo', '-pixel_format', 'yuv420p',
+        '-video_size', f'{canvas_width}x{canvas_height}', '-framerate', f"{spec['fps']:g}", '-i', '-',
+        '-left', str(spec['x']), '-top', str(spec['y']), '-x', str(spec['width']), '-y', str(spec['height']),
+        '-noborder', '-window_title', 'Video Tiler wall', '-autoexit', '-loglevel', 'error', '-hide_banner'
+    ], stdin=subprocess.PIPE)
+
+    shown = None
+    stopped = False
+    try:
+        while player.poll() is None:
+            if not ring.is_running():
+                stopped = True
+                break
+            sequence = ring.latest()
+            if sequence is None or sequence == shown:
+                time.sleep(WALL_PRESENTER_POLL)
+                continue
+            for canvas_plane, tile_plane in slot_planes[sequence % ring.slots]:
+                np.copyto(canvas_plane, tile_plane)
+            if not ring.is_valid(sequence):
+                continue  # Overwritten while copied, take the newest one
+            shown = sequence
+            player.stdin.write(canvas)
+    except (BrokenPipeError, OSError, ValueError):
+        pass
+    finally:
+        try:
+            player.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        if stopped:
+            stop_processes([player], grace=0)
+        slot_planes = canvas_plane = tile_plane = None  # Views on the ring, released before it is closed
+        ring.close()
+    # 0 when the wall stopped or the window was closed, WallRenderer restarts the presenter otherwise
+    return 0 if stopped or player.wait() == 0 else 1
+
+
+def _make_hls_request_handler(server):
+    """Return a request handler class serving the segment directory of an HlsServer."""
+    from http.server import SimpleHTTPRequestHandler
+
+    class HlsRequestHandler(SimpleHTTPRequestHandler):
+        extensions_map = dict(SimpleHTTPRequestHandler.extensions_map,
+                              **{'.m3u8': 'application/vnd.apple.mpegurl', '.ts': 'video/mp2t'})
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=server.directory, **kwargs)
+
+        def do_GET(self):
+            server.client_seen(self.client_address[0])
+            if self.path.split('?')[0] == '/stats.json':
+                body = json.dumps(server.stats()).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server.bytes_served += len(body)
+                return
+            super().do_GET()
+
+        def end_headers(self):
+            if self.path.split('?')[0].endswith('.m3u8'):
+                self.send_header('Cache-Control', 'no-cache')  # Rewritten with every segment
+            super().end_headers()
+
+        def copyfile(self, source, outputfile):
+            while True:
+                chunk = source.read(RELAY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                outputfile.write(chunk)
+                server.bytes_served += len(chunk)
+
+        def log_message(self, format, *args):
+            pass  # One line per segment request is too much, see HlsServer.stats()
+
+    return HlsRequestHandler
+
+
+class HlsServer:
+    """Tile a URL once and serve the result on the local network as HLS.
+
+    The video resolves the URL and builds the source like a playback, one
+    ffmpeg tiles it and encodes HLS segments into a temporary directory, and
+    a threaded HTTP server serves that directory, so the upstream stream is
+    fetched and decoded once for every screen of the network. Clients play
+    http://<host>:<port>/stream.m3u8 with one division. The pipeline is
+    restarted with a backoff when one of its processes exits, a discontinuity
+    tells the clients.
+    """
+    def __init__(self, video, host='0.0.0.0', port=SERVE_PORT, verbose=True):
+        self.video = video
+        self.host = host
+        self.port = port
+        self.verbose = verbose
+        self.directory = tempfile.mkdtemp(prefix='video-tiler-serve-')
+        self.processes = []
+        self.backoff = RestartBackoff()
+        self.start_time = None  # Of the current pipeline
+        self.serve_time = None
+        self.restart_time = None
+        self.restarts = 0
+        self.errors = deque(maxlen=5)
+        self.clients = {}  # Address, last request time
+        self.bytes_served = 0
+        self.samples = deque()  # (time, bytes served) over SERVE_STATS_INTERVAL
+        self.http_server = None
+        self.running = False
+        self.threads = []
+
+    @property
+    def url(self):
+        host = '127.0.0.1' if self.host in ('0.0.0.0', '') else self.host
+        return f"http://{host}:{self.http_server.server_address[1] if self.http_server else self.port}/{SERVE_PLAYLIST_NAME}"
+
+    def client_seen(self, address):
+        self.clients[address] = time.time()
+
+    def encoder_command(self, input_arguments):
+        video = self.video
+        tiling_engine = video.tiling_engine if video.tiling_engine != TILING_ENGINE_NUMPY else TILING_ENGINE_DOWNSCALE
+        # VODs are encoded at their own speed, live streams arrive at it anyway
+        pace = [] if video.is_live else ['-re']
+        audio = ['-an'] if video.audio_mode == AUDIO_MODE_OFF else \
+            ['-map', '0:a:0?', '-c:a', 'aac', '-b:a', SERVE_AUDIO_BITRATE]
+        return [
+            video.ffmpeg_path, '-hide_banner', '-nostdin', '-loglevel', 'error'
+        ] + pace + input_arguments + [
+            '-map', '0:v:0',
+            '-vf', build_tile_filter(video.divisions, video.screen_width, video.screen_height, tiling_engine,
+                                     video.fps_cap),
+            '-c:v', RENDER_VIDEO_CODEC, '-preset', RENDER_PRESET, '-crf', str(RENDER_CRF), '-pix_fmt', 'yuv420p',
+            # A key frame starts every segment
+            '-force_key_frames', f'expr:gte(t,n_forced*{SERVE_SEGMENT_SECONDS})',
+        ] + audio + [
+            '-f', 'hls', '-hls_time', str(SERVE_SEGMENT_SECONDS), '-hls_list_size', str(SERVE_PLAYLIST_SIZE),
+            '-hls_flags', 'delete_segments+omit_endlist+discont_start',
+            # Sequence numbers keep growing over restarts so clients do not replay old ones
+            '-hls_start_number_source', 'epoch',
+            '-hls_segment_filename', os.path.join(self.directory, 'segment%d.ts'),
+            os.path.join(self.directory, SERVE_PLAYLIST_NAME)
+        ]
+
+    def _start_pipeline(self):
+        source_command, input_arguments = self.video._build_source()
+        command = self.encoder_command(input_arguments)
+        if self.verbose:
+            print(command)
+        if source_command:
+            source = start_process(source_command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            encoder = start_process(command, stdin=source.stdout, stderr=subprocess.PIPE)
+            source.stdout.close()  # The encoder owns the pipe now
+            self.processes = [source, encoder]
+        else:
+            encoder = start_process(command, stdin=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            self.processes = [encoder]
+        threading.Thread(target=self._read_errors, args=(encoder.stderr,), daemon=True).start()
+        self.start_time = time.time()
+
+    def _read_errors(self, stderr):
+        try:
+            for line in stderr:
+                line = line.decode('utf-8', 'replace').strip()
+                if line:
+                    self.errors.append(line)
+        except (OSError, ValueError):
+            pass
+
+    def _stop_pipeline(self):
+        stop_processes(self.processes, grace=0)
+        self.processes = []
+
+    def start(self):
+        """Start the HTTP server and the encoding pipeline, return the playlist URL."""
+        from http.server import ThreadingHTTPServer
+        self.http_server = ThreadingHTTPServer((self.host, self.port), _make_hls_request_handler(self))
+        self.http_server.daemon_threads = True
+        self.running = True
+        self.serve_time = time.time()
+        self.samples.append((self.serve_time, 0))
+        self._start_pipeline()
+        for target in (self.http_server.serve_forever, self._health_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        print(f"Serving '{self.video.title}' on {self.url}")
+        return self.url
+
+    def _health_loop(self):
+        last_report = time.time()
+        while self.running:
+            time.sleep(1)
+            now = time.time()
+            if self.restart_time is not None:
+                if now >= self.restart_time:
+                    self.restart_time = None
+                    self.restarts += 1
+                    info_cache.invalidate(self.video.url)  # Its stream URLs may have expired
+                    try:
+                        self.video._choose_format()
+                        self._start_pipeline()
+                    except Exception as e:
+                        self.errors.append(str(e))
+                        self.restart_time = now + self.backoff.next_delay(0)
+            elif any(process.poll() is not None for process in self.processes):
+                codes = [process.returncode for process in self.processes]
+                self._stop_pipeline()
+                delay = self.backoff.next_delay(now - self.start_time)
+                self.restart_time = now + delay
+                error = f" ({self.errors[-1]})" if self.errors else ""
+                print(f"Serving pipeline exited with codes {codes}{error}, restarting in {delay:.2f}s")
+            if self.verbose and now - last_report >= SERVE_STATS_INTERVAL:
+                last_report = now
+                stats = self.stats()
+                print(f"Serving: {stats['clients']} clients, {stats['bandwidth'] / 1e6 * 8:.2f} Mbit/s, "
+                      f"{stats['bytes_served'] / 1e6:.1f} MB served")
+
+    def stats(self):
+        now = time.time()
+        self.samples.append((now, self.bytes_served))
+        while len(self.samples) > 1 and self.samples[1][0] <= now - SERVE_STATS_INTERVAL:
+            self.samples.popleft()
+        window_start, window_bytes = self.samples[0]
+        elapsed = now - window_start
+        return {
+            'url': self.url,
+            'clients': sum(1 for seen in list(self.clients.values()) if now - seen < SERVE_CLIENT_TIMEOUT),
+            'clients_total': len(self.clients),
+            'bytes_served': self.bytes_served,
+            'bandwidth': (self.bytes_served - window_bytes) / elapsed if elapsed > 0 else 0,  # Bytes per second
+            'restarts': self.restarts,
+            'uptime': now - self.serve_time if self.serve_time else 0,
+        }
+
+    def stop(self):
+        self.running = False
+        self._stop_pipeline()
+        if self.http_server is not None:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+        for thread in self.threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=5)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def compare_playback_modes(url, divisions=None, duration=20):
+    """Measure CPU use and time to first frame of every playback mode for url.
+
+    The player is replaced by an ffmpeg null sink running the same tiling
+    graph, so only the way the stream reaches the decoder differs.
+    """
+    import psutil
+    from prettytable import PrettyTable
+    table = PrettyTable()
+    table.field_names = ["Mode", "Processes", "Time to first frame (s)", "Frames", "CPU (s)", "CPU (%)"]
+    for playback_mode in PLAYBACK_MODES:
+        video = YouTubeVideo(None, url, divisions, verbose=False,
+                             tiling_engine=TILING_ENGINE_DOWNSCALE, playback_mode=playback_mode)
+        if not video.ytdlp_is_valid:
+            print(f"URL '{url}' does not seem to be a valid video.")
+            return None
+        # Resolve once outside of the measure, as play_video does before its loop
+        video._choose_format()
+        source_command, input_arguments = video._build_source()
+        sink_command = [video.ffmpeg_path, '-hide_banner', '-loglevel', 'error', '-nostats',
+                        '-progress', 'pipe:1'] + input_arguments + [
+            '-vf', build_tile_filter(video.divisions, video.screen_width, video.screen_height, video.tiling_engine,
+                                     video.fps_cap),
+            '-f', 'null', '-'
+        ]
+
+        start_time = time.time()
+        processes = []
+        stdin = subprocess.DEVNULL
+        if source_command:
+            processes.append(start_process(source_command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL))
+            stdin = processes[0].stdout
+        sink = start_process(sink_command, stdin=stdin, stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL, text=True)
+        processes.append(sink)
+
+        progress = {'first_frame': None, 'frames': 0}
+        def read_progress():
+            for line in sink.stdout:
+                if line.startswith('frame='):
+                    progress['frames'] = int(line.split('=', 1)[1])
+                    if progress['frames'] > 0 and progress['first_frame'] is None:
+                        progress['first_frame'] = time.time() - start_time
+        reader = threading.Thread(target=read_progress, daemon=True)
+        reader.start()
+
+        cpu_seconds = {}
+        while time.time() - start_time < duration and sink.poll() is None:
+            for process in processes:
+                try:
+                    times = psutil.Process(process.pid).cpu_times()
+                    cpu_seconds[process.pid] = times.user + times.system
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            time.sleep(0.5)
+        elapsed = time.time() - start_time
+        stop_processes(processes, grace=0)
+
+        total_cpu = sum(cpu_seconds.values())
+        table.add_row([
+            playback_mode,
+            len(processes),
+            f"{progress['first_frame']:.2f}" if progress['first_frame'] is not None else 'N/A',
+            progress['frames'],
+            f"{total_cpu:.2f}",
+            f"{100 * total_cpu / elapsed:.1f}",
+        ])
+    print(f"URL: {url}, {duration}s per mode")
+    print(table)
+    return table
+
+
+def check_format_corpus(path=None):
+    """Run the format selection on the recorded format lists of the corpus, return the number of mismatches."""
+    from prettytable import PrettyTable
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), FORMAT_CORPUS_FILE_NAME)
+    with open(path, 'r', encoding='utf-8') as file:
+        corpus = json.load(file)
+
+    table = PrettyTable()
+    table.field_names = ["Source", "Screen", "Divisions", "Audio", "Expected", "Selected", "Cost", "Status"]
+    mismatches = 0
+    for case in corpus['cases']:
+        video = YouTubeVideo(None, case['source'], case['divisions'], verbose=False, resolve=False,
+                             audio_mode=case['audio_mode'], audio_max_abr=case.get('audio_max_abr', AUDIO_MAX_ABR),
+                             require_executables=False)
+        video.screen_width, video.screen_height = (int(x) for x in case['screen'].split('x'))
+        video._choose_format(corpus['sources'][case['source']])
+        selected = video.format
+        if video.audio_format is not None:
+            selected += f" + {video.audio_format['format_id']}"
+        tile_width = video.screen_width / video.divisions
+        tile_height = video.screen_height / video.divisions
+        cost = score_video_format(video.selected_formats[0], tile_width, tile_height)['cost'] \
+            if video.selected_formats else None
+        status = 'ok' if selected == case['expected'] else 'MISMATCH'
+        if status != 'ok':
+            mismatches += 1
+        table.add_row([case['source'], case['screen'], case['divisions'], case['audio_mode'], case['expected'],
+                       selected, f"{cost:.1f}" if cost is not None else 'N/A', status])
+    print(table)
+    print(f"{len(corpus['cases'])} cases, {mismatches} mismatches")
+    return mismatches
+
+
+class YouTubeVideo:
+    def __init__(self, parent, url, divisions=None, verbose=True, tiling_engine=None, playback_mode=None,
+                 hot_standby=None, resolve=True, audio_mode=None, audio_max_abr=None, auto_divisions=None,
+                 fps_cap=None, rotation=None, require_executables=True):
+        self.parent = parent  # Store reference to the Tkinter parent (App instance), None when headless
+        self.url = url
+        self.timer_window = None
+        self.ytdlp_process = None
+        self.ytdlp_process = None
+        self.ytdlp_is_valid = False
+        
+        try:
+            if divisions is None:
+                self.divisions = read_divisions()
+            else:
+                self.divisions = divisions
+        except:
+            self.divisions = 3
+            write_divisions(self.divisions)
+        
+        if tiling_engine is None:
+            try:
+                tiling_engine = read_tiling_engine()
+            except:
+                tiling_engine = DEFAULT_TILING_ENGINE
+        self.tiling_engine = tiling_engine
+
+        if playback_mode is None:
+            playback_mode = read_setting('playback_mode', DEFAULT_PLAYBACK_MODE, PLAYBACK_MODES)
+        self.playback_mode = playback_mode
+
+        if hot_standby is None:
+            hot_standby = read_setting('hot_standby', False)
+        self.hot_standby = hot_standby
+
+        if audio_mode is None:
+            audio_mode = read_setting('audio_mode', DEFAULT_AUDIO_MODE, AUDIO_MODES)
+        self.audio_mode = audio_mode
+        if audio_max_abr is None:
+            audio_max_abr = read_setting('audio_max_abr', AUDIO_MAX_ABR)
+        self.audio_max_abr = audio_max_abr
+
+        if auto_divisions is None:
+            auto_divisions = read_setting('auto_divisions', False)
+        self.auto_divisions = auto_divisions
+        self.auto_tuner = None  # GridAutoTuner of the current playback with auto divisions
+        self.rotation = rotation  # RotationScheduler switching self.url, None to play one URL
+        self.prefetch = None  # RotationPrefetch of the next URL of the rotation
+        self.fps_cap = fps_cap or get_fps_cap()
+        self.audio_format = None  # yt-dlp format of the separate audio branch
+        self.player_audio = audio_mode == AUDIO_MODE_MUXED  # Whether the video player decodes audio
+        self.audio_branch = None
+        self.is_live = False
+        self.source = None  # Promoted StandbySource feeding the player, with hot standby
+        self.standby = None  # Warm StandbySource waiting to take over
+        self.failovers = []  # Source switches to the standby and their latency
+        self.leaked_processes = 0  # Processes that survived stopping a pipeline
+        self.relay = None  # RelayBuffer between the source process and the player
+
+        self.verbose = verbose
+        self.format = None
+        self.title = ""
+        self.process = None
+        self.process_pid = None
+        self.yt_dlp_path = find_executable('yt-dlp')
+        self.ffmpeg_path = find_executable('ffmpeg')
+        self.ffplay_path = find_executable('ffplay')
+        self.play_flag = None
+        self.renderer = None
+        self.source_fps = None
+        self.source_width = None
+        self.source_height = None
+        self.selected_formats = []  # yt-dlp format dicts behind self.format
+        self.format_divisions = None  # Divisions self.format was chosen for
+        self.resolve_error = None
+        self.pipeline_start_time = None
+        self.supervisor = None
+        self.failures = []  # Pipeline failures with their detect and restart times
+        self.stop_event = threading.Event()  # Wakes up restart backoff waits on stop
+        self.auto_restart = True  # Used without a parent, the GUI has its checkbox
+        self.offline_renderer = None  # OfflineRenderer while render() runs
+        self.telemetry_previous = None  # (supervisor, time, bytes, frames) of the last telemetry sample
+        self.telemetry_processes = {}  # psutil.Process by pid, they measure CPU use between samples
+
+        # Only the format selection works without them, the corpus check passes require_executables=False
+        if require_executables and (not self.yt_dlp_path or not self.ffmpeg_path or not self.ffplay_path):
+            raise FileNotFoundError("One or more required executables (yt-dlp, ffmpeg, ffplay) not found.")
+
+        if resolve:
+            self.resolve()
+
+    def resolve(self):
+        """Extract the title and choose the format, return whether the URL is a playable video.
+
+        This blocks for the whole yt-dlp extraction, the GUI calls it from a
+        UrlResolver worker thread.
+        """
+        try:
+            self._get_video_info()
+            self._get_screen_resolution()
+            self._choose_format()
+            self.ytdlp_is_valid = True
+        except Exception as e:
+            # Handle errors here (e.g., invalid URL, video not available)
+            print(f"Error creating YouTube video: {e}")
+            self.resolve_error = e
+            self.ytdlp_is_valid = False
+        return self.ytdlp_is_valid
+
+    def _get_video_info(self):
+        result = extract_info(self.url)
+        self.title = result.get('title', 'Unknown Title')
+        self.is_live = bool(result.get('is_live')) or result.get('live_status') == 'is_live'
+        if self.verbose:
+            stats = info_cache.stats()
+            print(f"Info cache: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"{stats['saved_seconds']:.1f}s of extraction saved")
+
+    def _get_screen_resolution(self):
+        self.screen_width, self.screen_height = get_screen_size()
+        
+    def _choose_format(self, formats=None):
+        """Choose the formats to play from formats, the extracted ones by default."""
+        self.format = None
+        self.selected_formats = []
+        self.format_divisions = self.divisions
+        if formats is None:
+            formats = extract_info(self.url).get('formats', [])
+
+        # Filter out vp09 codecs
+        video_audio_formats = [
+            f for f in formats 
+            if 'vcodec' in f and 'acodec' in f 
+            and not f.get('vcodec', '').startswith('vp09')  # Exclude vp09 codecs
+            and f.get('vcodec') != 'none' 
+            and f.get('acodec') != 'none'
+        ]
+        video_formats = [
+            f for f in formats 
+            if f.get('vcodec') not in (None, 'none') and not f['vcodec'].startswith('vp09')  # Exclude vp09 codecs
+            and f.get('acodec') == 'none'
+            and is_playable_format(f)
+        ]
+        audio_formats = [
+            f for f in formats 
+            if f.get('vcodec') == 'none'
+            and f.get('acodec') not in (None, 'none')
+            and is_playable_format(f)
+        ]
+
+        # Sort formats
+        video_audio_formats.sort(key=lambda x: (x.get('height') or 0, x.get('width') or 0))
+        video_formats.sort(key=lambda x: (x.get('height') or 0, x.get('width') or 0))
+        audio_formats.sort(key=lambda x: x.get('abr') or 0)
+
+        tile_width = self.screen_width / self.divisions
+        tile_height = self.screen_height / self.divisions
+
+        selected_format = None
+        self.audio_format = None
+        self.player_audio = self.audio_mode == AUDIO_MODE_MUXED
+
+        # Highest audio bitrate under the cap, the lowest one when all are above it
+        capped_audio_formats = [f for f in audio_formats if (f.get('abr') or 0) <= self.audio_max_abr] or audio_formats[:1]
+        best_audio_format = capped_audio_formats[-1] if capped_audio_formats else None
+
+        if self.audio_mode != AUDIO_MODE_MUXED:
+            # The tiled pipeline only fetches video, the audio has its own branch
+            selected_format = select_video_format(video_formats or video_audio_formats, tile_width, tile_height)
+            if selected_format is not None:
+                self.selected_formats = [selected_format]
+                if self.audio_mode == AUDIO_MODE_SEPARATE:
+                    if best_audio_format is not None:
+                        self.audio_format = best_audio_format
+                    elif selected_format.get('acodec') not in (None, 'none'):
+                        self.player_audio = True  # No audio only format, keep the muxed audio
+
+        # Step 1: Prefer a format that has both video and audio
+        if selected_format is None:
+            selected_format = select_video_format(video_audio_formats, tile_width, tile_height,
+                                                  require_adequate=bool(video_formats and audio_formats))
+            if selected_format is not None:
+                self.selected_formats = [selected_format]
+
+        # Step 2: If no suitable video+audio format, combine separate video and audio formats
+        if not selected_format or selected_format is None:
+            selected_video_format = select_video_format(video_formats, tile_width, tile_height)
+            selected_audio_format = best_audio_format  # The highest bitrate under the cap
+
+            if selected_video_format and selected_audio_format:
+                self.selected_formats = [selected_video_format, selected_audio_format]
+                selected_format = {
+                    'format_id': f"{selected_video_format['format_id']}+{selected_audio_format['format_id']}",
+                    'resolution': f"{selected_video_format.get('width', 'Unknown')}x{selected_video_format.get('height', 'Unknown')}",
+                    'fps': selected_video_format.get('fps'),
+                    'width': selected_video_format.get('width'),
+                    'height': selected_video_format.get('height'),
+                }
+
+        # Decision table, with the cost model scores of the video formats
+        if self.verbose:
+            from prettytable import PrettyTable
+            table = PrettyTable()
+            table.field_names = ["Format ID", "Resolution", "Type", "VCodec", "ACodec", "Bitrate (kbps)",
+                                 "FPS", "Tile scale", "Decode", "Bandwidth", "Cost", "Selected"]
+
+            for type_name, type_formats in (("Video+Audio", video_audio_formats), ("Video", video_formats)):
+                for f in type_formats:
+                    score = score_video_format(f, tile_width, tile_height)
+                    table.add_row([
+                        f['format_id'],
+                        f.get('resolution', 'Unknown'),
+                        type_name,
+                        f.get('vcodec', 'Unknown'),
+                        f.get('acodec', 'Unknown') if type_name == "Video+Audio" else 'N/A',
+                        f.get('tbr') or 'N/A',
+                        f.get('fps') or 'N/A',
+                        f"{score['tile_scale']:.2f}" + ('' if score['adequate'] else ' (low)'),
+                        f"{score['decode_cost']:.1f}",
+                        f"{score['bandwidth_cost']:.1f}",
+                        f"{score['cost']:.1f}",
+                        '*' if any(f is s for s in self.selected_formats) else ''
+                    ])
+            
+            for f in audio_formats:
+                table.add_row([
+                    f['format_id'],
+                    "Audio only",
+                    "Audio",
+                    'N/A',
+                    f.get('acodec', 'Unknown'),
+                    f.get('abr', 'N/A') if 'abr' in f else 'N/A',
+                    '', '', '', '', '',
+                    '*' if any(f is s for s in self.selected_formats) or f is self.audio_format else ''
+                ])
+            
+            print(table)
+
+        if selected_format:
+            self.format = selected_format['format_id']
+            self.source_fps = selected_format.get('fps')
+            self.source_width = selected_format.get('width')
+            self.source_height = selected_format.get('height')
+            if self.verbose:
+                print(f"Screen resolution: {self.screen_width}x{self.screen_height}")
+                print(f"Tile resolution: {tile_width}x{tile_height}")
+                print(f"Selected format ID: {self.format} - {selected_format['resolution']}")
+                if self.audio_format:
+                    print(f"Separate audio format ID: {self.audio_format['format_id']} - "
+                          f"{self.audio_format.get('abr') or '?'} kbps")
+        else:
+            print("No suitable format found.")
+
+    def _can_play_direct(self):
+        return bool(self.selected_formats) and all(
+            f.get('url') and f.get('protocol', 'https') in DIRECT_PLAYBACK_PROTOCOLS
+            for f in self.selected_formats
+        )
+
+    def _stream_urls_expired(self):
+        """True when the selected stream URLs expired or the last direct playback failed right away."""
+        if self.pipeline_start_time is not None and \
+                time.time() - self.pipeline_start_time < DIRECT_PLAYBACK_FAST_FAILURE_SECONDS:
+            return True
+        expiries = [get_stream_url_expiry(f.get('url')) for f in self.selected_formats]
+        expiries = [e for e in expiries if e]
+        return bool(expiries) and time.time() >= min(expiries) - STREAM_URL_EXPIRY_MARGIN
+
+    def _build_yt_dlp_command(self):
+        if self.format is not None:
+            return [
+                self.yt_dlp_path, self.url, '--user-agent', YT_DLP_USER_AGENT, '-4', '-f', self.format, '-o', '-',
+                '--quiet', '--no-warnings'
+            ]
+        return [
+            self.yt_dlp_path, self.url, '-4', '-f', 'bestvideo+bestaudio/best', '-o', '-',
+            '--quiet', '--no-warnings'
+        ]
+
+    def _build_source(self):
+        """Return (source command or None, player input options) for the playback mode."""
+        if self.playback_mode == PLAYBACK_MODE_DIRECT:
+            if self._can_play_direct():
+                if len(self.selected_formats) == 1 or self.tiling_engine == TILING_ENGINE_NUMPY:
+                    # The NumPy renderer decodes video only, the audio URL is not needed
+                    return None, build_direct_input_arguments(self.selected_formats[0])
+                # ffplay opens a single input, mux the video and audio URLs without re-encoding
+                video_format, audio_format = self.selected_formats
+                command = [self.ffmpeg_path, '-hide_banner', '-nostdin', '-loglevel', 'error'] + \
+                    build_direct_input_arguments(video_format) + build_direct_input_arguments(audio_format) + \
+                    ['-map', '0:v:0', '-map', '1:a:0', '-c', 'copy', '-f', 'nut', '-']
+                return command, ['-i', '-']
+            print("Selected format can not be opened directly, using the yt-dlp relay.")
+        return self._build_yt_dlp_command(), ['-i', '-']
+
+    def _build_ffplay_command(self, input_arguments):
+        audio = [] if self.player_audio else ['-an']
+        return [self.ffplay_path] + input_arguments + audio + [
+            '-vf', build_tile_filter(self.divisions, self.screen_width, self.screen_height, self.tiling_engine,
+                                     self.fps_cap),
+            '-autoexit', '-loglevel', 'error', '-hide_banner', '-fs', '-stats'
+        ]
+
+    def _start_pipeline(self, standby=None):
+        """Start the source process, if the playback mode needs one, and the player under a new supervisor."""
+        self.supervisor = ProcessSupervisor(
+            stall_seconds=read_setting('stall_seconds', STALL_SECONDS),
+            min_bytes_per_second=read_setting('stall_min_bytes_per_second', STALL_MIN_BYTES_PER_SECOND),
+            min_fps=read_setting('stall_min_fps', STALL_MIN_FPS),
+        )
+        # Feed the player from a promoted standby style source, so later
+        # failovers only have to switch the pump to the next standby, or from
+        # the source a rotation prefetched
+        from_standby = self._standby_enabled() or (standby is not None and standby.is_ready())
+        if from_standby:
+            if standby is None or not standby.is_ready():
+                if standby is not None:
+                    standby.close()
+                standby = StandbySource(*self._build_standby_command(), self._relay_buffer_size()[0])
+            print(standby.command)
+            standby.promote()
+            self.source = standby
+            self.ytdlp_process = standby.process
+            self.supervisor.watch(standby.name, standby.process, fatal_exit_codes='nonzero', stage='source')
+            source_command, input_arguments = standby.command, ['-i', '-']
+            source_name, source_output = standby.name, standby
+            player_stdin = subprocess.PIPE
+        else:
+            source_command, input_arguments = self._build_source()
+            player_stdin = subprocess.DEVNULL
+        if source_command and not from_standby:
+            print(source_command)
+            source_name = 'yt-dlp' if source_command[0] == self.yt_dlp_path else 'ffmpeg'
+            # A source exiting with 0 reached the end of the stream, the player
+            # exit that follows once its buffer is played is the failure
+            self.ytdlp_process = self.supervisor.spawn(
+                source_name, source_command, fatal_exit_codes='nonzero', stage='source',
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+            self.supervisor.read_source_errors(self.ytdlp_process.stderr)
+            buffer_size, prefill = self._relay_buffer_size()
+            self.relay = RelayBuffer(self.ytdlp_process.stdout, buffer_size, prefill)
+            source_output = self.relay
+            player_stdin = subprocess.PIPE
+
+        if self.tiling_engine == TILING_ENGINE_NUMPY:
+            tile_width, tile_height = self._get_numpy_tile_size()
+            self.renderer = NumpyTileRenderer(self.divisions, tile_width, tile_height, self.source_fps,
+                                              ffmpeg_path=self.ffmpeg_path, ffplay_path=self.ffplay_path,
+                                              verbose=self.verbose, fps_cap=self.fps_cap)
+            print(self.renderer.decoder_command(input_arguments))
+            self.ffplay_process = self.renderer.start(input_arguments, stdin=player_stdin)
+            self.supervisor.watch('ffmpeg decoder', self.renderer.decoder_process, fatal_exit_codes='nonzero')
+            self.supervisor.watch('ffplay', self.ffplay_process)
+            self.supervisor.count_frames(lambda: self.renderer.frames if self.renderer else 0)
+            player_input = self.renderer.decoder_process.stdin
+        else:
+            ffplay_command = self._build_ffplay_command(input_arguments)
+            print(ffplay_command)
+            self.ffplay_process = self.supervisor.spawn(
+                'ffplay', ffplay_command, stdin=player_stdin, stderr=subprocess.PIPE
+            )
+            self.supervisor.read_player_stats(self.ffplay_process.stderr, self.output_fps())
+            player_input = self.ffplay_process.stdin
+
+        if source_command:
+            self.supervisor.pump(source_name, source_output, player_input)
+        self.pipeline_start_time = time.time()
+
+        if self._standby_enabled() and self.standby is None:
+            self.standby = StandbySource(*self._build_standby_command(), self._relay_buffer_size()[0])
+
+        if self.audio_format is not None and self.audio_mode == AUDIO_MODE_SEPARATE:
+            self.audio_branch = build_audio_branch('audio', self.url, self.audio_format,
+                                                   self.ffplay_path, self.yt_dlp_path)
+            print(self.audio_branch.source_command or self.audio_branch.player_command)
+            self.audio_branch.start()
+
+    def _stop_pipeline(self, keep_standby=False):
+        # Called from both the play thread and stop_video, take each part once
+        renderer, self.renderer = self.renderer, None
+        supervisor, self.supervisor = self.supervisor, None
+        source, self.source = self.source, None
+        relay, self.relay = self.relay, None
+        audio_branch, self.audio_branch = self.audio_branch, None
+        standby = None
+        if not keep_standby:
+            standby, self.standby = self.standby, None
+
+        # Every process of the pipeline in one stop_processes() call, so a
+        # restart takes one grace period however many of them hang
+        processes = [self.ytdlp_process, self.ffplay_process]
+        if supervisor:
+            supervisor.stopped = True  # Exits from here on are not failures
+            processes += [process for name, process in supervisor.processes]
+        if renderer:
+            processes += [renderer.decoder_process, renderer.player_process]
+        for part in (source, standby):
+            if part:
+                processes.append(part.process)
+        if audio_branch:
+            audio_branch.stopped = True
+            processes += audio_branch.processes
+        leaked = stop_processes(set(p for p in processes if p is not None))
+        if leaked:
+            self.leaked_processes += leaked
+            print(f"Leaked {leaked} processes stopping the pipeline, {self.leaked_processes} in total")
+
+        # The processes are gone, this stops the threads and buffers around them
+        if renderer:
+            renderer.stop()
+        if supervisor:
+            supervisor.stop()
+        for part in (source, relay, standby):
+            if part:
+                part.close()
+        if audio_branch:
+            audio_branch.stop()
+        self.ytdlp_process = None
+
+    def _relay_buffer_size(self):
+        """Return (capacity, prefill) in bytes for the relay buffer, from the selected formats' bitrate."""
+        seconds = read_setting('relay_buffer_seconds', RELAY_BUFFER_SECONDS)
+        bitrates = [f.get('tbr') for f in self.selected_formats]
+        if not bitrates or not all(bitrates):
+            return RELAY_BUFFER_DEFAULT, 0
+        bytes_per_second = sum(bitrates) * 1000 / 8  # tbr is in kbit/s
+        capacity = int(min(max(seconds * bytes_per_second, RELAY_BUFFER_MINIMUM), RELAY_BUFFER_MAXIMUM))
+        prefill = int(read_setting('relay_prefill_seconds', RELAY_PREFILL_SECONDS) * bytes_per_second)
+        return capacity, prefill
+
+    def relay_stats(self):
+        """Fill level, underruns and throughput of the buffer feeding the player, None without one."""
+        buffer = self.source or self.relay
+        return buffer.stats() if buffer else None
+
+    def _print_relay_stats(self):
+        stats = self.relay_stats()
+        if stats:
+            print(f"Relay buffer: {stats['fill'] / 1024:.0f}/{stats['capacity'] / 1024:.0f} KB "
+                  f"({stats['fill_percent']:.0f}%), {stats['underruns']} underruns, "
+                  f"{8 * stats['throughput'] / 1000:.0f} kbit/s in, {stats['bytes_out']} bytes played")
+
+    def _standby_enabled(self):
+        return self.hot_standby and self.is_live
+
+    def _build_standby_command(self):
+        """Return (name, command) of a source writing an MPEG-TS stream the player can join at any point."""
+        if self._can_play_direct():
+            command = [self.ffmpeg_path, '-hide_banner', '-nostdin', '-loglevel', 'error']
+            for media_format in self.selected_formats:
+                command += build_direct_input_arguments(media_format)
+            if len(self.selected_formats) == 2:
+                command += ['-map', '0:v:0', '-map', '1:a:0']
+            return 'ffmpeg', command + ['-c', 'copy', '-f', 'mpegts', '-']
+        # yt-dlp writes live HLS streams as MPEG-TS already
+        return 'yt-dlp', self._build_yt_dlp_command()
+
+    def _failover(self, failure, supervisor):
+        """Switch the running player to the warm standby source, return False if there is none ready."""
+        if failure['stage'] != 'source' or failure['kind'] == 'reload' \
+                or self.standby is None or not self.standby.is_ready():
+            return False
+        old_source, new_source = self.source, self.standby
+        self.standby = None
+        new_source.promote()
+        supervisor.watch(new_source.name, new_source.process, fatal_exit_codes='nonzero', stage='source')
+        supervisor.switch_source(new_source)
+        if old_source:
+            supervisor.retire(old_source.process)
+            old_source.close()
+        self.source = new_source
+        self.ytdlp_process = new_source.process
+        self.failovers.append({'detected': failure['detected'], 'reason': failure['reason'],
+                               'switch_seconds': None, 'frame_seconds': None})
+        print(f"Switched to the standby source after {failure['source']} failure: {failure['reason']}")
+        self.standby = StandbySource(*self._build_standby_command(), self._relay_buffer_size()[0])
+        return True
+
+    def _update_failover_latency(self, supervisor):
+        if not self.failovers:
+            return
+        failover = self.failovers[-1]
+        if failover['switch_seconds'] is None and supervisor.switch_first_byte_time is not None:
+            failover['switch_seconds'] = supervisor.switch_first_byte_time - failover['detected']
+        if failover['frame_seconds'] is None and supervisor.switch_first_frame_time is not None:
+            failover['frame_seconds'] = supervisor.switch_first_frame_time - failover['detected']
+            stats = self.failover_stats()
+            print(f"Failover latency: first standby bytes after {1000 * failover['switch_seconds']:.1f} ms, "
+                  f"next frame after {1000 * failover['frame_seconds']:.1f} ms "
+                  f"({stats['failovers']} failovers, average {1000 * stats['frame_seconds_avg']:.1f} ms)")
+
+    def failover_stats(self):
+        """Count and latency of the switches to the standby source."""
+        switch_seconds = [f['switch_seconds'] for f in self.failovers if f['switch_seconds'] is not None]
+        frame_seconds = [f['frame_seconds'] for f in self.failovers if f['frame_seconds'] is not None]
+        return {
+            'failovers': len(self.failovers),
+            'switch_seconds_avg': sum(switch_seconds) / len(switch_seconds) if switch_seconds else None,
+            'switch_seconds_max': max(switch_seconds) if switch_seconds else None,
+            'frame_seconds_avg': sum(frame_seconds) / len(frame_seconds) if frame_seconds else None,
+            'frame_seconds_max': max(frame_seconds) if frame_seconds else None,
+        }
+
+    def _update_status(self, message, color='black'):
+        if self.parent is not None:
+            self.parent.update_status(message, color=color)
+        else:
+            print(f"Status: {message}")
+
+    def _auto_restart_enabled(self):
+        if self.parent is not None:
+            return self.parent.auto_restart_video.get() == True
+        return self.auto_restart
+
+    def _enable_play_button(self):
+        if self.parent is not None:
+            self.parent.play_button.config(state='normal')
+
+    def _confirm_restart(self):
+        """Show the restart countdown, return False when restarting is off or cancelled."""
+        if not self._auto_restart_enabled():
+            self._update_status(f"Ready")
+            return False
+        if self.play_flag != True:
+            return False
+        if self.parent is None:
+            return True  # Nobody to ask
+
+        print("Starting OK/Cancel window")
+        self.timer_window = TimerWindow(parent=self.parent, title="Action Required", question="Video was stopped and will be restarted automatically.", duration=10)
+        self.parent.wait_window(self.timer_window.parent)
+        if self.timer_window.expired:
+            print("The timer expired before user response.")
+            self.timer_window.result = True
+        if self.timer_window.result:  # If OK was pressed
+            print("User chose to restart the video.")
+            return True
+        print("User chose to cancel.")
+        self._update_status(f"Ready")
+        return False
+
+    def supervisor_stats(self):
+        """Time to detect and time to restart over the failures of this playback."""
+        detect_seconds = [f['detected'] - f['occurred'] for f in self.failures]
+        restart_seconds = [f['restart_seconds'] for f in self.failures if f.get('restart_seconds') is not None]
+        return {
+            'failures': len(self.failures),
+            'detect_seconds_avg': sum(detect_seconds) / len(detect_seconds) if detect_seconds else None,
+            'detect_seconds_max': max(detect_seconds) if detect_seconds else None,
+            'restart_seconds_avg': sum(restart_seconds) / len(restart_seconds) if restart_seconds else None,
+            'restart_seconds_max': max(restart_seconds) if restart_seconds else None,
+        }
+
+    def _print_auto_divisions_history(self):
+        if self.auto_tuner is None:
+            return
+        stats = self.auto_tuner.stats()
+        print(f"Auto divisions: {stats['divisions']} after {stats['changes']} adjustments")
+        for change in stats['history']:
+            print(f"  {time.strftime('%H:%M:%S', time.localtime(change['time']))} "
+                  f"{change['divisions_from']} -> {change['divisions_to']} ({change['reason']}, "
+                  f"CPU {change['cpu_percent']:.0f}%, {change['fps']:.1f} fps, "
+                  f"{change['drops_per_second']:.1f} drops/s)")
+
+    def output_fps(self):
+        """Frame rate of the tiled output, the source fps under the fps cap."""
+        source_fps = self.source_fps or DEFAULT_SOURCE_FPS
+        return min(source_fps, self.fps_cap) if self.fps_cap else source_fps
+
+    def _get_numpy_tile_size(self):
+        """Tile size for the NumPy renderer, fitted to the source when its size is known."""
+        tile_width, tile_height = get_tile_size(self.screen_width, self.screen_height, self.divisions)
+        return fit_tile_size(tile_width, tile_height, self.source_width, self.source_height)
+
+    def check_timer_result(self, timer_window):
+        self.parent.wait_window(timer_window.parent)  # Wait for the TimerWindow to close
+
+        if timer_window.expired:
+            print("The timer expired before user response.")
+        elif timer_window.result:  # If OK was pressed
+            print("User chose to restart the video.")
+        else:
+            print("User chose to cancel.")
+            self.parent.update_status("Ready")
+            
+    def play_video(self):
+        print("play_video")
+        self.play_flag = True
+        self.stop_event.clear()
+        self.failures = []
+        backoff = RestartBackoff()
+        #if not self.format:
+        #    print("No suitable format found.")
+        #    return
+        if self.format is None or self.format_divisions != self.divisions:
+            self._choose_format()  # Already chosen when the URL was resolved for these divisions
+        
+        try:
+            write_divisions(self.divisions)
+        except:
+            pass
+
+        self.ffplay_process = None
+        restarting = None  # Failure being recovered from, to measure the restart time
+        rotating = None  # Rotation switch waiting for the new source to play
+        if self.rotation is not None and self.rotation.switch_time is None:
+            self.rotation.first()
+        psutil = None
+        self.auto_tuner = None
+        if self.auto_divisions:
+            import psutil
+            self.auto_tuner = GridAutoTuner(self.divisions)
+            if self.auto_tuner.divisions != self.divisions:
+                self.divisions = self.auto_tuner.divisions
+                self._choose_format()
+        while self.play_flag:  # Check play flag to 
+            if self.parent is not None:
+                self.url = self.parent.url_entry.get()
+                if self.auto_tuner is not None:
+                    # The tuner owns the divisions, the spinbox only shows them
+                    self.parent.divisions_spinbox.delete(0, 'end')
+                    self.parent.divisions_spinbox.insert(0, self.divisions)
+                else:
+                    self.divisions = int(self.parent.divisions_spinbox.get())
+                    write_divisions(self.divisions)
+                if self.parent.tiling_engine_combobox.get() in TILING_ENGINES:
+                    self.tiling_engine = self.parent.tiling_engine_combobox.get()
+
+            if self.playback_mode == PLAYBACK_MODE_DIRECT and self._stream_urls_expired():
+                print("Stream URLs expired, resolving them again.")
+                info_cache.invalidate(self.url)
+                self._choose_format()
+
+            if self.tiling_engine == TILING_ENGINE_NUMPY:
+                try:
+                    import numpy
+                except ImportError:
+                    print("NumPy is not installed, falling back to the downscale tiling engine.")
+                    self.tiling_engine = TILING_ENGINE_DOWNSCALE
+
+            standby = self.standby
+            self.standby = None
+            self._stop_pipeline()
+            try:
+                self._start_pipeline(standby)
+            except Exception as e:
+                print(traceback.format_exc())
+                self.supervisor._post('play_video', f"failed to start the pipeline: {e}")
+            supervisor = self.supervisor  # stop_video may clear self.supervisor from the GUI thread
+
+            self.process_pid = self.ffplay_process.pid if self.ffplay_process else None
+            print(f"ffplay process PID: {self.process_pid}")
+            if self.auto_tuner is not None:
+                self.auto_tuner.reset()
+                psutil.cpu_percent(None)  # Start the CPU measurement interval
+                last_tune_time = time.time()
+
+            # Sleep until the supervisor reports a failure, no polling of windows
+            failure = None
+            last_stats_time = time.time()
+            last_telemetry_time = time.time()
+            self.telemetry_sample(supervisor)  # Starts the rate and CPU measurement intervals
+            while self.play_flag and failure is None:
+                failure = supervisor.wait_for_failure(timeout=0.5)
+                audio_branch = self.audio_branch
+                if audio_branch:
+                    audio_branch.check()
+                if self.verbose and time.time() - last_stats_time >= RELAY_STATS_INTERVAL:
+                    self._print_relay_stats()
+                    last_stats_time = time.time()
+                if time.time() - last_telemetry_time >= TELEMETRY_INTERVAL:
+                    last_telemetry_time = time.time()
+                    self._record_telemetry(supervisor)
+                if failure is not None and self._failover(failure, supervisor):
+                    self.failures.append(failure)
+                    failure = None
+                self._update_failover_latency(supervisor)
+                if restarting is not None and supervisor.is_up():
+                    restarting['restart_seconds'] = supervisor.up_time() - restarting['detected']
+                    stats = self.supervisor_stats()
+                    print(f"Pipeline restarted in {restarting['restart_seconds']:.2f}s "
+                          f"(average {stats['restart_seconds_avg']:.2f}s over {stats['failures']} failures)")
+                    restarting = None
+                if failure is None and self.auto_tuner is not None and \
+                        time.time() - last_tune_time >= AUTO_DIVISIONS_INTERVAL:
+                    last_tune_time = time.time()
+                    divisions = self.auto_tuner.sample(psutil.cpu_percent(None), supervisor.frame_count(),
+                                                       supervisor.frame_drops, self.output_fps())
+                    if divisions is not None:
+                        failure = {'source': 'auto divisions', 'reason': f"{self.divisions} -> {divisions}",
+                                   'kind': 'retune', 'occurred': last_tune_time, 'detected': last_tune_time}
+                if rotating is not None and supervisor.is_up():
+                    rotating['switch_seconds'] = supervisor.up_time() - rotating['time']
+                    print(f"Rotation: '{self.title}' playing {rotating['switch_seconds']:.2f}s after the switch"
+                          f"{' (prefetched)' if rotating['prefetched'] else ''}")
+                    rotating = None
+                if failure is None and self.rotation is not None:
+                    failure = self._check_rotation()
+            if failure is None:
+                break  # Stopped by the user
+
+            if failure['kind'] == 'closed' and self.rotation is not None and not self.rotation.timetable:
+                failure['kind'] = 'rotate'  # The video ended before its turn did, move on
+
+            if failure['kind'] == 'rotate':
+                self._stop_pipeline()
+                rotating = self._rotate(failure['detected'])
+                restarting = None
+                continue
+
+            if failure['kind'] == 'retune':
+                # Not a failure: play the same URL in the grid chosen by the tuner
+                self._stop_pipeline()
+                self.divisions = self.auto_tuner.divisions
+                self._choose_format()  # The tile size changed, so may the cheapest adequate format
+                self._update_status(f"Auto divisions: {failure['reason']}", color='blue')
+                restarting = None
+                continue
+
+            if failure['kind'] == 'reload':
+                print("Reloading: resolving the URL again")
+                self._stop_pipeline(keep_standby=True)
+                info_cache.invalidate(self.url)
+                if not self.resolve():
+                    print("Reload failed, keeping the previous format")
+                restarting = None
+                continue
+
+            self.failures.append(failure)
+            print(f"{failure['source']} failure: {failure['reason']}, "
+                  f"detected in {failure['detected'] - failure['occurred']:.2f}s")
+            self._print_relay_stats()
+            uptime = failure['detected'] - supervisor.start_time
+            self._stop_pipeline(keep_standby=True)
+
+            if failure['kind'] == 'closed':
+                # The player exited on its own, most likely closed with Esc:
+                # let the user cancel the restart
+                self._enable_play_button()
+                if not self._confirm_restart():
+                    self._stop_pipeline()
+                    self._close_prefetch()
+                    self._print_auto_divisions_history()
+                    return
+            else:
+                # Stalls and crashes restart right away, backing off when they repeat
+                if not self._auto_restart_enabled():
+                    self._update_status(f"Ready")
+                    self._stop_pipeline()
+                    self._close_prefetch()
+                    self._print_auto_divisions_history()
+                    return
+                delay = backoff.next_delay(uptime)
+                if self.standby is not None and self.standby.is_ready():
+                    delay = 0  # The standby is already connected, only the player restarts
+                if delay:
+                    print(f"Restarting in {delay:.2f}s after {backoff.failures} failures in a row")
+                    self._update_status(f"Restarting video in {delay:.1f}s ({failure['reason']})", color='blue')
+                    if self.stop_event.wait(delay):
+                        break
+            print("Restarting the video pipeline...")
+            restarting = failure
+        self._stop_pipeline()
+        self._close_prefetch()
+        self._print_auto_divisions_history()
+        if self.parent is not None:
+            self.parent.update_telemetry(None)
+        self._enable_play_button()
+
+    def telemetry_sample(self, supervisor):
+        """Measure the pipeline of supervisor, see TELEMETRY_METRICS.
+
+        Rates are measured since the previous sample of the same pipeline and
+        are None on its first sample, so is the CPU use of a new process.
+        """
+        import psutil
+        now = time.time()
+        frames = supervisor.frame_count()
+        previous = self.telemetry_previous
+        self.telemetry_previous = (supervisor, now, supervisor.bytes, frames)
+        download_rate = decode_fps = None
+        if previous is not None and previous[0] is supervisor and now > previous[1]:
+            elapsed = now - previous[1]
+            decode_fps = (frames - previous[3]) / elapsed
+            if supervisor.pumping:
+                download_rate = (supervisor.bytes - previous[2]) / elapsed
+
+        pids = {'video-tiler': os.getpid()}
+        for name, process in supervisor.processes:
+            if process.poll() is None:
+                pids[name] = process.pid
+        audio_branch = self.audio_branch
+        if audio_branch:
+            for stage, process in zip(['source', 'player'][-len(audio_branch.processes):], audio_branch.processes):
+                pids[f"{audio_branch.name} {stage}"] = process.pid
+        processes = {}
+        for name, pid in pids.items():
+            try:
+                process = self.telemetry_processes.get(pid)
+                if process is None:
+                    process = self.telemetry_processes[pid] = psutil.Process(pid)
+                    process.cpu_percent(None)  # The first call only starts the measurement
+                    cpu_percent = None
+                else:
+                    cpu_percent = process.cpu_percent(None)
+                processes[name] = {'pid': pid, 'cpu_percent': cpu_percent, 'rss_bytes': process.memory_info().rss}
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        self.telemetry_processes = {pid: process for pid, process in self.telemetry_processes.items()
+                                    if pid in pids.values()}
+
+        restarts = {}
+        for failure in self.failures:
+            restarts[failure['kind']] = restarts.get(failure['kind'], 0) + 1
+        renderer = self.renderer
+        renderer_stats = renderer.stats() if renderer else {}
+        relay = self.relay_stats()
+        return {
+            'time': now,
+            'url': self.url,
+            'title': self.title,
+            'format': self.format,
+            'tiling_engine': self.tiling_engine,
+            'playback_mode': self.playback_mode,
+            'divisions': self.divisions,
+            'download_bytes_per_second': download_rate,
+            'decode_fps': decode_fps,
+            'output_fps': self.output_fps(),
+            'frames_dropped_total': supervisor.frame_drops,
+            'decoder_frames_dropped_total': renderer_stats.get('decoder_drops'),
+            'decoder_frames_duplicated_total': renderer_stats.get('decoder_duplicates'),
+            'relay_underruns_total': relay['underruns'] if relay else None,
+            'time_to_first_frame_seconds': supervisor.first_frame_time - supervisor.start_time
+            if supervisor.first_frame_time is not None else None,
+            'pipeline_uptime_seconds': now - supervisor.start_time,
+            'restarts': restarts,
+            'last_restart_reason': f"{self.failures[-1]['source']}: {self.failures[-1]['reason']}"
+            if self.failures else None,
+            'failovers_total': len(self.failovers),
+            'child_processes': child_process_count(),
+            'leaked_processes_total': self.leaked_processes,
+            'processes': processes,
+        }
+
+    def _record_telemetry(self, supervisor):
+        sample = self.telemetry_sample(supervisor)
+        telemetry = get_telemetry()
+        if telemetry is not None:
+            telemetry.record(sample)
+        if self.parent is not None:
+            self.parent.update_telemetry(format_telemetry(sample))
+        elif self.verbose:
+            print(f"Telemetry: {format_telemetry(sample)}")
+
+    def _check_rotation(self):
+        """Start prefetching the next URL when its switch nears, return a rotate event once it is due."""
+        now = time.time()
+        if self.prefetch is None and now >= self.rotation.switch_time - ROTATION_PREFETCH_SECONDS:
+            self.prefetch = RotationPrefetch(self.rotation.upcoming(), self)
+        if now < self.rotation.switch_time:
+            return None
+        return {'source': 'rotation', 'reason': f"switching to {self.rotation.upcoming()}", 'kind': 'rotate',
+                'occurred': now, 'detected': now}
+
+    def _rotate(self, now):
+        """Make the next URL of the rotation the played one, return its history entry."""
+        previous_url = self.url
+        self.url = self.rotation.advance(now)
+        prefetch, self.prefetch = self.prefetch, None
+        # Resolved by the prefetch already, these are info cache hits
+        if not self.resolve():
+            print(f"Rotation: '{self.url}' can not be played, staying on '{previous_url}'")
+            self.url = previous_url
+            self.resolve()
+        standby = None
+        if prefetch is not None:
+            if self.url == prefetch.url:
+                standby = prefetch.take(self._build_standby_command()[1])
+            prefetch.close()
+        self.standby = standby  # Taken over by _start_pipeline
+        switch = {'time': now, 'url': self.url, 'title': self.title, 'prefetched': standby is not None,
+                  'switch_seconds': None}
+        self.rotation.history.append(switch)
+        self._update_status(f"Rotation: {self.title}", color='blue')
+        return switch
+
+    def _close_prefetch(self):
+        prefetch, self.prefetch = self.prefetch, None
+        if prefetch:
+            prefetch.close()
+
+    def _print_rotation_stats(self):
+        if self.rotation is None:
+            return
+        stats = self.rotation.stats()
+        average = f", {stats['switch_seconds_avg']:.2f}s on average, {stats['switch_seconds_max']:.2f}s at most" \
+            if stats['switch_seconds_avg'] is not None else ""
+        print(f"Rotation: {stats['switches']} switches, {stats['prefetched']} prefetched{average}")
+
+    def render(self, output, progress=None, workers=None):
+        """Tile the whole video into the output file, return the OfflineRenderer stats."""
+        if self.is_live:
+            raise ValueError("Live streams can not be rendered to a file")
+        duration = extract_info(self.url).get('duration')
+        if not duration:
+            raise ValueError("The duration of the video is unknown")
+        if self.format is None or self.format_divisions != self.divisions:
+            self._choose_format()
+        if not self.selected_formats:
+            raise ValueError("No suitable format found")
+
+        video_format = self.selected_formats[0]
+        audio_format = None
+        if self.audio_mode != AUDIO_MODE_OFF:
+            audio_format = self.audio_format
+            if audio_format is None and len(self.selected_formats) > 1:
+                audio_format = self.selected_formats[-1]
+            if audio_format is None and video_format.get('acodec') not in (None, 'none'):
+                audio_format = video_format
+        formats = [video_format] + ([audio_format] if audio_format and audio_format is not video_format else [])
+
+        temp_dir = None
+        try:
+            if all(f.get('url') and f.get('protocol', 'https') in DIRECT_PLAYBACK_PROTOCOLS for f in formats):
+                inputs = [build_direct_input_arguments(f) for f in formats]
+            else:
+                # Fragmented formats can not be seeked by ffmpeg, download them first
+                temp_dir = tempfile.mkdtemp(prefix='video-tiler-source-')
+                command = [self.yt_dlp_path, self.url, '-f', '+'.join(f['format_id'] for f in formats),
+                           '--merge-output-format', 'mkv',
+                           '-o', os.path.join(temp_dir, 'source.%(ext)s'), '--quiet', '--no-warnings']
+                print(command)
+                if progress:
+                    progress(0.0, None, "Downloading the source")
+                subprocess.run(command, check=True)
+                inputs = [['-i', os.path.join(temp_dir, name)] for name in os.listdir(temp_dir)][:1]
+            video_input = inputs[0]
+            if audio_format is None:
+                audio_input = None
+            else:
+                audio_input = inputs[1] if len(inputs) > 1 else inputs[0]
+
+            self.offline_renderer = OfflineRenderer(
+                video_input, audio_input, duration, self.divisions, self.screen_width, self.screen_height,
+                output, self.ffmpeg_path, tiling_engine=self.tiling_engine, workers=workers,
+                progress=(lambda fraction, eta: progress(fraction, eta, "Rendering")) if progress else None)
+            print(f"Rendering {format_duration(duration)} of '{self.title}' in "
+                  f"{len(self.offline_renderer.segments())} segments on {self.offline_renderer.workers} workers")
+            return self.offline_renderer.run()
+        finally:
+            self.offline_renderer = None
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def reload(self):
+        """Resolve the URL again and restart the pipeline, without counting it as a failure."""
+        supervisor = self.supervisor
+        if supervisor is None:
+            print("Nothing to reload, no pipeline is running")
+            return
+        supervisor._post('reload', "reload requested", kind='reload', stage='source')
+
+    def stop_video(self):
+        self.play_flag = False
+        self.stop_event.set()
+        offline_renderer = self.offline_renderer
+        if offline_renderer:
+            print("Cancelling the render")
+            offline_renderer.cancel()
+        if self.timer_window is not None:
+            self.timer_window.parent.destroy()
+        if self.supervisor:
+            print("Stopping video")
+            self._stop_pipeline()
+            self.process_pid = None
+        if self.process_pid:
+            # Between pipelines: stop the source with the player, and what both started
+            print("Stopping video")
+            self.leaked_processes += stop_processes(
+                set(p for p in (self.ytdlp_process, self.ffplay_process) if p is not None))
+            self.ytdlp_process = None
+            self.process = None
+            self.process_pid = None
+        else:
+            #print("No video instance to stop.")
+            pass
+        self.play_flag = False  # Stop the play flag
+
+def warm_up_imports(modules=None):
+    """Import the modules that are otherwise loaded on first use."""
+    if modules is None:
+        modules = list(WARM_UP_MODULES)
+        if read_tiling_engine() == TILING_ENGINE_NUMPY:
+            modules.append('numpy')
+    start_time = time.time()
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            print(f"Warm-up: {e}")
+    print(f"Warm-up imports done in {time.time() - start_time:.2f}s")
+
+
+def startup_probe(stage):
+    """Print when a startup stage is reached, read by startup_benchmark() in the parent process."""
+    print(f"startup probe: {stage} {time.time():.6f}", flush=True)
+
+
+def startup_benchmark(runs=STARTUP_BENCHMARK_RUNS, top=15):
+    """Time the GUI from process start to its first window, with an import time breakdown.
+
+    Each run starts this program with --startup-probe, which exits as soon
+    as the window is drawn. The median times are printed and appended as a
+    JSON line to STARTUP_BENCHMARK_FILE_NAME, the slowest top level imports
+    come from one more run with PYTHONPROFILEIMPORTTIME set.
+    """
+    from prettytable import PrettyTable
+    command = program_command() + ['--startup-probe']
+
+    stage_times = {}
+    error = None
+    for run in range(runs):
+        start_time = time.time()
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=120)
+        stages = {stage: float(t) - start_time for stage, t in STARTUP_PROBE_PATTERN.findall(completed.stdout)}
+        for stage, seconds in stages.items():
+            stage_times.setdefault(stage, []).append(seconds)
+        if 'window' not in stages:
+            error = (completed.stderr.strip().splitlines() or ["no window"])[-1]
+            break
+
+    # -X importtime is not available in a frozen build, the variable works everywhere
+    completed = subprocess.run(command, capture_output=True, text=True, timeout=120,
+                               env=dict(os.environ, PYTHONPROFILEIMPORTTIME='1'))
+    imports = [(name, int(cumulative) / 1e6)
+               for _, cumulative, indent, name in IMPORT_TIME_PATTERN.findall(completed.stderr)
+               if len(indent) == 1]  # Top level imports only, nested ones are in their cumulative time
+    imports.sort(key=lambda item: item[1], reverse=True)
+
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2] if values else None
+
+    result = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'version': PROGRAM_VERSION,
+        'python': sys.version.split()[0],
+        'frozen': bool(getattr(sys, 'frozen', False)),
+        'runs': len(stage_times.get('cli', [])),
+        'cli_seconds': median(stage_times.get('cli', [])),
+        'gui_seconds': median(stage_times.get('gui', [])),
+        'window_seconds': median(stage_times.get('window', [])),
+        'error': error,
+        'import_seconds': sum(seconds for _, seconds in imports),
+        'imports': imports[:top],
+    }
+
+    def seconds(value):
+        return f"{value:.3f}" if value is not None else "n/a"
+
+    table = PrettyTable()
+    table.field_names = ["Stage", "Median (s)"]
+    table.align["Stage"] = 'l'
+    table.add_row(["Interpreter and module loaded", seconds(result['cli_seconds'])])
+    table.add_row(["tkinter and GUI classes loaded", seconds(result['gui_seconds'])])
+    table.add_row(["First window drawn", seconds(result['window_seconds']) if error is None else f"n/a ({error})"])
+    print(table)
+    table = PrettyTable()
+    table.field_names = ["Top level import", "Cumulative (s)"]
+    table.align["Top level import"] = 'l'
+    for name, import_seconds in imports[:top]:
+        table.add_row([name, f"{import_seconds:.4f}"])
+    print(table)
+
+    results_file = app_data_path(STARTUP_BENCHMARK_FILE_NAME)
+    with open(results_file, 'a', encoding='utf-8') as file:
+        file.write(json.dumps(result) + '\n')
+    print(f"Results appended to {results_file}")
+    return result
+
+
+def run_stand_in(name):
+    """Act as the yt-dlp, ffplay or ffmpeg executable of a self test, return the exit code.
+
+    The command line is ignored, the behaviour of this start is taken from
+    STAND_IN_ENVIRONMENT, the last one of the list repeating. Starts are
+    counted in a file of the state directory.
+    """
+    spec = json.loads(os.environ.get(STAND_IN_ENVIRONMENT) or '{}')
+    run = 0
+    counter_path = os.path.join(spec['state'], name + '.runs') if spec.get('state') else None
+    if counter_path and os.path.exists(counter_path):
+        with open(counter_path, 'r') as file:
+            run = int(file.read() or 0)
+    if counter_path:
+        with open(counter_path, 'w') as file:
+            file.write(str(run + 1))
+    behaviours = spec.get(name) or ['normal']
+    behaviour, _, seconds = behaviours[min(run, len(behaviours) - 1)].partition(':')
+    seconds = float(seconds) if seconds else 0
+    if name == 'yt-dlp':
+        return _run_stand_in_source(behaviour, seconds)
+    if name == 'ffplay':
+        return _run_stand_in_player(behaviour, seconds)
+    if name == 'orphan':
+        while True:
+            time.sleep(60)  # Until it is stopped with its process group
+    return 0
+
+def _run_stand_in_source(behaviour, seconds):
+    """Write a stream to stdout: normal, slow_start:S, stall_after:S, crash_after:S, crash_orphan:S or partial:S."""
+    if behaviour == 'crash_orphan':
+        # Like the ffmpeg of a yt-dlp, left running when the yt-dlp crashes. The
+        # state directory on its command line finds it once it is reparented.
+        state = json.loads(os.environ[STAND_IN_ENVIRONMENT])['state']
+        subprocess.Popen(program_command() + ['--stand-in', 'orphan', state], stdout=subprocess.DEVNULL)
+        behaviour = 'crash_after'
+    if behaviour == 'slow_start':
+        time.sleep(seconds)
+        behaviour = 'normal'
+    chunk = bytes(RELAY_CHUNK_SIZE)
+    start_time = time.time()
+    try:
+        while behaviour == 'normal' or time.time() - start_time < seconds:
+            sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            time.sleep(STAND_IN_CHUNK_INTERVAL)
+    except (BrokenPipeError, OSError):
+        return 0  # The player went away
+    if behaviour == 'stall_after':
+        while True:
+            time.sleep(60)  # Still connected, no more data
+    if behaviour == 'crash_after':
+        sys.stderr.write("ERROR: simulated crash\n")
+        return 1
+    return 0  # partial: the stream ends early
+
+def _run_stand_in_player(behaviour, seconds):
+    """Read stdin and print -stats lines: normal, crash_after:S, stall_after:S or hang_on_exit."""
+    if behaviour == 'hang_on_exit' and hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    start_time = None
+    while True:
+        try:
+            data = sys.stdin.buffer.read1(RELAY_CHUNK_SIZE)
+        except OSError:
+            data = b''
+        if not data:
+            if behaviour == 'hang_on_exit':
+                while True:
+                    time.sleep(60)
+            return 0  # -autoexit at the end of the stream
+        now = time.time()
+        start_time = start_time or now
+        clock = now - start_time
+        sys.stderr.write(f"{clock:7.2f} M-V:  0.000 fd=   0 aq=    0KB vq=    0KB sq=    0B \r")
+        sys.stderr.flush()
+        if seconds and clock >= seconds:
+            if behaviour == 'crash_after':
+                sys.stderr.write("simulated crash\n")
+                return 1
+            if behaviour == 'stall_after':
+                while True:
+                    time.sleep(60)  # Frozen, reads and shows nothing
+
+def write_stand_ins(directory):
+    """Write yt-dlp, ffplay and ffmpeg launchers of this program's --stand-in mode into directory."""
+    command = program_command()
+    os.makedirs(directory, exist_ok=True)
+    for name in ('yt-dlp', 'ffplay', 'ffmpeg'):
+        if sys.platform == 'win32':
+            path = os.path.join(directory, name + '.bat')
+            content = '@' + subprocess.list2cmdline(command + ['--stand-in', name]) + ' %*\r\n'
+        else:
+            import shlex
+            path = os.path.join(directory, name)
+            content = '#!/bin/sh\nexec ' + ' '.join(shlex.quote(c) for c in command + ['--stand-in', name]) + ' "$@"\n'
+        with open(path, 'w') as file:
+            file.write(content)
+        os.chmod(path, 0o755)
+
+def _run_selftest_scenario(scenario, state_dir):
+    """Play against the stand-ins until the scenario's failure is recovered from, return the measurements."""
+    import psutil
+    name, source_behaviours, player_behaviours, expected_kind, expected_stage = scenario
+    os.environ[STAND_IN_ENVIRONMENT] = json.dumps({'state': state_dir, 'yt-dlp': source_behaviours,
+                                                   'ffplay': player_behaviours})
+    result = {'scenario': name, 'failure': None, 'detect_seconds': None, 'restart_seconds': None,
+              'first_frame_seconds': None, 'stop_seconds': None, 'errors': []}
+    video = YouTubeVideo(None, SELFTEST_FORMATS[0]['url'], verbose=False, tiling_engine=TILING_ENGINE_DOWNSCALE,
+                         playback_mode=PLAYBACK_MODE_RELAY, hot_standby=False, resolve=False,
+                         audio_mode=AUDIO_MODE_OFF, auto_divisions=False, fps_cap=DEFAULT_SOURCE_FPS)
+    video.title = name
+    video.screen_width, video.screen_height = DEFAULT_SCREEN_WIDTH, DEFAULT_SCREEN_HEIGHT
+    video._choose_format(SELFTEST_FORMATS)
+    video.ytdlp_is_valid = True
+    thread = threading.Thread(target=video.play_video, daemon=True)
+    thread.start()
+
+    # Wait for what the scenario is about: a restarted pipeline, or a playing one
+    first_supervisor = None
+    deadline = time.time() + SELFTEST_TIMEOUT
+    while time.time() < deadline:
+        supervisor = video.supervisor
+        first_supervisor = first_supervisor or supervisor
+        if expected_kind is not None:
+            if video.failures and video.failures[0].get('restart_seconds') is not None:
+                break
+        elif first_supervisor is not None and first_supervisor.first_frame_time is not None:
+            time.sleep(1)  # Play a little before stopping
+            break
+        time.sleep(0.05)
+    if first_supervisor is not None and first_supervisor.first_frame_time is not None:
+        result['first_frame_seconds'] = first_supervisor.first_frame_time - first_supervisor.start_time
+
+    stop_time = time.time()
+    video.stop_video()
+    thread.join(SELFTEST_STOP_BUDGET + 5)
+    result['stop_seconds'] = time.time() - stop_time
+
+    if expected_kind is None:
+        if video.failures:
+            result['errors'].append(f"unexpected failure: {video.failures[0]['reason']}")
+        slow_start = [float(b.split(':')[1]) for b in source_behaviours[:1] if b.startswith('slow_start:')]
+        budget = SELFTEST_FIRST_FRAME_BUDGET + sum(slow_start)
+        if result['first_frame_seconds'] is None:
+            result['errors'].append("no frame")
+        elif result['first_frame_seconds'] > budget:
+            result['errors'].append(f"first frame after {result['first_frame_seconds']:.2f}s > {budget:.2f}s")
+    elif not video.failures:
+        result['errors'].append(f"no {expected_kind} failure detected")
+    else:
+        failure = video.failures[0]
+        result['failure'] = f"{failure['kind']}, {failure['stage']}"
+        result['detect_seconds'] = failure['detected'] - failure['occurred']
+        result['restart_seconds'] = failure.get('restart_seconds')
+        if failure['kind'] != expected_kind or expected_stage not in (None, failure['stage']):
+            result['errors'].append(f"expected {expected_kind}, {expected_stage or 'any'}")
+        budget = SELFTEST_DETECT_BUDGET + (SELFTEST_STALL_SECONDS if expected_kind == 'stall' else 0)
+        if result['detect_seconds'] > budget:
+            result['errors'].append(f"detected after {result['detect_seconds']:.2f}s > {budget:.2f}s")
+        if result['restart_seconds'] is None:
+            result['errors'].append("not restarted")
+        elif result['restart_seconds'] > SELFTEST_RESTART_BUDGET:
+            result['errors'].append(f"restarted after {result['restart_seconds']:.2f}s > {SELFTEST_RESTART_BUDGET:.2f}s")
+
+    if thread.is_alive():
+        result['errors'].append("play_video did not return")
+    elif result['stop_seconds'] > SELFTEST_STOP_BUDGET:
+        result['errors'].append(f"stopped after {result['stop_seconds']:.2f}s > {SELFTEST_STOP_BUDGET:.2f}s")
+    if video.leaked_processes:
+        result['errors'].append(f"{video.leaked_processes} processes leaked")
+    children = {child.pid for child in psutil.Process().children(recursive=True)}
+    leftovers = []
+    for process in psutil.process_iter(['cmdline', 'status']):
+        cmdline = process.info['cmdline'] or []
+        if '--stand-in' in cmdline and process.info['status'] != psutil.STATUS_ZOMBIE \
+                and (process.pid in children or state_dir in cmdline):
+            leftovers.append(process)
+    if leftovers:
+        result['errors'].append(f"{len(leftovers)} processes left running")
+        for child in leftovers:
+            try:
+                child.kill()
+            except psutil.NoSuchProcess:
+                pass
+    return result
+
+def selftest(names=None, verbose=False):
+    """Check failure detection, restart latency and shutdown of play_video against stand-in executables.
+
+    Runs SELFTEST_SCENARIOS, or the ones named, with a temporary application
+    directory so the user's settings and caches are left alone. The output of
+    play_video is shown for failed scenarios, for all with verbose. Return
+    the number of failed scenarios.
+    """
+    import contextlib
+    import io
+    from prettytable import PrettyTable
+    global _app_data_dir
+    scenarios = [s for s in SELFTEST_SCENARIOS if not names or s[0] in names]
+    if names and len(scenarios) != len(names):
+        raise ValueError(f"Unknown scenario, choose from: {', '.join(s[0] for s in SELFTEST_SCENARIOS)}")
+
+    temp_dir = tempfile.mkdtemp(prefix='video-tiler-selftest-')
+    saved_app_data_dir, saved_path = _app_data_dir, os.environ.get('PATH', '')
+    saved_spec = os.environ.get(STAND_IN_ENVIRONMENT)
+    _app_data_dir = temp_dir
+    write_setting('stall_seconds', SELFTEST_STALL_SECONDS)
+    write_stand_ins(os.path.join(temp_dir, 'bin'))
+    os.environ['PATH'] = os.path.join(temp_dir, 'bin') + os.pathsep + saved_path
+    results = []
+    try:
+        for index, scenario in enumerate(scenarios):
+            log = io.StringIO()
+            state_dir = os.path.join(temp_dir, f'state{index}')
+            os.makedirs(state_dir)
+            with contextlib.redirect_stdout(log):
+                result = _run_selftest_scenario(scenario, state_dir)
+            results.append(result)
+            status = 'ok' if not result['errors'] else 'FAILED: ' + '; '.join(result['errors'])
+            print(f"{result['scenario']}: {status}", flush=True)
+            if verbose or result['errors']:
+                print(log.getvalue())
+    finally:
+        _app_data_dir = saved_app_data_dir
+        os.environ['PATH'] = saved_path
+        if saved_spec is None:
+            os.environ.pop(STAND_IN_ENVIRONMENT, None)
+        else:
+            os.environ[STAND_IN_ENVIRONMENT] = saved_spec
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def seconds(value):
+        return f"{value:.2f}" if value is not None else '-'
+
+    table = PrettyTable()
+    table.field_names = ["Scenario", "Failure", "Detect (s)", "Restart (s)", "First frame (s)", "Stop (s)", "Result"]
+    table.align["Result"] = 'l'
+    for result in results:
+        table.add_row([result['scenario'], result['failure'] or '-', seconds(result['detect_seconds']),
+                       seconds(result['restart_seconds']), seconds(result['first_frame_seconds']),
+                       seconds(result['stop_seconds']), 'ok' if not result['errors'] else '; '.join(result['errors'])])
+    print(f"Budgets: detect {SELFTEST_DETECT_BUDGET}s (stalls +{SELFTEST_STALL_SECONDS}s), "
+          f"restart {SELFTEST_RESTART_BUDGET}s, first frame {SELFTEST_FIRST_FRAME_BUDGET}s, stop {SELFTEST_STOP_BUDGET}s")
+    print(table)
+    failed = sum(1 for result in results if result['errors'])
+    print(f"{len(results) - failed}/{len(results)} scenarios passed")
+    return failed
+
+def build_argument_parser():
+    parser = argparse.ArgumentParser(description="Video Tiler")
+    parser.add_argument('--compare-engines', action='store_true',
+                        help="Measure CPU time and fps of every tiling engine for divisions 1 to 64 on a 720p30 "
+                             "source and exit, --benchmark with one source")
+    parser.add_argument('--compare-fps-caps', action='store_true',
+                        help="Measure the filter graph CPU time per displayed frame without and with "
+                             "the output fps cap and exit")
+    parser.add_argument('--compare-playback-modes', metavar='URL',
+                        help="Measure CPU use and time to first frame of the relay and direct playback modes and exit")
+    parser.add_argument('--startup-benchmark', action='store_true',
+                        help="Measure the import times and the time to the first window and exit")
+    parser.add_argument('--startup-probe', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--selftest', nargs='*', metavar='SCENARIO',
+                        help="Check failure detection and restart latency against stand-in executables and exit, "
+                             "with code 1 when a scenario misses its budget. Scenarios: "
+                             + ', '.join(f"'{s[0]}'" for s in SELFTEST_SCENARIOS) + " (default all)")
+    parser.add_argument('--verbose', action='store_true', help="Show the playback output of every self test scenario")
+    parser.add_argument('--benchmark', nargs='?', const='', metavar='FILE',
+                        help="Measure the tiling throughput, CPU time and memory of every engine on synthetic "
+                             f"sources and exit. The results are appended to FILE ({BENCHMARK_FILE_NAME} in the "
+                             "application directory by default)")
+    parser.add_argument('--benchmark-sources', metavar='WxH@FPS,...',
+                        help=f"Synthetic sources of the benchmark (default {','.join(BENCHMARK_SOURCES)})")
+    parser.add_argument('--benchmark-divisions', metavar='D1,D2,...',
+                        help=f"Divisions of the benchmark (default {','.join(map(str, BENCHMARK_DIVISIONS))})")
+    parser.add_argument('--benchmark-duration', type=float, default=BENCHMARK_DURATION, metavar='SECONDS',
+                        help=f"Seconds of video per run (default {BENCHMARK_DURATION})")
+    parser.add_argument('--check-streams', nargs='*', metavar='URL',
+                        help="Resolve these URLs, or the configured stream list without URLs, concurrently, show "
+                             "which are live, available, offline or broken and exit, with code 1 when one is broken")
+    parser.add_argument('--check-format-corpus', nargs='?', const='', metavar='FILE',
+                        help=f"Check the format selection against a recorded corpus ({FORMAT_CORPUS_FILE_NAME} "
+                             "by default) and exit, with code 1 on mismatches")
+
+    headless = parser.add_argument_group("headless mode", "Play without the GUI, for kiosks and signage. "
+                                         "SIGTERM and SIGINT stop, SIGHUP resolves the URL again and restarts.")
+    headless.add_argument('--headless', action='store_true', help="Play --url without any window but the player")
+    headless.add_argument('--url', help="Video URL to play")
+    headless.add_argument('--rotate', action='store_true',
+                          help="Play the configured URLs in turn instead of --url, at the times of the "
+                               "configuration's rotation_schedule or round robin")
+    headless.add_argument('--rotate-seconds', type=int, metavar='SECONDS',
+                          help=f"Time each URL plays round robin (default {ROTATION_SECONDS})")
+    headless.add_argument('--divisions', type=int, help="Grid divisions, the saved value by default")
+    headless.add_argument('--auto-divisions', action='store_true', default=None,
+                          help="Start at --divisions and keep adjusting them to the largest grid "
+                               "that plays at source fps on this machine")
+    headless.add_argument('--engine', '--renderer', dest='engine', choices=TILING_ENGINES,
+                          help="Tiling engine, the saved value by default")
+    headless.add_argument('--playback-mode', choices=PLAYBACK_MODES, help="Playback mode, the saved value by default")
+    headless.add_argument('--hot-standby', action='store_true', default=None,
+                          help="Keep a standby source connected for live streams")
+    headless.add_argument('--audio', dest='audio_mode', choices=AUDIO_MODES,
+                          help="muxed: the player decodes audio with the video, separate: the tiles only decode "
+                               "video and one audio only player runs beside them, off: silent. The saved value by default")
+    headless.add_argument('--audio-max-abr', type=int, metavar='KBPS',
+                          help=f"Highest bitrate of the separate audio format (default {AUDIO_MAX_ABR})")
+    headless.add_argument('--fps-cap', type=parse_fps_cap, metavar='FPS',
+                          help=f"Highest output frame rate, '{FPS_CAP_DISPLAY}' for the monitor refresh rate. "
+                               "The saved value by default")
+    headless.add_argument('--telemetry-file', metavar='FILE',
+                          help="Append pipeline metrics to FILE as JSON lines, the telemetry_file setting by default")
+    headless.add_argument('--telemetry-port', type=int, metavar='PORT',
+                          help=f"Serve pipeline metrics as Prometheus text on http://{TELEMETRY_HOST}:PORT/metrics, "
+                               "the telemetry_port setting by default")
+    headless.add_argument('--power-saving', dest='fps_cap', action='store_const', const=str(POWER_SAVING_FPS),
+                          help=f"Same as --fps-cap {POWER_SAVING_FPS}")
+
+    mosaic = parser.add_argument_group("mosaic", "Show different URLs in the cells of one grid, with --divisions.")
+    mosaic.add_argument('--mosaic', nargs='*', metavar='URL',
+                        help="Play a mosaic of these URLs, of the configured stream list without URLs")
+    mosaic.add_argument('--audio-source', type=int, default=0,
+                        help="Index of the URL whose audio is played, -1 for none (default 0)")
+
+    wall = parser.add_argument_group("monitor wall", "Span --url over every monitor, decoded once.")
+    wall.add_argument('--wall', action='store_true', help="Play --url on every monitor")
+    wall.add_argument('--wall-divisions', metavar='D1,D2,...',
+                      help="Divisions of each monitor, the last ones are used for the monitors after them "
+                           "(default --divisions)")
+    wall.add_argument('--wall-presenter', metavar='SPEC', help=argparse.SUPPRESS)
+
+    serve = parser.add_argument_group("network server", "Tile --url once and serve it as HLS to the screens of "
+                                      "the local network, which play http://HOST:PORT/stream.m3u8 with 1 division.")
+    serve.add_argument('--serve', action='store_true', help="Serve the tiled --url until SIGTERM or SIGINT")
+    serve.add_argument('--serve-host', default='0.0.0.0', help="Address to listen on (default all interfaces)")
+    serve.add_argument('--serve-port', type=int, default=SERVE_PORT, help=f"Port to listen on (default {SERVE_PORT})")
+    serve.add_argument('--serve-size', metavar='WIDTHxHEIGHT',
+                       help=f"Size of the served video (default {DEFAULT_SCREEN_WIDTH}x{DEFAULT_SCREEN_HEIGHT})")
+
+    render = parser.add_argument_group("offline render", "Tile a video into a file, with --url and --divisions.")
+    render.add_argument('--render', metavar='OUTPUT', help="Render the tiled video to OUTPUT (.mp4, .mkv) and exit")
+    render.add_argument('--render-size', metavar='WIDTHxHEIGHT',
+                        help="Size of the rendered video, the screen size by default")
+    render.add_argument('--render-workers', type=int, help="Segments encoded at a time, the number of cores by default")
+    return parser
+
+
+def run_check_streams(urls):
+    """Print the health of urls, return 1 when one of them can not be resolved."""
+    from prettytable import PrettyTable
+    start_time = time.time()
+    results = check_streams(urls, use_cache=False)
+    table = PrettyTable()
+    table.field_names = ["URL", "State", "Title", "Lookup (s)", "Error"]
+    table.align["URL"] = table.align["Title"] = table.align["Error"] = 'l'
+    for health in results:
+        table.add_row([health['url'], health['state'], health['title'] or '', f"{health['seconds']:.2f}",
+                       health['error'] or ''])
+    print(table)
+    print(f"Checked {len(results)} URLs in {time.time() - start_time:.2f}s, {STREAM_HEALTH_WORKERS} at a time")
+    return 1 if any(health['state'] == STREAM_ERROR for health in results) else 0
+
+def run_mosaic(args):
+    """Play a mosaic of args.mosaic, or of the configured URLs, until it is closed or signalled."""
+    urls = args.mosaic or get_configured_urls()
+    divisions = args.divisions or read_divisions()
+    screen_width, screen_height = get_screen_size()
+    fps = min(MOSAIC_FPS, get_fps_cap(args.fps_cap)) if args.fps_cap else None
+    mosaic = MosaicRenderer(urls, divisions, screen_width, screen_height, audio_source=args.audio_source, fps=fps)
+
+    def stop(signum, frame):
+        print(f"Received signal {signum}, stopping")
+        mosaic.running = False
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    mosaic.start()
+    try:
+        while mosaic.is_running():
+            time.sleep(0.5)
+    finally:
+        mosaic.stop()
+    for source in mosaic.stats()['sources']:
+        print(f"Mosaic source '{source['title']}': {source['frames']} frames, {source['restarts']} restarts")
+    return 0
+
+
+def run_wall(args):
+    """Play args.url on every monitor until a presenter window is closed or a signal arrives."""
+    if args.wall_divisions:
+        divisions_list = [int(d) for d in args.wall_divisions.split(',')]
+    else:
+        divisions_list = [args.divisions or read_divisions()]
+    fps = min(DEFAULT_SOURCE_FPS, get_fps_cap(args.fps_cap)) if args.fps_cap else None
+    wall = WallRenderer(args.url, divisions_list=divisions_list, fps=fps)
+
+    def stop(signum, frame):
+        print(f"Received signal {signum}, stopping")
+        wall.running = False
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    wall.start()
+    try:
+        while wall.is_running():
+            time.sleep(0.5)
+    finally:
+        wall.stop()
+    stats = wall.stats()
+    print(f"Wall: {stats['frames']} frames decoded once for {len(stats['presenters'])} monitors, "
+          f"{stats['sources'][0]['restarts']} source restarts, "
+          f"{sum(p['restarts'] for p in stats['presenters'])} presenter restarts")
+    return 0
+
+
+def run_serve(args):
+    """Serve args.url tiled as HLS until SIGTERM or SIGINT, return the exit code."""
+    # The clients decode audio with the video, the separate audio player is local only
+    audio_mode = AUDIO_MODE_OFF if args.audio_mode == AUDIO_MODE_OFF else AUDIO_MODE_MUXED
+    video = YouTubeVideo(None, args.url, args.divisions, tiling_engine=args.engine,
+                         playback_mode=args.playback_mode, audio_mode=audio_mode,
+                         fps_cap=get_fps_cap(args.fps_cap) if args.fps_cap else None)
+    if not video.ytdlp_is_valid:
+        print(f"URL '{args.url}' does not seem to be a valid video: {video.resolve_error}")
+        return 1
+    if args.serve_size:
+        video.screen_width, video.screen_height = (int(x) for x in args.serve_size.lower().split('x'))
+    else:
+        video.screen_width, video.screen_height = DEFAULT_SCREEN_WIDTH, DEFAULT_SCREEN_HEIGHT
+    video._choose_format()
+    server = HlsServer(video, host=args.serve_host, port=args.serve_port)
+    stopped = threading.Event()
+
+    def stop(signum, frame):
+        print(f"Received signal {signum}, stopping")
+        stopped.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        server.start()
+    except OSError as e:
+        print(f"Can not listen on {args.serve_host}:{args.serve_port}: {e}")
+        server.stop()
+        return 1
+    try:
+        while not stopped.wait(0.5):
+            pass
+    finally:
+        stats = server.stats()
+        server.stop()
+    print(f"Served {stats['bytes_served'] / 1e6:.1f} MB to {stats['clients_total']} clients in "
+          f"{format_duration(stats['uptime'])}, {stats['restarts']} pipeline restarts")
+    return 0
+
+
+def run_render(args):
+    """Render args.url to args.render with progress on the console, return the exit code."""
+    video = YouTubeVideo(None, args.url, args.divisions, tiling_engine=args.engine,
+                         audio_mode=args.audio_mode, audio_max_abr=args.audio_max_abr)
+    if not video.ytdlp_is_valid:
+        print(f"URL '{args.url}' does not seem to be a valid video: {video.resolve_error}")
+        return 1
+    if args.render_size:
+        video.screen_width, video.screen_height = (int(x) for x in args.render_size.lower().split('x'))
+        video._choose_format()
+
+    def progress(fraction, eta, stage):
+        eta_text = f", {format_duration(eta)} left" if eta is not None else ""
+        print(f"{stage}: {100 * fraction:.1f}%{eta_text}", flush=True)
+
+    signal.signal(signal.SIGINT, lambda signum, frame: video.stop_video())
+    signal.signal(signal.SIGTERM, lambda signum, frame: video.stop_video())
+    try:
+        stats = video.render(args.render, progress=progress, workers=args.render_workers)
+    except (ValueError, RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"Render failed: {e}")
+        return 1
+    print(f"Rendered {args.render}: {format_duration(stats['duration'])} in {format_duration(stats['seconds'])} "
+          f"({stats['speed']:.2f}x real time, {stats['segments']} segments on {stats['workers']} workers)")
+    return 0
+
+
+def run_headless(args):
+    """Play args.url, or the rotation, with auto restart until SIGTERM or SIGINT, return the exit code."""
+    rotation = None
+    url = args.url
+    if getattr(args, 'rotate', False):
+        try:
+            rotation = RotationScheduler.from_configuration(interval=args.rotate_seconds)
+        except ValueError as e:
+            print(e)
+            return 1
+        url = rotation.first()
+    video = YouTubeVideo(None, url, args.divisions, tiling_engine=args.engine,
+                         playback_mode=args.playback_mode, hot_standby=args.hot_standby,
+                         audio_mode=args.audio_mode, audio_max_abr=args.audio_max_abr,
+                         auto_divisions=args.auto_divisions,
+                         fps_cap=get_fps_cap(args.fps_cap) if args.fps_cap else None, rotation=rotation)
+    if not video.ytdlp_is_valid:
+        print(f"URL '{url}' does not seem to be a valid video: {video.resolve_error}")
+        return 1
+    video.auto_restart = True
+
+    def stop(signum, frame):
+        print(f"Received signal {signum}, stopping")
+        video.stop_video()
+
+    def reload(signum, frame):
+        print(f"Received signal {signum}, reloading")
+        video.reload()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    if hasattr(signal, 'SIGHUP'):  # Not on Windows
+        signal.signal(signal.SIGHUP, reload)
+
+    # Play in a thread so the signal handlers run as soon as a signal arrives
+    thread = threading.Thread(target=video.play_video, daemon=True)
+    thread.start()
+    while thread.is_alive():
+        thread.join(0.5)
+    video._print_rotation_stats()
+    return 0
+
+
+if __name__ == "__main__":
+    # Command line modes run here, before tkinter and the GUI classes below
+    # are loaded, so headless and benchmark runs never import them
+    if sys.argv[1:2] == ['--stand-in']:
+        sys.exit(run_stand_in(sys.argv[2]))  # Takes the command line of the executable it stands in for
+    add_to_path()
+
+    parser = build_argument_parser()
+    args = parser.parse_args()
+    if args.wall_presenter:
+        sys.exit(run_wall_presenter(json.loads(args.wall_presenter)))
+
+    if args.startup_probe:
+        startup_probe('cli')
+
+    if args.telemetry_file or args.telemetry_port:
+        get_telemetry(args.telemetry_file, args.telemetry_port)
+
+    if args.startup_benchmark:
+        startup_benchmark()
+        sys.exit(0)
+
+    if args.selftest is not None:
+        sys.exit(1 if selftest(args.selftest, args.verbose) else 0)
+
+    if args.check_streams is not None:
+        sys.exit(run_check_streams(args.check_streams or get_configured_urls()))
+
+    if args.compare_engines:
+        benchmark_tiling(sources=[COMPARE_ENGINES_SOURCE])
+        sys.exit(0)
+
+    if args.benchmark is not None:
+        benchmark_tiling(
+            sources=args.benchmark_sources.split(',') if args.benchmark_sources else None,
+            divisions_list=[int(d) for d in args.benchmark_divisions.split(',')] if args.benchmark_divisions else None,
+            engines=[args.engine] if args.engine else None, duration=args.benchmark_duration,
+            results_file=args.benchmark or None)
+        sys.exit(0)
+
+    if args.compare_fps_caps:
+        compare_fps_caps()
+        sys.exit(0)
+
+    if args.compare_playback_modes:
+        compare_playback_modes(args.compare_playback_modes)
+        sys.exit(0)
+
+    if args.check_format_corpus is not None:
+        sys.exit(1 if check_format_corpus(args.check_format_corpus or None) else 0)
+
+    if args.mosaic is not None:
+        sys.exit(run_mosaic(args))
+
+    if args.wall:
+        if not args.url:
+            parser.error("--wall needs --url")
+        sys.exit(run_wall(args))
+
+    if args.serve:
+        if not args.url:
+            parser.error("--serve needs --url")
+        sys.exit(run_serve(args))
+
+    if args.rotate:
+        sys.exit(run_headless(args))
+
+    if args.headless or args.render:
+        if not args.url:
+            parser.error("--headless and --render need --url")
+        sys.exit(run_render(args) if args.render else run_headless(args))
+
+
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from tkinter import font as tkfont
+import webbrowser
+
+
+class UrlResolver:
+    """Build and resolve YouTubeVideo objects on worker threads, off the Tk event loop.
+
+    request() waits until the URL has not changed for the debounce delay
+    before it starts a lookup. Each request bumps a generation number, and
+    lookups from an older generation are cancelled, or dropped when they
+    already run. Finished lookups are handed back on the Tk thread, through
+    an after() poll of the results queue, as callback(url, video, error).
+    """
+    def __init__(self, widget, callback, debounce_ms=URL_RESOLVE_DEBOUNCE_MS, max_workers=URL_RESOLVE_WORKERS):
+        self.widget = widget
+        self.callback = callback
+        self.debounce_ms = debounce_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='url-resolver')
+        self.results = queue.Queue()
+        self.generation = 0
+        self.pending_url = None
+        self.debounce_id = None
+        self.poll_id = None
+        self.futures = []
+
+    def request(self, url, immediate=False, **video_kwargs):
+        """Resolve url after the debounce delay, or right away, replacing any older request."""
+        if url == self.pending_url:
+            if immediate and self.debounce_id is not None:
+                # Skip what is left of the debounce delay
+                self.widget.after_cancel(self.debounce_id)
+                self._submit(self.generation, url, video_kwargs)
+            return
+        self.cancel()
+        self.pending_url = url
+        generation = self.generation
+        if immediate:
+            self._submit(generation, url, video_kwargs)
+        else:
+            self.debounce_id = self.widget.after(self.debounce_ms, self._submit, generation, url, video_kwargs)
 
-    # Check the directory of the script or executable
-    base_dir = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
-    exe_path = os.path.join(base_dir, executable_name)
-    if is_executable(exe_path):
-        return exe_path
+    def cancel(self):
+        """Forget the pending request, its result will never reach the callback."""
+        self.generation += 1
+        self.pending_url = None
+        if self.debounce_id is not None:
+            self.widget.after_cancel(self.debounce_id)
+            self.debounce_id = None
+        for future in self.futures:
+            future.cancel()  # Only lookups still waiting for a worker can be cancelled
+        self.futures = []
 
-    # Check in a 'bin' directory
-    bin_dir = os.path.join(base_dir, 'bin', executable_name)
-    if is_executable(bin_dir):
-        return bin_dir
+    def _submit(self, generation, url, video_kwargs):
+        self.debounce_id = None
+        if generation != self.generation:
+            return
+        future = self.executor.submit(self._resolve, generation, url, video_kwargs)
+        self.futures.append(future)
+        if self.poll_id is None:
+            self.poll_id = self.widget.after(URL_RESOLVE_POLL_MS, self._poll)
 
-    return None
+    def _resolve(self, generation, url, video_kwargs):
+        if generation != self.generation:
+            return
+        started = time.time()
+        try:
+            video = YouTubeVideo(self.widget, url, **video_kwargs)
+            error = video.resolve_error
+        except Exception as e:
+            video, error = None, e
+        print(f"Resolved '{url}' in {time.time() - started:.2f}s")
+        self.results.put((generation, url, video, error))
 
-# Get the application directory
-app_data_dir = appdirs.user_data_dir(APP_NAME)
-DIVISIONS_FILE = os.path.join(app_data_dir, DIVISIONS_FILE_NAME)
+    def _poll(self):
+        self.poll_id = None
+        while True:
+            try:
+                generation, url, video, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation:
+                continue  # The URL changed again while this one was resolved
+            self.pending_url = None
+            self.futures = []
+            self.callback(url, video, error)
+        if self.pending_url is not None:
+            self.poll_id = self.widget.after(URL_RESOLVE_POLL_MS, self._poll)
 
-# Ensure the application directory exists
-os.makedirs(app_data_dir, exist_ok=True)
+    def shutdown(self):
+        self.cancel()
+        if self.poll_id is not None:
+            self.widget.after_cancel(self.poll_id)
+            self.poll_id = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
-def read_divisions():
-    """Read the number of divisions from a file."""
-    if os.path.exists(DIVISIONS_FILE):
-        with open(DIVISIONS_FILE, 'r') as file:
-            content = file.read().strip()
-            if content.isdigit():
-                return int(content)
-    return 3  # Default number of divisions if the file does not exist or is invalid
 
-def write_divisions(divisions):
-    """Write the number of divisions to a file."""
-    with open(DIVISIONS_FILE, 'w') as file:
-        file.write(str(divisions))
+class StreamHealthChecker:
+    """Check the health of a list of stream URLs on worker threads, and again every interval.
+
+    The first check() resolves the URLs through the info cache, the checks
+    repeated every interval seconds bypass it, to see broadcasts start and
+    end, and refresh it for the next lookup. A URL is not checked again
+    while its previous check runs. Results are handed back on the Tk thread,
+    through an after() poll of the results queue, as callback(health), see
+    check_stream().
+    """
+    def __init__(self, widget, callback, interval=STREAM_HEALTH_INTERVAL, max_workers=STREAM_HEALTH_WORKERS):
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='stream-health')
+        self.results = queue.Queue()
+        self.urls = []
+        self.health = {}  # Latest result by URL
+        self.checking = set()  # URLs with a check submitted or running
+        self.poll_id = None
+        self.recheck_id = None
+
+    def check(self, urls=None, use_cache=True):
+        """Check urls, or the URLs of the previous call, and schedule the next check."""
+        if urls is not None:
+            self.urls = list(dict.fromkeys(urls))
+        if self.recheck_id is not None:
+            self.widget.after_cancel(self.recheck_id)
+        self.recheck_id = self.widget.after(int(self.interval * 1000), self.check, None, False)
+        for url in self.urls:
+            if url not in self.checking:
+                self.checking.add(url)
+                self.executor.submit(self._check, url, use_cache)
+        if self.checking and self.poll_id is None:
+            self.poll_id = self.widget.after(URL_RESOLVE_POLL_MS, self._poll)
+
+    def _check(self, url, use_cache):
+        self.results.put(check_stream(url, use_cache))
+
+    def _poll(self):
+        self.poll_id = None
+        while True:
+            try:
+                health = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.checking.discard(health['url'])
+            self.health[health['url']] = health
+            self.callback(health)
+        if self.checking:
+            self.poll_id = self.widget.after(URL_RESOLVE_POLL_MS, self._poll)
+        else:
+            states = [self.health[url]['state'] for url in self.urls if url in self.health]
+            print("Stream health: " + ', '.join(f"{states.count(state)} {state}" for state in STREAM_STATE_COLORS
+                                                if state in states))
+
+    def shutdown(self):
+        for after_id in (self.poll_id, self.recheck_id):
+            if after_id is not None:
+                self.widget.after_cancel(after_id)
+        self.poll_id = self.recheck_id = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
 
 class TimerWindow:
     def __init__(self, parent, title, question, duration):
@@ -156,414 +5325,6 @@ class TimerWindow:
         self.parent.destroy()
         
         
-class YouTubeVideo:
-    def __init__(self, parent, url, divisions=None, verbose=True):
-        self.parent = parent  # Store reference to the Tkinter parent (App instance)
-        self.url = url
-        self.timer_window = None
-        self.ytdlp_process = None
-        self.ytdlp_process = None
-        self.ytdlp_is_valid = False
-        
-        try:
-            if divisions is None:
-                self.divisions = read_divisions()
-            else:
-                self.divisions = divisions
-        except:
-            self.divisions = 3
-            write_divisions(self.divisions)
-        
-        self.verbose = verbose
-        self.format = None
-        self.title = ""
-        self.process = None
-        self.process_pid = None
-        self.yt_dlp_path = find_executable('yt-dlp')
-        self.ffmpeg_path = find_executable('ffmpeg')
-        self.ffplay_path = find_executable('ffplay')
-        self.play_flag = None
-
-        if not self.yt_dlp_path or not self.ffmpeg_path or not self.ffplay_path:
-            raise FileNotFoundError("One or more required executables (yt-dlp, ffmpeg, ffplay) not found.")
-
-        try:
-            self._get_video_info()
-            self._get_screen_resolution()
-            self.ytdlp_is_valid = True
-        except Exception as e:
-            # Handle errors here (e.g., invalid URL, video not available)
-            print(f"Error creating YouTube video: {e}")
-            return
-        #self._choose_format()
-
-    def _get_video_info(self):
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-        }
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            result = ydl.extract_info(self.url, download=False)
-            self.title = result.get('title', 'Unknown Title')
-
-    def _get_screen_resolution(self):
-        monitor = get_monitors()[0]
-        self.screen_width = monitor.width
-        self.screen_height = monitor.height
-        
-    def _choose_format(self):
-        self.format = None
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-        }
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            result = ydl.extract_info(self.url, download=False)
-            formats = result.get('formats', [])
-            #print(formats)
-            #input("Formats listed (all)")
-
-            # Filter out vp09 codecs
-            video_audio_formats = [
-                f for f in formats 
-                if 'vcodec' in f and 'acodec' in f 
-                and not f.get('vcodec', '').startswith('vp09')  # Exclude vp09 codecs
-                and f.get('vcodec') != 'none' 
-                and f.get('acodec') != 'none'
-            ]
-            video_formats = [
-                f for f in formats 
-                if f.get('vcodec') and not f['vcodec'].startswith('vp09')  # Exclude vp09 codecs
-                and f.get('acodec') == 'none'
-                and f.get('vcodec') is not None
-            ]
-            audio_formats = [
-                f for f in formats 
-                if f.get('vcodec') == 'none'
-                #    and 'acodec' in f  # Exclude vp09 codecs
-            ]
-            
-            #print("Audio codecs")
-            #print(audio_formats)
-            #input("Formats audio (all)")
-
-            # Sort formats
-            video_audio_formats.sort(key=lambda x: (x.get('height', 0), x.get('width', 0)))
-            video_formats.sort(key=lambda x: (x.get('height', 0), x.get('width', 0)))
-            audio_formats.sort(key=lambda x: x.get('abr') or 0)
-
-            # Prepare pretty table
-            if self.verbose:
-                table = PrettyTable()
-                table.field_names = ["Format ID", "Resolution", "Type", "VCodec", "ACodec", "Bitrate (kbps)"]
-
-                for f in video_audio_formats:
-                    table.add_row([
-                        f['format_id'],
-                        f.get('resolution', 'Unknown'),
-                        "Video+Audio",
-                        f.get('vcodec', 'Unknown'),
-                        f.get('acodec', 'Unknown'),
-                        f.get('abr', 'N/A') if 'abr' in f else 'N/A'
-                    ])
-                
-                for f in video_formats:
-                    table.add_row([
-                        f['format_id'],
-                        f.get('resolution', 'Unknown'),
-                        "Video",
-                        f.get('vcodec', 'Unknown'),
-                        'N/A',
-                        'N/A'
-                    ])
-                
-                for f in audio_formats:
-                    table.add_row([
-                        f['format_id'],
-                        "Audio only",
-                        "Audio",
-                        'N/A',
-                        f.get('acodec', 'Unknown'),
-                        f.get('abr', 'N/A') if 'abr' in f else 'N/A'
-                    ])
-                
-                print(table)
-
-            tile_width = self.screen_width / self.divisions
-            tile_height = self.screen_height / self.divisions
-
-            selected_format = None
-
-            # Step 1: Prefer a format that has both video and audio
-            for f in video_audio_formats:
-                if f.get('width', 0) >= tile_width and f.get('height', 0) >= tile_height:
-                    selected_format = f
-                    break
-
-            # Step 2: If no suitable video+audio format, combine separate video and audio formats
-            if not selected_format or selected_format is None:
-                selected_video_format = None
-                selected_audio_format = None
-
-                for f in video_formats:
-                    if f.get('width', 0) >= tile_width and f.get('height', 0) >= tile_height:
-                        selected_video_format = f
-                        break
-
-                if selected_video_format is None and video_formats:
-                    selected_video_format = video_formats[-1]
-
-                if audio_formats:
-                    selected_audio_format = audio_formats[-1]  # Choosing the highest bitrate available
-
-                if selected_video_format and selected_audio_format:
-                    selected_format = {
-                        'format_id': f"{selected_video_format['format_id']}+{selected_audio_format['format_id']}",
-                        'resolution': f"{selected_video_format.get('width', 'Unknown')}x{selected_video_format.get('height', 'Unknown')}",
-                    }
-
-            if selected_format:
-                self.format = selected_format['format_id']
-                if self.verbose:
-                    print(f"Screen resolution: {self.screen_width}x{self.screen_height}")
-                    print(f"Tile resolution: {tile_width}x{tile_height}")
-                    print(f"Selected format ID: {self.format} - {selected_format['resolution']}")
-            else:
-                print("No suitable format found.")
-
-    def check_timer_result(self, timer_window):
-        self.parent.wait_window(timer_window.parent)  # Wait for the TimerWindow to close
-
-        if timer_window.expired:
-            print("The timer expired before user response.")
-        elif timer_window.result:  # If OK was pressed
-            print("User chose to restart the video.")
-        else:
-            print("User chose to cancel.")
-            self.parent.update_status("Ready")
-            
-    def _is_ffmpeg_descendant_with_window(self, timeout=30):
-        current_pid = psutil.Process().pid
-        start_time = time.time()
-
-        def has_window(pid):
-            for window in gw.getAllWindows():
-                if window._hWnd:  # Ensure the window handle is valid
-                    _, window_pid = win32process.GetWindowThreadProcessId(window._hWnd)
-                    if window_pid == pid:
-                        return True
-            return False
-
-        while (time.time() - start_time) < timeout:
-            # Get the current process
-            current_process = psutil.Process(current_pid)
-
-            # Check for yt-dlp child processes
-            yt_dlp_exists = any(child.name() == 'yt-dlp.exe' for child in current_process.children(recursive=True))
-
-            if not yt_dlp_exists:
-                print("no yt-dlp process exists")
-                return False  # Return False immediately if no yt-dlp child process exists
-
-            # Iterate over the children of the current process to check for ffplay
-            for child in current_process.children(recursive=True):
-                try:
-                    # Check for yt-dlp child processes
-                    ffplay_exists = any(child.name() == 'ffplay.exe' for child in current_process.children(recursive=True))
-
-                    if not ffplay_exists:
-                        print("no yt-dlp process exists")
-                        return False  # Return False immediately if no yt-dlp child process exists
-                        
-                    # Check if the child process is ffplay
-                    if child.name() == 'ffplay.exe':
-                        if has_window(child.pid):  # Use child.pid to check for the window
-                            return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-
-            time.sleep(1)  # Check every second
-
-        return False
-
-
-
-    def play_video(self):
-        print("play_video")
-        self.play_flag = True
-        #if not self.format:
-        #    print("No suitable format found.")
-        #    return
-        self._choose_format()
-        
-        try:
-            write_divisions(self.divisions)
-        except:
-            pass
-
-        useragent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
-
-
-        while self.play_flag:  # Check play flag to 
-            self.url = self.parent.url_entry.get()
-            self.divisions = int(self.parent.divisions_spinbox.get())
-            write_divisions(self.divisions)
-            # yt-dlp command
-            if self.format is not None:
-                #print("Using default format")
-                yt_dlp_command = [
-                    self.yt_dlp_path, self.url, '--user-agent', useragent, '-4', '-f', self.format, '-o', '-',
-                    '--quiet', '--no-warnings'
-                ]
-            else:
-                #self.format
-                #print(f"Using format {self.format}") '--user-agent', useragent, 
-                yt_dlp_command = [
-                    self.yt_dlp_path, self.url, '-4', '-f', 'bestvideo+bestaudio/best', '-o', '-',
-                    '--quiet', '--no-warnings'
-                ]
-            
-            # ffplay command
-            ffplay_command = [
-                self.ffplay_path, '-', '-vf',
-                f'scale=w=iw*{self.divisions}/{self.divisions}:h=ih*{self.divisions}/{self.divisions},'
-                f'fps=source_fps*{self.divisions}*{self.divisions},tile={self.divisions}x{self.divisions}',
-                '-autoexit', '-loglevel', 'error', '-hide_banner', '-fs'
-            ]
-
-        
-        
-        
-            if self.ytdlp_process:
-                self.ytdlp_process.terminate()
-                self.ytdlp_process.wait()
-                exit_code = self.ytdlp_process.returncode
-                print(f"yt-dlp process exited with exit code {exit_code}")
-                print("Previous yt-dlp process terminated.")
-                
-            # Use subprocess.PIPE to handle the pipe
-            print(yt_dlp_command)
-            print(ffplay_command)
-            self.ytdlp_process = subprocess.Popen(
-                yt_dlp_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            
-            self.ffplay_process = subprocess.Popen(
-                ffplay_command, stdin=self.ytdlp_process.stdout, stderr=subprocess.PIPE
-            )
-            
-            self.process_pid = self.ffplay_process.pid
-            print(f"yt-dlp process PID: {self.process_pid}")
-
-            # Monitor yt-dlp process
-            ffplay_alive = False
-            while self.play_flag:  # Continue to monitor if play flag is set
-                try:
-                    print("Loop 1")
-                    if self._is_ffmpeg_descendant_with_window():
-                        if ffplay_alive == False:
-                            print("ffmpeg window is running.")
-                        ffplay_alive = True
-                    else:
-                        if ffplay_alive == True:
-                            print("No descendant ffmpeg process with a window found.")
-                        ffplay_alive = False
-                        self.parent.play_button.config(state=tk.NORMAL)
-                        
-                    
-                    # If ffplay is not running but yt-dlp is, restart yt-dlp and ffplay
-                    if not ffplay_alive:
-                        #self.timer_window = TimerWindow(self, self.parent, title="Action Required", question="Video was stopped, do you want to restart it?", duration=10)
-                        if self.parent.auto_restart_video.get() == True:
-                            if self.play_flag == True:
-                                print("Starting OK/Cancell window")
-                                self.timer_window = TimerWindow(parent=self.parent, title="Action Required", question="Video was stopped and will be restarted automatically.", duration=10)
-                            else:
-                                return
-                        else:
-                            self.parent.update_status(f"Ready")
-                            return
-                        
-                        #self.parent.root.wait_window(timer_window.parent)
-                        self.parent.wait_window(self.timer_window.parent)
-                        if self.timer_window.expired:
-                            print("The timer expired before user response.")
-                            self.timer_window.result = True
-                        # Access the result and the checkbox value after the window has been closed
-                        if self.timer_window.result:  # If OK was pressed
-                            print("User chose to restart the video.")
-                        else:
-                            print("User chose to cancel or timer expired.")
-                            self.parent.update_status(f"Ready")
-                                        
-                            self.ytdlp_process.wait()
-                            exit_code = self.ytdlp_process.returncode
-                            print(f"yt-dlp process exited with exit code {exit_code}")
-                            print("Previous yt-dlp process terminated.")
-                            return
-
-                        # Check if "Do not ask again" was selected
-                        if self.timer_window.do_not_ask_var:
-                            print("User checked 'Do not ask again'.")
-                        else:
-                            print("User did not check 'Do not ask again'.")
-                            
-                        
-                        print("ffplay process terminated. Restarting yt-dlp and ffplay...")
-                        #self.stop_video()  # Ensure old processes are terminated
-                        break
-    
-                    if self.ytdlp_process.poll() is not None:  # Check if process is terminated
-                        #self.timer_window = TimerWindow(self, self.parent, title="Action Required", question="Video was stopped, do you want to restart it?", duration=10)
-                        #self.timer_window = TimerWindow(parent=self.parent, title="Action Required", question="Video was stopped, do you want to restart it?", duration=10)
-                        print("yt-dlp process terminated. Restarting...")
-                        
-                        exit_code = self.ytdlp_process.returncode
-                        print(f"yt-dlp process exited with exit code {exit_code}")
-                        print("Previous yt-dlp process terminated.")
-                        self.play_video
-                        break
-                except:
-                    var = traceback.format_exc()
-                    print(var)
-                    print("Sleep 1")
-                time.sleep(1)  # Check every second
-        self.parent.play_button.config(state=tk.NORMAL)
-
-    def stop_video(self):
-        self.play_flag = False
-        if self.timer_window is not None:
-            self.timer_window.parent.destroy()
-        if self.process_pid:
-            print("Stopping video")
-            try:
-                # Use psutil to handle process tree
-                process = psutil.Process(self.process_pid)
-                for proc in process.children(recursive=True):
-                    print(f"Terminating child process ID: {proc.pid}")
-                    try:
-                        proc.kill()
-                    except psutil.NoSuchProcess:
-                        print(f"Child process ID {proc.pid} does not exist anymore.")
-                print(f"Terminating process ID: {self.process_pid}")
-                process.kill()
-                process.wait(timeout=5)
-                print(f"Process ID {self.process_pid} terminated gracefully.")
-            except psutil.NoSuchProcess:
-                print(f"Process ID {self.process_pid} already terminated.")
-            except subprocess.TimeoutExpired:
-                print(f"Process ID {self.process_pid} did not terminate in time. Forcefully Terminating.")
-                process.kill()
-                print(f"Killed process ID: {self.process_pid}")
-            finally:
-                # Clean up
-                self.process = None
-                self.process_pid = None
-        else:
-            #print("No video instance to stop.")
-            pass
-        self.play_flag = False  # Stop the play flag
-
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -582,18 +5343,28 @@ class App(tk.Tk):
         self.yt_video = None
         self.video_thread = None
         self.play_flag = False  # Flag to track play state
+        self.play_when_resolved = None  # URL to play as soon as its lookup finishes
+        self.mosaic = None  # MosaicRenderer while a mosaic plays
+        self.url_resolver = UrlResolver(self, self.on_video_resolved)
+        self.stream_health = StreamHealthChecker(self, self.on_stream_health)
         
         self.create_menu()
         self.create_widgets()
         self.load_saved_divisions()
+        self.load_saved_tiling_engine()
         
         # Initialize with default video
         self.initialize_default_video()
 
+        # Load what the first lookup needs while the user looks at the window
+        self.after(WARM_UP_DELAY_MS, lambda: threading.Thread(target=warm_up_imports, daemon=True).start())
+        # Then find the dead entries of the URL list before the user picks one
+        self.after(WARM_UP_DELAY_MS, lambda: self.stream_health.check(self.url_entry['values']))
+
     def initialize_default_video(self):
         if not self.yt_video:
             self.url_entry.insert(0, DEFAULT_URL)
-            self.after(1, self.update_video_title)
+            self.after(1, lambda: self.update_video_title(immediate=True))
             #self.play_video()  # Automatically start playing the default video
 
     def create_widgets(self):
@@ -609,7 +5380,8 @@ class App(tk.Tk):
 
         #self.url_entry = tk.Entry(self, width=50)
         
-        self.url_entry = ttk.Combobox(self, values=array_url, width=50)
+        self.url_entry = ttk.Combobox(self, values=list(dict.fromkeys(get_configured_urls() + array_url)), width=50,
+                                      postcommand=lambda: self.after_idle(self._mark_stream_states))
         self.url_entry.set('')  # Optional: Set default text
         self.url_entry.grid(row=2, column=2, columnspan=3, padx=10, pady=10, sticky='w')
 
@@ -633,13 +5405,69 @@ class App(tk.Tk):
         self.auto_restart_checkbutton = tk.Checkbutton(self, text="Auto Restart Video", variable=self.auto_restart_video)
         self.auto_restart_checkbutton.grid(row=4, column=1, padx=10, pady=10, sticky='w')  # Use Checkbutton and grid it
 
+        # Let the grid auto tuner choose the divisions from the CPU use and dropped frames
+        self.auto_divisions = tk.BooleanVar(value=read_setting('auto_divisions', False))
+        self.auto_divisions_checkbutton = tk.Checkbutton(
+            self, text="Auto divisions", variable=self.auto_divisions,
+            command=lambda: write_setting('auto_divisions', self.auto_divisions.get()))
+        self.auto_divisions_checkbutton.grid(row=6, column=1, padx=10, pady=10, sticky='w')
+
+        # Keep a second, already connected source ready to take over live streams
+        self.hot_standby = tk.BooleanVar(value=read_setting('hot_standby', False))
+        self.hot_standby_checkbutton = tk.Checkbutton(
+            self, text="Hot standby (live)", variable=self.hot_standby,
+            command=lambda: write_setting('hot_standby', self.hot_standby.get()))
+        self.hot_standby_checkbutton.grid(row=5, column=1, padx=10, pady=10, sticky='w')
+
+        # Tiling engine, 'legacy' is kept as a fallback to the original fps + tile graph
+        self.tiling_engine_label = tk.Label(self, text="Tiling engine:", font=("Helvetica", 12))
+        self.tiling_engine_label.grid(row=4, column=2, padx=10, pady=10, sticky='w')
+
+        self.tiling_engine_combobox = ttk.Combobox(self, values=TILING_ENGINES, width=12, state='readonly')
+        self.tiling_engine_combobox.grid(row=4, column=3, columnspan=2, padx=10, pady=10, sticky='w')
+        self.tiling_engine_combobox.bind("<<ComboboxSelected>>", self.save_tiling_engine)
+
+        # Playback mode, 'direct' hands the stream URLs to ffplay without the yt-dlp relay
+        self.playback_mode_label = tk.Label(self, text="Playback mode:", font=("Helvetica", 12))
+        self.playback_mode_label.grid(row=5, column=2, padx=10, pady=10, sticky='w')
+
+        self.playback_mode_combobox = ttk.Combobox(self, values=PLAYBACK_MODES, width=12, state='readonly')
+        self.playback_mode_combobox.grid(row=5, column=3, columnspan=2, padx=10, pady=10, sticky='w')
+        self.playback_mode_combobox.set(read_setting('playback_mode', DEFAULT_PLAYBACK_MODE, PLAYBACK_MODES))
+        self.playback_mode_combobox.bind(
+            "<<ComboboxSelected>>", lambda event: write_setting('playback_mode', self.playback_mode_combobox.get()))
+
+        # Audio, 'separate' decodes the tiles without audio and plays one audio only stream beside them
+        self.audio_mode_label = tk.Label(self, text="Audio:", font=("Helvetica", 12))
+        self.audio_mode_label.grid(row=6, column=2, padx=10, pady=10, sticky='w')
+
+        self.audio_mode_combobox = ttk.Combobox(self, values=AUDIO_MODES, width=12, state='readonly')
+        self.audio_mode_combobox.grid(row=6, column=3, columnspan=2, padx=10, pady=10, sticky='w')
+        self.audio_mode_combobox.set(read_setting('audio_mode', DEFAULT_AUDIO_MODE, AUDIO_MODES))
+        self.audio_mode_combobox.bind(
+            "<<ComboboxSelected>>", lambda event: write_setting('audio_mode', self.audio_mode_combobox.get()))
+
         
+        # Output frame rate cap, the monitor refresh rate or lower to save power
+        self.fps_cap_label = tk.Label(self, text="FPS cap:", font=("Helvetica", 12))
+        self.fps_cap_label.grid(row=7, column=2, padx=10, pady=10, sticky='w')
+
+        self.fps_cap_combobox = ttk.Combobox(self, values=FPS_CAPS, width=12, state='readonly')
+        self.fps_cap_combobox.grid(row=7, column=3, columnspan=2, padx=10, pady=10, sticky='w')
+        self.fps_cap_combobox.set(read_setting('fps_cap', FPS_CAP_DISPLAY, FPS_CAPS))
+        self.fps_cap_combobox.bind(
+            "<<ComboboxSelected>>", lambda event: write_setting('fps_cap', self.fps_cap_combobox.get()))
+
         # Status bar
+        self.status_message = "Ready"
+        self.telemetry_summary = None  # Live pipeline metrics shown after the status message
         self.status_bar = tk.Label(self, text="Status: Ready", bd=1, relief=tk.SUNKEN, anchor=tk.W)
-        self.status_bar.grid(row=5, column=1, columnspan=5, padx=10, pady=10, sticky='ew')
+        self.status_bar.grid(row=8, column=1, columnspan=5, padx=10, pady=10, sticky='ew')
 
-        # Bind URL entry change to update video title
+        # Bind URL entry change to update video title, typing is debounced by the resolver
         self.url_entry.bind("<FocusOut>", self.update_video_title)
+        self.url_entry.bind("<KeyRelease>", self.update_video_title)
+        self.url_entry.bind("<<ComboboxSelected>>", self.update_video_title)
 
         # Configure grid resizing
         self.grid_rowconfigure(0, weight=1)
@@ -648,6 +5476,9 @@ class App(tk.Tk):
         self.grid_rowconfigure(3, weight=0)
         self.grid_rowconfigure(4, weight=0)
         self.grid_rowconfigure(5, weight=0)
+        self.grid_rowconfigure(6, weight=0)
+        self.grid_rowconfigure(7, weight=0)
+        self.grid_rowconfigure(8, weight=0)
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
         self.grid_columnconfigure(2, weight=1)
@@ -661,6 +5492,12 @@ class App(tk.Tk):
         menu_font = tkfont.Font(family="Helvetica", size=12)
         menu_font_small = tkfont.Font(family="Helvetica", size=8)
 
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="Render to file...", command=self.render_video, font=menu_font)
+        file_menu.add_command(label="Play mosaic of the URL list", command=self.play_mosaic, font=menu_font)
+        file_menu.add_command(label="Play on every monitor", command=self.play_wall, font=menu_font)
+        menubar.add_cascade(label="File", menu=file_menu, font=menu_font_small)
+
         about_menu = tk.Menu(menubar, tearoff=0)
 
         # Add commands with zero padding
@@ -676,6 +5513,9 @@ class App(tk.Tk):
         
     def show_help(self):
         help_text = f"Program Version: {PROGRAM_VERSION}\nEmail: {AUTHOR_EMAIL}\nWebsite: {AUTHOR_WEBSITE}"
+        stats = info_cache.stats()
+        help_text += (f"\n\nVideo info cache: {stats['entries']} entries, {stats['hits']} hits, "
+                      f"{stats['misses']} misses, {stats['saved_seconds']:.1f}s saved")
         messagebox.showinfo("Help", help_text)
 
     def open_why_tiling(self):
@@ -688,34 +5528,100 @@ class App(tk.Tk):
         webbrowser.open(SOURCE_CODE_GITHUB)
 
 
-    def update_video_title(self, event=None):
-        url = self.url_entry.get()
-        if url != (self.yt_video.url if self.yt_video else ""):
-            if self.yt_video:
-                self.stop_video()  # Stop any currently playing video
-            self.yt_video = YouTubeVideo(self, url, int(self.divisions_spinbox.get()))
-            self.after(100, self._update_title_label)
+    def update_video_title(self, event=None, immediate=False):
+        """Look the URL up in the background, the title is set by on_video_resolved."""
+        url = self.url_entry.get().strip()
+        if not url:
+            return
+        if url == (self.yt_video.url if self.yt_video else ""):
+            self.url_resolver.cancel()  # Back to the URL already resolved
+            self._update_title_label()
+            return
+        if event is not None and event.type == tk.EventType.FocusOut:
+            immediate = True  # Done typing
+        self.url_resolver.request(url, immediate=immediate, divisions=int(self.divisions_spinbox.get()),
+                                  tiling_engine=self.tiling_engine_combobox.get())
+        self.video_title_label.config(text="Looking up video...")
+
+    def on_video_resolved(self, url, video, error):
+        """Called on the Tk thread when the resolver finished the lookup of the latest URL."""
+        play = self.play_when_resolved == url
+        if self.yt_video and self.yt_video.url != url:
+            self.stop_video()  # Stop any currently playing video
+        self.yt_video = video
+        self._update_title_label()
+        if play:
+            self.play_when_resolved = None
+            self._start_playback()
+        elif video is None or not video.ytdlp_is_valid:
+            health = self.stream_health.health.get(url)
+            if health and health['state'] == STREAM_OFFLINE:
+                self.update_status(f"Stream '{url}' is offline: {health['error'] or 'not live now'}",
+                                   color=STREAM_STATE_COLORS[STREAM_OFFLINE])
+            else:
+                self.update_status(f"URL '{url}' does not seem to be a valid video.", color='red')
+
+    def on_stream_health(self, health):
+        """Called on the Tk thread with each result of the stream health checker."""
+        self._mark_stream_states()
+        url = health['url']
+        if url == self.url_entry.get().strip() and not self.play_flag \
+                and health['state'] in (STREAM_OFFLINE, STREAM_ERROR):
+            self.update_status(f"Stream '{url}' is {health['state']}: {health['error'] or 'not live now'}",
+                               color=STREAM_STATE_COLORS[health['state']])
+
+    def _mark_stream_states(self):
+        """Color the entries of the URL list by their stream health, see STREAM_STATE_COLORS."""
+        try:
+            # The dropdown's listbox is filled from the values each time it opens
+            listbox = str(self.url_entry.tk.call('ttk::combobox::PopdownWindow', self.url_entry)) + '.f.l'
+            for index, url in enumerate(self.url_entry['values']):
+                state = self.stream_health.health.get(url, {}).get('state')
+                self.url_entry.tk.call(listbox, 'itemconfigure', index,
+                                       '-foreground', STREAM_STATE_COLORS.get(state, 'black'))
+        except tk.TclError:
+            pass  # Not opened yet
 
     def _update_title_label(self):
         if self.yt_video:
             self.video_title_label.config(text=f"{self.yt_video.title}")
+        else:
+            self.video_title_label.config(text="Video Title")
 
     def play_video(self):
         self.stop_video()  # Stop any currently playing video
         self.is_ffmpeg_visible = False
         self.play_button.config(state=tk.DISABLED)
         
-        # Start video playback in a separate thread
-        url = self.url_entry.get()
-        divisions = int(self.divisions_spinbox.get())
-        
-        self.yt_video = YouTubeVideo(self, url, divisions)
-        if self.yt_video.ytdlp_is_valid == False:
+        url = self.url_entry.get().strip()
+        if self.yt_video and self.yt_video.url == url:
+            self._start_playback()
+            return
+
+        # Resolve the URL first, playback starts from on_video_resolved
+        self.play_when_resolved = url
+        self.url_resolver.request(url, immediate=True, divisions=int(self.divisions_spinbox.get()),
+                                  tiling_engine=self.tiling_engine_combobox.get())
+        self.update_status(f"Looking up '{url}'", color='blue')
+
+    def _start_playback(self):
+        url = self.url_entry.get().strip()
+        if self.yt_video is None or self.yt_video.ytdlp_is_valid == False:
             print("Video URL is not valid")
             messagebox.showerror("URL Error", f"URL '{url}' does not seem to be a valid video.")
             self.play_button.config(state=tk.NORMAL)
             return
-            
+
+        # The video was resolved in the background, apply the current settings
+        self.yt_video.divisions = int(self.divisions_spinbox.get())
+        self.yt_video.tiling_engine = self.tiling_engine_combobox.get()
+        self.yt_video.playback_mode = self.playback_mode_combobox.get()
+        self.yt_video.hot_standby = self.hot_standby.get()
+        self.yt_video.auto_divisions = self.auto_divisions.get()
+        self.yt_video.fps_cap = get_fps_cap(self.fps_cap_combobox.get())
+        if self.yt_video.audio_mode != self.audio_mode_combobox.get():
+            self.yt_video.audio_mode = self.audio_mode_combobox.get()
+            self.yt_video.format = None  # The formats depend on the audio mode, choose them again
         
         # Show temporary starting message
         try:
@@ -724,6 +5630,7 @@ class App(tk.Tk):
         except:
             self.update_status(f"Ready")
             
+        # Start video playback in a separate thread
         self.play_flag = True  # Set play flag
         self.video_thread = threading.Thread(target=self.yt_video.play_video)
         self.video_thread.start()
@@ -732,7 +5639,93 @@ class App(tk.Tk):
         self.after(35000, lambda: self.update_status(f"Playing video '{self.yt_video.title}'"))
         self._update_title_label()
 
+    def render_video(self):
+        """Ask for an output file and tile the current video into it in the background."""
+        url = self.url_entry.get().strip()
+        if self.yt_video is None or self.yt_video.url != url or not self.yt_video.ytdlp_is_valid:
+            messagebox.showerror("Render", f"URL '{url}' is not a resolved video yet.")
+            return
+        if self.yt_video.is_live:
+            messagebox.showerror("Render", "Live streams can not be rendered to a file.")
+            return
+        output = filedialog.asksaveasfilename(title="Render tiled video", defaultextension='.mp4',
+                                              filetypes=[("MP4 video", "*.mp4"), ("Matroska video", "*.mkv")])
+        if not output:
+            return
+        self.stop_video()
+        video = self.yt_video
+        video.divisions = int(self.divisions_spinbox.get())
+        video.tiling_engine = self.tiling_engine_combobox.get()
+        self.play_button.config(state=tk.DISABLED)
+
+        def progress(fraction, eta, stage):
+            eta_text = f", {format_duration(eta)} left" if eta is not None else ""
+            self.after(0, self.update_status, f"{stage} '{video.title}': {100 * fraction:.1f}%{eta_text}", 'blue')
+
+        def render():
+            try:
+                stats = video.render(output, progress=progress)
+                message = (f"Rendered {os.path.basename(output)} in {format_duration(stats['seconds'])} "
+                           f"({stats['speed']:.2f}x real time)")
+                self.after(0, self.update_status, message)
+            except Exception as e:
+                print(traceback.format_exc())
+                self.after(0, self.update_status, f"Render failed: {e}", 'red')
+            self.after(0, lambda: self.play_button.config(state=tk.NORMAL))
+
+        threading.Thread(target=render, daemon=True).start()
+
+    def play_mosaic(self):
+        """Play every URL of the list in its own cells, resolving them in the background."""
+        self.stop_video()
+        urls = list(self.url_entry['values'])
+        divisions = int(self.divisions_spinbox.get())
+        try:
+            mosaic = MosaicRenderer(urls, divisions, *get_screen_size())
+        except (ValueError, ImportError, FileNotFoundError) as e:
+            messagebox.showerror("Mosaic", f"Can not play the mosaic: {e}")
+            return
+        self.mosaic = mosaic
+        self.play_button.config(state=tk.DISABLED)
+        self.update_status(f"Starting a mosaic of {len(mosaic.sources)} sources", color='blue')
+        threading.Thread(target=mosaic.start, daemon=True).start()
+        self.after(1000, self._update_mosaic_status, mosaic)
+
+    def play_wall(self):
+        """Span the URL over every monitor, decoded once, with the wall_divisions setting or the spinbox value."""
+        self.stop_video()
+        url = self.url_entry.get().strip()
+        divisions_list = read_setting('wall_divisions', None) or [int(self.divisions_spinbox.get())]
+        try:
+            wall = WallRenderer(url, divisions_list=divisions_list)
+        except (ValueError, ImportError, FileNotFoundError, OSError) as e:
+            messagebox.showerror("Wall", f"Can not play on every monitor: {e}")
+            return
+        self.mosaic = wall  # Stopped and reported like a mosaic
+        self.play_button.config(state=tk.DISABLED)
+        self.update_status(f"Starting on {len(wall.monitors)} monitors", color='blue')
+        threading.Thread(target=wall.start, daemon=True).start()
+        self.after(1000, self._update_mosaic_status, wall)
+
+    def _update_mosaic_status(self, mosaic):
+        if mosaic is not self.mosaic:
+            return
+        if mosaic.running and not mosaic.is_running():
+            self.stop_video()  # The player was closed
+            return
+        states = [source['state'] for source in mosaic.stats()['sources']]
+        counts = ', '.join(f"{states.count(state)} {state}" for state in MOSAIC_STATES if state in states)
+        self.update_status(f"{mosaic.label}: {counts}",
+                           color='blue' if states.count('playing') == len(states) else 'red')
+        self.after(1000, self._update_mosaic_status, mosaic)
+
     def stop_video(self):
+        self.play_when_resolved = None
+        mosaic, self.mosaic = self.mosaic, None
+        if mosaic:
+            threading.Thread(target=mosaic.stop, daemon=True).start()
+            self.play_button.config(state=tk.NORMAL)
+            self.update_status("Ready")
         if self.yt_video:
             self.yt_video.stop_video()
             self.update_status("Ready")
@@ -741,11 +5734,23 @@ class App(tk.Tk):
             print("No video instance to stop.")
 
     def update_status(self, message, color='black'):
-        self.status_bar.config(text=f"Status: {message}", fg=color)
+        self.status_message = message
+        self._show_status(color)
+
+    def update_telemetry(self, summary):
+        """Show a format_telemetry() summary after the status message, None to remove it."""
+        self.telemetry_summary = summary
+        self._show_status(self.status_bar.cget('fg'))
+
+    def _show_status(self, color):
+        text = f"Status: {self.status_message}"
+        if self.telemetry_summary:
+            text += f"  |  {self.telemetry_summary}"
+        self.status_bar.config(text=text, fg=color)
 
     def load_saved_divisions(self):
         try:
-            with open(DIVISIONS_FILE, "r") as file:
+            with open(app_data_path(DIVISIONS_FILE_NAME), "r") as file:
                 saved_divisions = int(file.read().strip())
                 if 1 <= saved_divisions <= 50:
                     self.divisions_spinbox.delete(0, tk.END)
@@ -757,12 +5762,31 @@ class App(tk.Tk):
             self.divisions_spinbox.delete(0, tk.END)
             self.divisions_spinbox.insert(0, 3)
 
+    def load_saved_tiling_engine(self):
+        try:
+            self.tiling_engine_combobox.set(read_tiling_engine())
+        except:
+            self.tiling_engine_combobox.set(DEFAULT_TILING_ENGINE)
+
+    def save_tiling_engine(self, event=None):
+        try:
+            write_tiling_engine(self.tiling_engine_combobox.get())
+        except Exception as e:
+            print(f"Failed to save tiling engine: {e}")
+
     def on_closing(self):
         self.stop_video()  # Ensure the video is stopped before closing
+        self.url_resolver.shutdown()
+        self.stream_health.shutdown()
         self.destroy()
 
 if __name__ == "__main__":
-    add_to_path()
+    if args.startup_probe:
+        startup_probe('gui')
     app = App()
     app.protocol("WM_DELETE_WINDOW", app.on_closing)
+    if args.startup_probe:
+        app.update()
+        startup_probe('window')
+        os._exit(0)  # Do not wait for the lookup of the default URL
     app.mainloop()